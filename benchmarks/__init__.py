@@ -0,0 +1 @@
+"""Generador de datos sintéticos y mediciones de rendimiento de los modelos"""
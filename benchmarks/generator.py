@@ -0,0 +1,233 @@
+"""Generador determinístico de datos sintéticos para gym.db y fitapp.db.
+
+Uso: python -m benchmarks.generator DESTINO --gyms 5 --members 2000 --years 2
+"""
+import argparse
+import os
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from utils.auth import hash_password
+from utils.connection import get_connection, close_thread_connections, GYM_DB, ADMIN_DB
+from utils.migrations import migrate_gym_database, migrate_admin_database
+
+# Contraseña de todos los usuarios generados
+BENCH_PASSWORD = "bench"
+
+# Filas por cada executemany
+BATCH_SIZE = 5000
+
+# Peso relativo de cada hora del día (picos a la mañana temprano y después del trabajo)
+HOUR_WEIGHTS = {
+    6: 3, 7: 8, 8: 9, 9: 6, 10: 4, 11: 3, 12: 4, 13: 4, 14: 2, 15: 2,
+    16: 4, 17: 7, 18: 10, 19: 10, 20: 7, 21: 4, 22: 1,
+}
+
+# Peso relativo de cada día de la semana (lunes = 0)
+WEEKDAY_WEIGHTS = [10, 9, 9, 8, 7, 4, 2]
+
+PLANES = [
+    ("Plan Básico", "Acceso a sala de musculación", 8000.0),
+    ("Plan Full", "Sala de musculación y todas las clases", 12000.0),
+    ("Plan Clases", "Clases grupales", 9000.0),
+    ("Plan Libre", "Acceso libre todos los días", 15000.0),
+    ("Plan Estudiante", "Acceso a sala de lunes a viernes", 6000.0),
+]
+
+NOMBRES = ["Juan", "María", "Lucía", "Martín", "Sofía", "Pedro", "Ana", "Diego", "Valentina",
+           "Mateo", "Camila", "Santiago", "Julieta", "Tomás", "Florencia", "Nicolás", "Agustina"]
+APELLIDOS = ["González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez",
+             "Pérez", "García", "Sánchez", "Romero", "Sosa", "Torres", "Álvarez", "Ruiz"]
+
+LICENCIAS = [("Mensual", 30, 20000.0), ("Trimestral", 90, 55000.0),
+             ("Semestral", 180, 100000.0), ("Anual", 365, 190000.0)]
+
+
+@contextmanager
+def working_directory(path):
+    """Cambia temporalmente el directorio de trabajo (las bases se abren por ruta relativa)"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        close_thread_connections()
+        os.chdir(previous)
+
+
+def _insert_batches(conn, sql, rows):
+    """Inserta las filas de un iterable en bloques de BATCH_SIZE"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(sql, batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+
+
+def _visit_times(rng, start, end, visits, day_weights):
+    """Elige `visits` momentos entre start y end según los pesos por día y por hora"""
+    total_days = (end - start).days
+    if total_days <= 0 or visits <= 0:
+        return []
+
+    hours = list(HOUR_WEIGHTS)
+    hour_weights = list(HOUR_WEIGHTS.values())
+    offset = start.weekday()
+    weights = [day_weights[(offset + day) % 7] for day in range(total_days)]
+
+    days = rng.choices(range(total_days), weights=weights, k=visits)
+    chosen_hours = rng.choices(hours, weights=hour_weights, k=visits)
+    return sorted(start + timedelta(days=day, hours=hour, minutes=rng.randrange(60), seconds=rng.randrange(60))
+                  for day, hour in zip(days, chosen_hours))
+
+
+def _generate_admin(rng, gyms, today):
+    """Crea el administrador, los gimnasios y su historial de licencias. Devuelve los IDs de gimnasio."""
+    conn = get_connection(ADMIN_DB)
+    password = hash_password(BENCH_PASSWORD)
+    fecha = today.strftime("%Y-%m-%d %H:%M:%S")
+
+    conn.execute("""
+        INSERT INTO usuarios (username, password, email, tipo, nombre_gimnasio, fecha_registro, activo)
+        VALUES ('admin', ?, 'admin@bench.local', 'admin', NULL, ?, 1)
+    """, (password, fecha))
+
+    gym_ids = []
+    for number in range(1, gyms + 1):
+        registro = today - timedelta(days=rng.randrange(30, 1500))
+        cursor = conn.execute("""
+            INSERT INTO usuarios (username, password, email, tipo, nombre_gimnasio, fecha_registro,
+                                  ultimo_acceso, activo)
+            VALUES (?, ?, ?, 'gimnasio', ?, ?, ?, ?)
+        """, (f"gym{number}", password, f"gym{number}@bench.local", f"Gimnasio {number}",
+              registro.strftime("%Y-%m-%d %H:%M:%S"),
+              (today - timedelta(hours=rng.randrange(0, 240))).strftime("%Y-%m-%d %H:%M:%S"),
+              1 if rng.random() < 0.9 else 0))
+        gym_id = cursor.lastrowid
+        gym_ids.append(gym_id)
+
+        # Licencias consecutivas desde el registro; sólo la última queda activa
+        licenses = []
+        start = registro
+        while start < today:
+            tipo, days, precio = rng.choice(LICENCIAS)
+            end = start + timedelta(days=days)
+            licenses.append([gym_id, tipo, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), precio, 0])
+            start = end
+        licenses[-1][5] = 1
+        conn.executemany("""
+            INSERT INTO licencias (usuario_id, tipo, fecha_inicio, fecha_vencimiento, precio, activa)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, licenses)
+
+    conn.commit()
+    return gym_ids
+
+
+def _generate_gym(rng, gym_ids, members, years, today):
+    """Crea los planes, los socios de cada gimnasio y sus asistencias"""
+    conn = get_connection(GYM_DB)
+    conn.executemany("INSERT INTO planes (nombre, descripcion, precio) VALUES (?, ?, ?)", PLANES)
+    plan_ids = [row[0] for row in conn.execute("SELECT id FROM planes ORDER BY id")]
+
+    history_start = today - timedelta(days=int(365 * years))
+    dni = 20000000
+
+    for gym_id in gym_ids:
+        socios = []
+        for _ in range(members):
+            dni += rng.randrange(1, 50)
+            registro = history_start + timedelta(days=rng.randrange(max((today - history_start).days, 1)))
+            # Dos de cada diez socios tienen la cuota vencida o sin pagar
+            if rng.random() < 0.8:
+                vencimiento = today + timedelta(days=rng.randrange(1, 31))
+                estado = "Pagada"
+            else:
+                vencimiento = today - timedelta(days=rng.randrange(0, 120))
+                estado = rng.choice(["Pagada", "No Pagada"])
+            socios.append((rng.choice(NOMBRES), rng.choice(APELLIDOS), str(dni),
+                           f"11{rng.randrange(10000000, 99999999)}", rng.choice(plan_ids),
+                           registro.strftime("%Y-%m-%d"), vencimiento.strftime("%Y-%m-%d"), estado, gym_id))
+
+        conn.executemany("""
+            INSERT INTO socios (nombre, apellido, dni, telefono, plan_id, fecha_registro,
+                                fecha_vencimiento, estado_cuota, gimnasio_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, socios)
+
+        socio_rows = conn.execute("""
+            SELECT id, fecha_registro, fecha_vencimiento FROM socios WHERE gimnasio_id = ?
+        """, (gym_id,)).fetchall()
+
+        def asistencias():
+            for socio_id, registro, vencimiento in socio_rows:
+                start = datetime.strptime(registro, "%Y-%m-%d")
+                end = min(today, datetime.strptime(vencimiento, "%Y-%m-%d"))
+                # Entre media y cinco visitas por semana según el socio
+                per_week = rng.uniform(0.5, 5)
+                visits = int(per_week * max((end - start).days, 0) / 7)
+                for moment in _visit_times(rng, start, end, visits, WEEKDAY_WEIGHTS):
+                    yield (socio_id, moment.strftime("%Y-%m-%d %H:%M:%S"))
+
+        # En orden cronológico, como se registran en un gimnasio real
+        _insert_batches(conn, "INSERT INTO asistencias (socio_id, fecha) VALUES (?, ?)",
+                        sorted(asistencias(), key=lambda row: row[1]))
+        conn.commit()
+
+
+def generate(target_dir, gyms=1, members=500, years=1, seed=42, today=None):
+    """Crea gym.db y fitapp.db en target_dir con datos sintéticos reproducibles.
+
+    Las bases existentes en el directorio se reemplazan. Devuelve un resumen
+    con la cantidad de filas de cada tabla.
+    """
+    rng = random.Random(seed)
+    today = today or datetime.now().replace(microsecond=0)
+    os.makedirs(target_dir, exist_ok=True)
+
+    with working_directory(target_dir):
+        close_thread_connections()
+        for name in (GYM_DB, ADMIN_DB):
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(name + suffix):
+                    os.remove(name + suffix)
+
+        migrate_admin_database()
+        migrate_gym_database()
+
+        gym_ids = _generate_admin(rng, gyms, today)
+        _generate_gym(rng, gym_ids, members, years, today)
+
+        summary = {}
+        for db_path, tables in ((ADMIN_DB, ("usuarios", "licencias")),
+                                (GYM_DB, ("planes", "socios", "asistencias"))):
+            conn = get_connection(db_path)
+            for table in tables:
+                summary[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            conn.execute("PRAGMA optimize")
+        summary["gym_ids"] = gym_ids
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera bases de datos sintéticas para benchmarks")
+    parser.add_argument("target_dir", help="Directorio donde se crean gym.db y fitapp.db")
+    parser.add_argument("--gyms", type=int, default=1, help="Cantidad de gimnasios")
+    parser.add_argument("--members", type=int, default=500, help="Socios por gimnasio")
+    parser.add_argument("--years", type=float, default=1, help="Años de historial de asistencias")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del generador")
+    parser.add_argument("--today", help="Fecha de referencia AAAA-MM-DD (por defecto, hoy)")
+    args = parser.parse_args()
+
+    today = datetime.strptime(args.today, "%Y-%m-%d") if args.today else None
+    summary = generate(args.target_dir, args.gyms, args.members, args.years, args.seed, today)
+    for table, count in summary.items():
+        print(f"{table}: {count}")
+
+
+if __name__ == "__main__":
+    main()
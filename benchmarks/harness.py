@@ -0,0 +1,278 @@
+"""Mide el tiempo de los métodos públicos de los modelos a distintas escalas.
+
+Uso: python -m benchmarks.harness --scales 1x500x1,5x2000x2 --repeat 50 --output bench_results.json
+
+Cada escala es GIMNASIOSxSOCIOSxAÑOS. Para cada una se generan bases nuevas
+con benchmarks.generator y se informan los percentiles p50/p95/p99 en ms.
+"""
+import argparse
+import inspect
+import json
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.generator import generate, working_directory, BENCH_PASSWORD
+from models.admin_reports import AdminReportsModel
+from models.attendance import AttendanceModel
+from models.attendance_analytics import AttendanceAnalyticsModel
+from models.attendance_archive import AttendanceArchiveModel
+from models.license import LicenseModel
+from models.member import MemberModel
+from models.plan import PlanModel
+from models.user import UserModel
+from utils.connection import get_connection, GYM_DB, ADMIN_DB
+
+MODELS = [MemberModel, AttendanceModel, PlanModel, LicenseModel, UserModel, AttendanceArchiveModel,
+          AttendanceAnalyticsModel, AdminReportsModel]
+
+DEFAULT_SCALES = "1x200x1,2x2000x2"
+
+
+class BenchContext:
+    """Datos de la base generada que usan los casos para armar los argumentos"""
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.today = datetime.now().strftime("%Y-%m-%d")
+
+        admin = get_connection(ADMIN_DB)
+        self.admin_id = admin.execute("SELECT id FROM usuarios WHERE tipo = 'admin'").fetchone()[0]
+        self.gym_id, self.gym_username = admin.execute("""
+            SELECT id, username FROM usuarios WHERE tipo = 'gimnasio' ORDER BY id LIMIT 1
+        """).fetchone()
+        self.license_ids = [row[0] for row in admin.execute("SELECT id FROM licencias")]
+        self.gym_ids = [row[0] for row in admin.execute("SELECT id FROM usuarios WHERE tipo = 'gimnasio'")]
+
+        gym = get_connection(GYM_DB)
+        self.members = gym.execute("""
+            SELECT id, nombre, apellido, dni, telefono, plan_id, fecha_vencimiento
+            FROM socios WHERE gimnasio_id = ?
+        """, (self.gym_id,)).fetchall()
+        self.plan = gym.execute("SELECT id, nombre, descripcion, precio FROM planes ORDER BY id LIMIT 1").fetchone()
+
+    def member(self):
+        """Un socio al azar del gimnasio medido"""
+        return self.rng.choice(self.members)
+
+    def lookup(self, db_path, sql, params=()):
+        """Primer valor de una consulta (para recuperar IDs creados por otro caso)"""
+        row = get_connection(db_path).execute(sql, params).fetchone()
+        return row[0] if row else None
+
+
+# Casos por modelo: método -> función (contexto, iteración) que devuelve los
+# argumentos. Se ejecutan en este orden, así las altas preceden a las bajas.
+CASES = {
+    MemberModel: {
+        "get_all_members": lambda ctx, i: (ctx.gym_id,),
+        "get_members_page": lambda ctx, i: (ctx.gym_id, 200),
+        "get_member_by_dni": lambda ctx, i: (ctx.member()[3], ctx.gym_id),
+        "has_search_index": lambda ctx, i: (),
+        "search_members": lambda ctx, i: (ctx.gym_id, ctx.member()[2][:3]),
+        "register_attendance": lambda ctx, i: (ctx.member()[0],),
+        "check_membership_status": lambda ctx, i: (ctx.member()[0], ctx.member()[6]),
+        "expire_memberships": lambda ctx, i: (),
+        "get_expiring_members": lambda ctx, i: (ctx.gym_id, 10),
+        "export_expiring_members": lambda ctx, i: (ctx.gym_id, 10),
+        "add_member": lambda ctx, i: ("Bench", "Socio", f"99{i:06d}", "1100000000",
+                                      ctx.plan[0], "Pagada", ctx.gym_id),
+        "get_all_dnis": lambda ctx, i: (),
+        "add_members_batch": lambda ctx, i: ([("Bench", "Lote", f"98{i:04d}{j:02d}", "1100000000", ctx.plan[0],
+                                                ctx.today, ctx.today, "Pagada", ctx.gym_id) for j in range(100)],),
+        "update_member": lambda ctx, i: (*ctx.members[0][:6], "Pagada"),
+        "delete_member": lambda ctx, i: (ctx.lookup(GYM_DB, "SELECT id FROM socios WHERE dni = ?", (f"99{i:06d}",)),),
+        "get_attendance_stats": lambda ctx, i: (ctx.gym_id,),
+        "get_member_status_stats": lambda ctx, i: (ctx.gym_id,),
+        "export_members_report": lambda ctx, i: (ctx.gym_id,),
+        "export_attendance_report": lambda ctx, i: (ctx.gym_id,),
+    },
+    AttendanceModel: {
+        "register_attendance": lambda ctx, i: (ctx.member()[0],),
+        "get_monthly_attendance": lambda ctx, i: (ctx.gym_id,),
+        "get_attendance_page": lambda ctx, i: (ctx.gym_id, 200),
+        "get_attendance_count": lambda ctx, i: (ctx.gym_id,),
+        "export_attendance_summary": lambda ctx, i: (ctx.gym_id,),
+    },
+    PlanModel: {
+        "get_all_plans": lambda ctx, i: (),
+        "get_plan_by_id": lambda ctx, i: (ctx.plan[0],),
+        "get_plan_by_name": lambda ctx, i: (ctx.plan[1],),
+        "get_all_plan_names": lambda ctx, i: (),
+        "add_plan": lambda ctx, i: (f"Plan bench {i}", "Plan de prueba", 1000.0),
+        "update_plan": lambda ctx, i: ctx.plan,
+        "delete_plan": lambda ctx, i: (ctx.lookup(GYM_DB, "SELECT id FROM planes WHERE nombre = ?",
+                                                  (f"Plan bench {i}",)), ctx.gym_id),
+    },
+    LicenseModel: {
+        "get_all_licenses": lambda ctx, i: (),
+        "get_active_gyms": lambda ctx, i: (),
+        "add_license": lambda ctx, i: (ctx.gym_id, "Mensual", ctx.today, 20000.0),
+        "revoke_license": lambda ctx, i: (ctx.rng.choice(ctx.license_ids),),
+        "preview_bulk_licenses": lambda ctx, i: (ctx.gym_ids, "Anual", ctx.today),
+        "add_licenses_bulk": lambda ctx, i: (ctx.gym_ids, "Anual", ctx.today, 200000.0),
+        "get_gym_license_info": lambda ctx, i: (ctx.gym_id,),
+        "get_license_stats": lambda ctx, i: (),
+        "export_gyms_report": lambda ctx, i: (),
+        "export_licenses_report": lambda ctx, i: (),
+    },
+    UserModel: {
+        "check_credentials": lambda ctx, i: (ctx.gym_username, BENCH_PASSWORD),
+        "record_last_access": lambda ctx, i: (ctx.gym_id,),
+        "get_username": lambda ctx, i: (ctx.admin_id,),
+        "get_all_gyms": lambda ctx, i: (),
+        "get_gym_name": lambda ctx, i: (ctx.gym_id,),
+        "add_gym": lambda ctx, i: (f"Gimnasio bench {i}", f"bench{i}", f"bench{i}@bench.local", BENCH_PASSWORD),
+        "update_gym": lambda ctx, i: (ctx.gym_id, "Gimnasio 1", ctx.gym_username, "gym1@bench.local"),
+        "toggle_gym_active": lambda ctx, i: (ctx.gym_id,),
+        "change_password": lambda ctx, i: (ctx.admin_id, BENCH_PASSWORD, BENCH_PASSWORD),
+    },
+    # Sólo la primera ejecución resume y archiva; las demás miden el caso sin trabajo
+    AttendanceArchiveModel: {
+        "get_cutoffs": lambda ctx, i: (),
+        "roll_up_closed_months": lambda ctx, i: (),
+        "archive_old_attendance": lambda ctx, i: (),
+        "run_maintenance": lambda ctx, i: (),
+    },
+    AttendanceAnalyticsModel: {
+        # max_age=0 mide el cálculo completo en lugar de la caché
+        "get_attendance_analytics": lambda ctx, i: (ctx.gym_id, 365, 0),
+    },
+    AdminReportsModel: {
+        "get_gym_report": lambda ctx, i: (),
+        "get_monthly_attendance_by_gym": lambda ctx, i: (12,),
+        "export_gym_report": lambda ctx, i: (),
+        # max_age=0 mide la consulta de métricas en lugar de la caché
+        "get_gym_metrics": lambda ctx, i: (0,),
+    },
+}
+
+
+def public_methods(model_cls):
+    """Nombres de los métodos públicos de un modelo (sin close)"""
+    return [name for name, _ in inspect.getmembers(model_cls, inspect.isfunction)
+            if not name.startswith("_") and name != "close"]
+
+
+def percentile(samples, fraction):
+    """Percentil con interpolación lineal sobre una lista ordenada"""
+    if not samples:
+        return 0.0
+    position = (len(samples) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """Resume los tiempos (en segundos) en milisegundos"""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+def time_method(model, method, build_args, ctx, repeat, warmup):
+    """Ejecuta un método repeat veces (más warmup sin medir) y devuelve los tiempos"""
+    func = getattr(model, method)
+    samples = []
+    for i in range(warmup + repeat):
+        args = build_args(ctx, i)
+        start = time.perf_counter()
+        result = func(*args)
+        # Las exportaciones devuelven un cursor: leerlo completo es parte del costo
+        if isinstance(result, sqlite3.Cursor):
+            result.fetchall()
+            result.close()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def run_scale(gyms, members, years, repeat, warmup, seed, data_dir):
+    """Genera los datos de una escala y mide todos los casos"""
+    summary = generate(data_dir, gyms, members, years, seed)
+    results = []
+
+    with working_directory(data_dir):
+        ctx = BenchContext(seed)
+        for model_cls, cases in CASES.items():
+            model = model_cls()
+            for method, build_args in cases.items():
+                samples = time_method(model, method, build_args, ctx, repeat, warmup)
+                results.append({
+                    "scale": f"{gyms}x{members}x{years:g}",
+                    "model": model_cls.__name__,
+                    "method": method,
+                    **summarize(samples),
+                })
+            model.close()
+
+    return summary, results
+
+
+def parse_scales(text):
+    """Convierte "1x500x1,5x2000x2" en [(1, 500, 1.0), (5, 2000, 2.0)]"""
+    scales = []
+    for item in text.split(","):
+        gyms, members, years = item.strip().split("x")
+        scales.append((int(gyms), int(members), float(years)))
+    return scales
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide los métodos de los modelos a distintas escalas")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Escalas GIMNASIOSxSOCIOSxAÑOS separadas por coma")
+    parser.add_argument("--repeat", type=int, default=30, help="Mediciones por método")
+    parser.add_argument("--warmup", type=int, default=2, help="Ejecuciones previas sin medir")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del generador")
+    parser.add_argument("--output", default="bench_results.json", help="Archivo JSON de resultados")
+    parser.add_argument("--data-dir", help="Directorio para las bases generadas (por defecto, uno temporal)")
+    args = parser.parse_args()
+
+    # Avisar si un método público no tiene caso de medición
+    missing = [f"{model.__name__}.{name}" for model in MODELS
+               for name in public_methods(model) if name not in CASES.get(model, {})]
+    for name in missing:
+        print(f"Aviso: {name} no tiene caso de medición")
+
+    report = {
+        "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "sin_caso": missing,
+        "escalas": [],
+        "resultados": [],
+    }
+
+    for gyms, members, years in parse_scales(args.scales):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            summary, results = run_scale(gyms, members, years, args.repeat, args.warmup,
+                                         args.seed, args.data_dir or tmp_dir)
+        report["escalas"].append({"escala": f"{gyms}x{members}x{years:g}", **summary})
+        report["resultados"].extend(results)
+
+        print(f"\nEscala {gyms}x{members}x{years:g}: " +
+              ", ".join(f"{table}={count}" for table, count in summary.items() if table != "gym_ids"))
+        print(f"{'Método':<45}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for result in results:
+            name = f"{result['model']}.{result['method']}"
+            print(f"{name:<45}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Curva costo/latencia del KDF de contraseñas en esta máquina.
+
+Uso: python -m benchmarks.kdf --repeat 5 --output kdf_results.json
+"""
+import argparse
+import json
+import platform
+from datetime import datetime
+
+from benchmarks.harness import summarize
+from utils.auth import KDF_TARGET_MS, calibrate_iterations, measure_kdf
+
+DEFAULT_ITERATIONS = "50000,100000,200000,400000,600000,800000,1200000"
+
+
+def measure_curve(iterations_list, repeat):
+    """Mide varias veces cada cantidad de iteraciones"""
+    curve = []
+    for iterations in iterations_list:
+        samples = [measure_kdf(iterations) / 1000 for _ in range(repeat)]
+        curve.append({"iteraciones": iterations, **summarize(samples)})
+    return curve
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide la latencia del KDF según la cantidad de iteraciones")
+    parser.add_argument("--iterations", default=DEFAULT_ITERATIONS, help="Iteraciones separadas por coma")
+    parser.add_argument("--repeat", type=int, default=5, help="Mediciones por punto de la curva")
+    parser.add_argument("--target-ms", type=float, default=KDF_TARGET_MS, help="Latencia objetivo de la calibración")
+    parser.add_argument("--output", help="Archivo JSON de resultados")
+    args = parser.parse_args()
+
+    iterations_list = [int(value) for value in args.iterations.split(",")]
+    calibrated = calibrate_iterations(args.target_ms)
+    if calibrated not in iterations_list:
+        iterations_list = sorted(iterations_list + [calibrated])
+
+    curve = measure_curve(iterations_list, args.repeat)
+
+    print(f"Calibración para {args.target_ms:g} ms: {calibrated} iteraciones\n")
+    print(f"{'Iteraciones':>12}{'p50 ms':>10}{'p95 ms':>10}{'máx ms':>10}")
+    for point in curve:
+        mark = "  <- calibrado" if point["iteraciones"] == calibrated else ""
+        print(f"{point['iteraciones']:>12}{point['p50_ms']:>10.1f}{point['p95_ms']:>10.1f}{point['max_ms']:>10.1f}{mark}")
+
+    if args.output:
+        report = {
+            "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "objetivo_ms": args.target_ms,
+            "iteraciones_calibradas": calibrated,
+            "curva": curve,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,35 @@
 import sys
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QFont
-from ui.login import LoginWindow
-from ui.admin.dashboard import AdminDashboard
-from ui.gym.dashboard import GymApp
+from ui.session import SessionManager
+from ui.workers import shutdown_workers
+from models.last_access_writer import start_last_access_writer, stop_last_access_writer
+from utils.connection import close_all_connections
+from utils.tracing import enable_from_env, dump_from_env
+
 def main():
     app = QApplication(sys.argv)
     
+    # Con FITAPP_TRACE definida se registran las consultas desde el inicio
+    enable_from_env()
+    
     # Aplicar fuente global
     font = QFont("Segoe UI", 10)
     app.setFont(font)
     
-    # Mostrar ventana de login
-    login_window = LoginWindow()
-    login_window.show()
-    
-    # Bucle principal para login
-    app.exec()
+    # Los últimos accesos se guardan en segundo plano para no demorar el login
+    start_last_access_writer()
     
-    # Verificar si el login fue exitoso
-    if hasattr(login_window, 'accepted') and login_window.accepted:
-        # Iniciar la aplicación correspondiente según el tipo de usuario
-        if login_window.user_type == "admin":
-            window = AdminDashboard(login_window.user_id)
-        else:  # gimnasio
-            window = GymApp(login_window.user_id, login_window.user_type, login_window.gym_name)
-        
-        window.show()
-        sys.exit(app.exec())
+    # Login, panel y cierre de sesión se alternan sin reiniciar el proceso
+    session_manager = SessionManager()
+    session_manager.start()
     
+    exit_code = app.exec()
+    shutdown_workers()
+    stop_last_access_writer()
+    dump_from_env()
+    close_all_connections()
+    sys.exit(exit_code)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
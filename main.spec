@@ -6,7 +6,13 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # Pestañas que los paneles importan por nombre al visitarlas
+    hiddenimports=[
+        'ui.admin.gyms_tab', 'ui.admin.licenses_tab', 'ui.admin.stats_tab',
+        'ui.admin.performance_tab', 'ui.admin.settings_tab',
+        'ui.gym.access_tab', 'ui.gym.members_tab', 'ui.gym.plans_tab',
+        'ui.gym.renewals_tab', 'ui.gym.attendance_tab', 'ui.gym.reports_tab',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,151 @@
+from datetime import datetime
+from utils.cache import TTLCache
+from utils.connection import get_connection, UNIFIED_DB
+
+# Segundos durante los que se reutilizan las métricas por gimnasio
+METRICS_TTL_SECONDS = 5
+
+_metrics_cache = TTLCache(METRICS_TTL_SECONDS)
+
+
+def invalidate_gym_metrics():
+    """Descarta las métricas por gimnasio en caché (después de modificar gimnasios o licencias)"""
+    _metrics_cache.invalidate()
+
+
+class AdminReportsModel:
+    """Informes del administrador que cruzan fitapp.db (main) y gym.db (gym) en una sola consulta"""
+    def __init__(self):
+        self.conn = get_connection(UNIFIED_DB)
+        self.cursor = self.conn.cursor()
+
+    def _gym_report_query(self, cursor, first_day):
+        """Ejecuta el informe por gimnasio en el cursor dado y lo devuelve"""
+        # Socios y asistencias salen de los contadores mantenidos por triggers en
+        # gym.stats; los ingresos por cuotas suman el precio del plan de los socios al día
+        cursor.execute("""
+            WITH socios_gym AS (
+                SELECT gimnasio_id, SUM(valor) AS total,
+                       SUM(CASE WHEN clave = 'Pagada' THEN valor ELSE 0 END) AS pagados
+                FROM gym.stats
+                WHERE grupo = 'socios'
+                GROUP BY gimnasio_id
+            ),
+            asistencias_gym AS (
+                SELECT gimnasio_id, SUM(valor) AS total
+                FROM gym.stats
+                WHERE grupo = 'asistencias' AND clave >= ?
+                GROUP BY gimnasio_id
+            ),
+            cuotas_gym AS (
+                SELECT s.gimnasio_id, SUM(p.precio) AS total
+                FROM gym.socios s
+                JOIN gym.planes p ON p.id = s.plan_id
+                WHERE s.estado_cuota = 'Pagada'
+                GROUP BY s.gimnasio_id
+            ),
+            licencias_gym AS (
+                SELECT usuario_id, SUM(precio) AS ingresos,
+                       MAX(CASE WHEN activa = 1 THEN fecha_vencimiento END) AS vencimiento
+                FROM main.licencias
+                GROUP BY usuario_id
+            )
+            SELECT u.id, u.nombre_gimnasio, u.activo, u.ultimo_acceso,
+                   CAST(COALESCE(sg.total, 0) AS INTEGER), CAST(COALESCE(sg.pagados, 0) AS INTEGER),
+                   CAST(COALESCE(ag.total, 0) AS INTEGER), COALESCE(cg.total, 0),
+                   lg.vencimiento, COALESCE(lg.ingresos, 0)
+            FROM main.usuarios u
+            LEFT JOIN socios_gym sg ON sg.gimnasio_id = u.id
+            LEFT JOIN asistencias_gym ag ON ag.gimnasio_id = u.id
+            LEFT JOIN cuotas_gym cg ON cg.gimnasio_id = u.id
+            LEFT JOIN licencias_gym lg ON lg.usuario_id = u.id
+            WHERE u.tipo = 'gimnasio'
+            ORDER BY u.nombre_gimnasio
+        """, (first_day,))
+        return cursor
+
+    def get_gym_report(self):
+        """Obtiene socios, asistencias del mes e ingresos de cada gimnasio"""
+        first_day = datetime.now().replace(day=1).strftime("%Y-%m-%d")
+        now = datetime.now()
+
+        report = []
+        for (gym_id, nombre, activo, ultimo_acceso, socios, pagados, asistencias,
+             ingresos_cuotas, vencimiento, ingresos_licencias) in self._gym_report_query(self.cursor, first_day).fetchall():
+            days_left = (datetime.strptime(vencimiento, "%Y-%m-%d") - now).days if vencimiento else None
+            report.append({
+                "gym_id": gym_id,
+                "nombre": nombre,
+                "activo": activo == 1,
+                "ultimo_acceso": ultimo_acceso,
+                "socios": socios,
+                "socios_pagados": pagados,
+                "percent_pagados": (pagados / socios * 100) if socios > 0 else 0,
+                "asistencias_mes": asistencias,
+                "ingresos_cuotas": ingresos_cuotas,
+                "licencia_vencimiento": vencimiento,
+                "licencia_dias_restantes": days_left,
+                "ingresos_licencias": ingresos_licencias,
+            })
+        return report
+
+    def get_gym_metrics(self, max_age=None):
+        """Obtiene las métricas del tablero por gimnasio, reutilizando las de los últimos segundos.
+        
+        Devuelve un diccionario gym_id -> (nombre, activo, socios, % al día,
+        asistencias del mes, último acceso, días de licencia).
+        """
+        return _metrics_cache.get("metrics", self._load_gym_metrics, max_age)
+
+    def _load_gym_metrics(self):
+        """Calcula las métricas por gimnasio con una consulta agrupada sobre los contadores"""
+        first_day = datetime.now().replace(day=1).strftime("%Y-%m-%d")
+        # Cada subconsulta es una búsqueda por clave primaria en gym.stats (o por el
+        # índice de licencias por usuario y estado): el costo crece con la
+        # cantidad de gimnasios, no con la de socios o asistencias
+        self.cursor.execute("""
+            SELECT u.id, u.nombre_gimnasio, u.activo, u.ultimo_acceso,
+                   (SELECT CAST(COALESCE(SUM(valor), 0) AS INTEGER) FROM gym.stats
+                    WHERE grupo = 'socios' AND gimnasio_id = u.id),
+                   (SELECT CAST(COALESCE(SUM(valor), 0) AS INTEGER) FROM gym.stats
+                    WHERE grupo = 'socios' AND gimnasio_id = u.id AND clave = 'Pagada'),
+                   (SELECT CAST(COALESCE(SUM(valor), 0) AS INTEGER) FROM gym.stats
+                    WHERE grupo = 'asistencias' AND gimnasio_id = u.id AND clave >= ?),
+                   (SELECT MAX(fecha_vencimiento) FROM main.licencias
+                    WHERE usuario_id = u.id AND activa = 1)
+            FROM main.usuarios u
+            WHERE u.tipo = 'gimnasio'
+            ORDER BY u.nombre_gimnasio
+        """, (first_day,))
+        
+        now = datetime.now()
+        metrics = {}
+        for gym_id, nombre, activo, ultimo_acceso, socios, pagados, asistencias, vencimiento in self.cursor.fetchall():
+            days_left = (datetime.strptime(vencimiento, "%Y-%m-%d") - now).days if vencimiento else None
+            percent_paid = round(pagados / socios * 100, 1) if socios > 0 else 0.0
+            metrics[gym_id] = (nombre, activo == 1, socios, percent_paid, asistencias, ultimo_acceso, days_left)
+        return metrics
+
+    def get_monthly_attendance_by_gym(self, months=12):
+        """Obtiene las asistencias por gimnasio y mes de los últimos meses"""
+        self.cursor.execute("""
+            SELECT u.id, u.nombre_gimnasio, substr(st.clave, 1, 7) AS mes, CAST(SUM(st.valor) AS INTEGER)
+            FROM gym.stats st
+            JOIN main.usuarios u ON u.id = st.gimnasio_id
+            WHERE st.grupo = 'asistencias'
+              AND st.clave >= date('now', 'localtime', 'start of month', ?)
+            GROUP BY u.id, mes
+            ORDER BY u.nombre_gimnasio, mes
+        """, (f"-{months - 1} months",))
+        return self.cursor.fetchall()
+
+    def export_gym_report(self):
+        """Obtiene un cursor con los datos para exportar el informe por gimnasio"""
+        first_day = datetime.now().replace(day=1).strftime("%Y-%m-%d")
+        # Se devuelve un cursor propio para que el llamador lea las filas por bloques
+        return self._gym_report_query(self.conn.cursor(), first_day)
+
+    def close(self):
+        """Libera el cursor; la conexión pertenece al pool compartido"""
+        if hasattr(self, 'cursor'):
+            self.cursor.close()
@@ -1,14 +1,22 @@
-import sqlite3
 from datetime import datetime
+from models.attendance_archive import first_day_of_month
+from models.attendance_writer import get_attendance_writer
+from utils.connection import get_connection, GYM_DB
 
 class AttendanceModel:
     def __init__(self):
-        self.conn = sqlite3.connect('gym.db')
+        self.conn = get_connection(GYM_DB)
         self.cursor = self.conn.cursor()
     
     def register_attendance(self, member_id):
         """Registra la asistencia de un socio"""
         fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Con el escritor en segundo plano activo, la asistencia se agrupa en su próximo lote
+        writer = get_attendance_writer()
+        if writer is not None and writer.register(member_id, fecha_actual):
+            return True
+        
         self.cursor.execute("INSERT INTO asistencias (socio_id, fecha) VALUES (?, ?)", 
                          (member_id, fecha_actual))
         self.conn.commit()
@@ -26,17 +34,80 @@ class AttendanceModel:
         """, (gym_id, first_day))
         return self.cursor.fetchall()
     
+    def get_attendance_page(self, gym_id, limit, after=None, member_id=None, date_from=None,
+                            date_to=None, hour=None):
+        """Obtiene una página del registro de asistencias, de la más reciente a la más antigua.
+        
+        Filtros opcionales: socio, rango de fechas (YYYY-MM-DD, ambos inclusive)
+        y hora del día (0-23). Devuelve las filas (id, fecha, nombre, apellido,
+        DNI) y la clave (fecha, id) de la última, que se pasa como `after` para
+        pedir la página siguiente. Sólo incluye las asistencias que todavía no
+        se movieron al archivo.
+        """
+        conditions = ["s.gimnasio_id = ?"]
+        params = [gym_id]
+        if member_id is not None:
+            conditions.append("a.socio_id = ?")
+            params.append(member_id)
+        if date_from:
+            conditions.append("a.fecha >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("a.fecha < date(?, '+1 day')")
+            params.append(date_to)
+        if hour is not None:
+            conditions.append("substr(a.fecha, 12, 2) = ?")
+            params.append(f"{hour:02d}")
+        if after is not None:
+            # Equivale a (a.fecha, a.id) < after, escrito para usar el rango sobre fecha
+            conditions.append("a.fecha <= ? AND (a.fecha < ? OR a.id < ?)")
+            params.extend((after[0], after[0], after[1]))
+        params.append(limit)
+        
+        # Con un socio se recorre su índice (socio_id, fecha); sin socio, CROSS JOIN
+        # obliga a recorrer el índice por fecha en orden y cortar en LIMIT, en lugar
+        # de juntar y ordenar todas las asistencias del gimnasio en cada página
+        join = "JOIN" if member_id is not None else "CROSS JOIN"
+        self.cursor.execute(f"""
+            SELECT a.id, a.fecha, s.nombre, s.apellido, s.dni
+            FROM asistencias a
+            {join} socios s ON s.id = a.socio_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY a.fecha DESC, a.id DESC
+            LIMIT ?
+        """, params)
+        rows = self.cursor.fetchall()
+        
+        if not rows:
+            return [], after
+        last = rows[-1]
+        return rows, (last[1], last[0])
+    
     def get_attendance_count(self, gym_id):
         """Obtiene el número de asistencias del mes para un gimnasio"""
         first_day = datetime.now().replace(day=1).strftime("%Y-%m-%d")
+        # Suma los contadores diarios del mes mantenidos por triggers
         self.cursor.execute("""
-            SELECT COUNT(*) FROM asistencias a
-            JOIN socios s ON a.socio_id = s.id
-            WHERE s.gimnasio_id = ? AND a.fecha >= ?
+            SELECT COALESCE(SUM(valor), 0) FROM stats
+            WHERE grupo = 'asistencias' AND gimnasio_id = ? AND clave >= ?
         """, (gym_id, first_day))
-        return self.cursor.fetchone()[0]
+        return int(self.cursor.fetchone()[0])
+    
+    def export_attendance_summary(self, gym_id, months=12):
+        """Obtiene un cursor con las asistencias por socio y mes de los últimos meses"""
+        # asistencias_por_dia combina los meses ya resumidos con el detalle del mes en curso
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT substr(d.fecha, 1, 7) AS mes, s.apellido, s.nombre, s.dni, SUM(d.cantidad)
+            FROM asistencias_por_dia d
+            JOIN socios s ON s.id = d.socio_id
+            WHERE d.gimnasio_id = ? AND d.fecha >= ?
+            GROUP BY mes, d.socio_id
+            ORDER BY mes DESC, s.apellido, s.nombre
+        """, (gym_id, first_day_of_month(months - 1)))
+        return cursor
     
     def close(self):
-        """Cierra la conexión a la base de datos"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
\ No newline at end of file
+        """Libera el cursor; la conexión pertenece al pool compartido"""
+        if hasattr(self, 'cursor'):
+            self.cursor.close()
\ No newline at end of file
@@ -0,0 +1,110 @@
+from datetime import datetime
+from utils.cache import TTLCache
+from utils.connection import get_connection, GYM_DB
+
+# numpy es opcional: sin él la aplicación funciona, pero no hay análisis de asistencias
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Días hacia atrás que abarca el análisis por defecto
+DEFAULT_DAYS = 365
+
+# Franjas (día de la semana, hora) que se informan como horas pico
+PEAK_SLOTS = 5
+
+# Límites de los grupos de frecuencia: visitas por semana
+FREQUENCY_BINS = [0, 1, 2, 3, 5]
+FREQUENCY_LABELS = ["Menos de 1", "1 a 2", "2 a 3", "3 a 5", "5 o más"]
+
+WEEKDAYS = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+# El análisis sólo usa días cerrados, así que vale hasta que cambia la fecha
+_analytics_cache = TTLCache(24 * 60 * 60)
+
+
+def analytics_available():
+    """Indica si está instalado numpy, necesario para el análisis de asistencias"""
+    return np is not None
+
+
+class AttendanceAnalyticsModel:
+    """Análisis de asistencias por hora, día y socio calculado con numpy.
+
+    Las asistencias del período se leen en una sola consulta como segundos
+    desde 1970 (en hora local, igual que se guardan) y se agrupan con
+    bincount en lugar de recorrerlas fila por fila.
+    """
+    def __init__(self):
+        self.conn = get_connection(GYM_DB)
+        self.cursor = self.conn.cursor()
+
+    def get_attendance_analytics(self, gym_id, days=DEFAULT_DAYS, max_age=None):
+        """Devuelve el análisis de los últimos `days` días cerrados, calculado una vez por gimnasio y día.
+
+        Devuelve None si numpy no está instalado.
+        """
+        if np is None:
+            return None
+        today = datetime.now().strftime("%Y-%m-%d")
+        return _analytics_cache.get((gym_id, today, days),
+                                    lambda: self._compute_analytics(gym_id, today, days), max_age)
+
+    def _load_visits(self, gym_id, start, end):
+        """Lee los instantes y socios de las asistencias del período en dos arreglos"""
+        self.cursor.execute("""
+            SELECT CAST(strftime('%s', a.fecha) AS INTEGER), a.socio_id
+            FROM asistencias a
+            JOIN socios s ON s.id = a.socio_id
+            WHERE s.gimnasio_id = ? AND a.fecha >= ? AND a.fecha < ?
+        """, (gym_id, start, end))
+        rows = np.array(self.cursor.fetchall(), dtype=np.int64).reshape(-1, 2)
+        return rows[:, 0], rows[:, 1]
+
+    def _compute_analytics(self, gym_id, today, days):
+        """Calcula mapa de calor, serie diaria, frecuencia por socio y horas pico"""
+        end = np.datetime64(today, "D")
+        start = end - np.timedelta64(days, "D")
+        seconds, member_ids = self._load_visits(gym_id, str(start), str(end))
+
+        day_index = seconds // 86400 - start.astype(np.int64)
+        hours = (seconds // 3600) % 24
+        # El 1/1/1970 fue jueves: con +3 el lunes queda en 0
+        weekdays = (seconds // 86400 + 3) % 7
+
+        heatmap = np.bincount(weekdays * 24 + hours, minlength=7 * 24).reshape(7, 24)
+        daily_counts = np.bincount(day_index, minlength=days)[:days]
+        dates = np.arange(start, end, dtype="datetime64[D]")
+
+        # Promedio por franja: asistencias divididas por las veces que ese día de la semana cayó en el período
+        weekday_occurrences = np.bincount((dates.astype(np.int64) + 3) % 7, minlength=7)
+        hourly_average = heatmap / np.maximum(weekday_occurrences, 1)[:, None]
+
+        peak_order = np.argsort(hourly_average, axis=None)[::-1][:PEAK_SLOTS]
+        peak_slots = [(int(slot // 24), int(slot % 24), float(hourly_average.flat[slot]))
+                      for slot in peak_order if hourly_average.flat[slot] > 0]
+
+        _, visits_per_member = np.unique(member_ids, return_counts=True)
+        visits_per_week = visits_per_member / (days / 7)
+        frequency_groups = np.bincount(np.digitize(visits_per_week, FREQUENCY_BINS[1:]),
+                                       minlength=len(FREQUENCY_BINS))
+
+        return {
+            "desde": str(start),
+            "hasta": str(end - np.timedelta64(1, "D")),
+            "total": int(seconds.size),
+            "mapa_calor": heatmap,
+            "promedio_por_franja": hourly_average,
+            "fechas": dates,
+            "asistencias_por_dia": daily_counts,
+            "horas_pico": peak_slots,
+            "socios_activos": int(visits_per_member.size),
+            "visitas_semanales_promedio": float(visits_per_week.mean()) if visits_per_week.size else 0.0,
+            "frecuencia": list(zip(FREQUENCY_LABELS, frequency_groups.tolist())),
+        }
+
+    def close(self):
+        """Libera el cursor; la conexión pertenece al pool compartido"""
+        if hasattr(self, 'cursor'):
+            self.cursor.close()
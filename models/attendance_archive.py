@@ -0,0 +1,158 @@
+from datetime import datetime
+from utils.connection import get_connection, GYM_DB, ARCHIVE_DB, ARCHIVE_SCHEMA
+
+# Meses cerrados cuyas asistencias detalladas se conservan en gym.db
+RETENTION_MONTHS = 12
+
+
+def first_day_of_month(months_ago=0, today=None):
+    """Devuelve el primer día (YYYY-MM-DD) del mes que está months_ago meses antes del actual"""
+    today = today or datetime.now()
+    month_index = today.year * 12 + today.month - 1 - months_ago
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}-01"
+
+
+def next_month(day):
+    """Devuelve el primer día del mes siguiente al de la fecha YYYY-MM-DD"""
+    year, month = int(day[:4]), int(day[5:7])
+    return f"{year + month // 12:04d}-{month % 12 + 1:02d}-01"
+
+
+class AttendanceArchiveModel:
+    """Cierra los meses de asistencias: los resume por socio y día y archiva el detalle antiguo.
+
+    Los informes leen la vista asistencias_por_dia, que combina el resumen de
+    los meses cerrados con el detalle del mes en curso, así que el resultado
+    no depende de si un mes ya fue resumido o archivado.
+    """
+    def __init__(self, archive_path=ARCHIVE_DB):
+        self.conn = get_connection(GYM_DB)
+        self.cursor = self.conn.cursor()
+        self.archive_path = archive_path
+
+    def get_cutoffs(self):
+        """Devuelve hasta qué fecha (exclusive) están resumidas y archivadas las asistencias"""
+        self.cursor.execute("SELECT resumido_hasta, archivado_hasta FROM asistencias_cierre")
+        resumido_hasta, archivado_hasta = self.cursor.fetchone()
+        return {"resumido_hasta": resumido_hasta, "archivado_hasta": archivado_hasta}
+
+    def _first_pending_month(self, after):
+        """Primer día del mes de la asistencia más antigua desde `after`, o None si no hay"""
+        self.cursor.execute("SELECT MIN(fecha) FROM asistencias WHERE fecha >= ?", (after,))
+        oldest = self.cursor.fetchone()[0]
+        return oldest[:7] + "-01" if oldest else None
+
+    def roll_up_closed_months(self, today=None):
+        """Resume por socio y día las asistencias de los meses cerrados; devuelve las filas creadas"""
+        cutoff = first_day_of_month(0, today)
+        start = self.get_cutoffs()["resumido_hasta"]
+        if start >= cutoff:
+            return 0
+
+        # Un mes por transacción, para no bloquear por mucho tiempo al escritor de asistencias
+        month = self._first_pending_month(start) or cutoff
+        total = 0
+        while True:
+            month = min(next_month(month), cutoff)
+            total += self._roll_up_until(month)
+            if month >= cutoff:
+                return total
+
+    def _roll_up_until(self, until):
+        """Resume las asistencias desde el corte actual hasta `until` (exclusive)"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Se relee dentro de la transacción por si otro proceso ya resumió
+            start = self.get_cutoffs()["resumido_hasta"]
+            if start >= until:
+                self.conn.rollback()
+                return 0
+
+            self.cursor.execute("""
+                INSERT INTO asistencias_diarias (gimnasio_id, fecha, socio_id, cantidad)
+                SELECT s.gimnasio_id, substr(a.fecha, 1, 10), a.socio_id, COUNT(*)
+                FROM asistencias a
+                JOIN socios s ON s.id = a.socio_id
+                WHERE a.fecha >= ? AND a.fecha < ? AND s.gimnasio_id IS NOT NULL
+                GROUP BY s.gimnasio_id, substr(a.fecha, 1, 10), a.socio_id
+            """, (start, until))
+            rows = self.cursor.rowcount
+
+            # Desde aquí los triggers mantienen el resumen de las asistencias atrasadas
+            self.cursor.execute("UPDATE asistencias_cierre SET resumido_hasta = ?", (until,))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return rows
+
+    def archive_old_attendance(self, retention_months=RETENTION_MONTHS, today=None):
+        """Mueve a gym_archivo.db el detalle de los meses resumidos fuera de la retención.
+
+        Devuelve la cantidad de asistencias movidas.
+        """
+        cutoffs = self.get_cutoffs()
+        # Sólo se archiva lo que ya está resumido
+        cutoff = min(first_day_of_month(retention_months, today), cutoffs["resumido_hasta"])
+        if cutoff <= cutoffs["archivado_hasta"]:
+            return 0
+
+        month = self._first_pending_month(cutoffs["archivado_hasta"]) or cutoff
+        total = 0
+        self.conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (self.archive_path,))
+        try:
+            self.cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.asistencias (
+                    id INTEGER PRIMARY KEY,
+                    socio_id INTEGER NOT NULL,
+                    fecha TEXT NOT NULL
+                )
+            """)
+            self.cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_asistencias_socio_fecha
+                ON asistencias (socio_id, fecha)
+            """)
+            while True:
+                month = min(next_month(month), cutoff)
+                total += self._archive_until(month)
+                if month >= cutoff:
+                    return total
+        finally:
+            self.conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+
+    def _archive_until(self, until):
+        """Mueve al archivo el detalle anterior a `until` en una sola transacción"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.get_cutoffs()["archivado_hasta"] >= until:
+                self.conn.rollback()
+                return 0
+
+            # Los IDs se conservan: repetir el proceso tras una caída no duplica filas
+            self.cursor.execute(f"""
+                INSERT OR IGNORE INTO {ARCHIVE_SCHEMA}.asistencias (id, socio_id, fecha)
+                SELECT id, socio_id, fecha FROM main.asistencias WHERE fecha < ?
+            """, (until,))
+
+            # Mover el corte antes de borrar para que los triggers no
+            # descuenten estadísticas ni resúmenes por estas filas
+            self.cursor.execute("UPDATE main.asistencias_cierre SET archivado_hasta = ?", (until,))
+            self.cursor.execute("DELETE FROM main.asistencias WHERE fecha < ?", (until,))
+            moved = self.cursor.rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return moved
+
+    def run_maintenance(self):
+        """Resume los meses cerrados y archiva el detalle antiguo (al iniciar la aplicación)"""
+        return {
+            "resumidas": self.roll_up_closed_months(),
+            "archivadas": self.archive_old_attendance(),
+        }
+
+    def close(self):
+        """Libera el cursor; la conexión pertenece al pool compartido"""
+        if hasattr(self, 'cursor'):
+            self.cursor.close()
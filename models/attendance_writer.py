@@ -0,0 +1,211 @@
+import glob
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from utils.connection import get_connection, close_thread_connections, GYM_DB
+
+# Diario de asistencias pendientes de volcar a la base de datos
+JOURNAL_PATH = "asistencias.journal"
+
+class AttendanceWriter:
+    """Registra asistencias en segundo plano agrupando varias en un solo commit.
+
+    Cada asistencia se anota primero en un diario de texto y en una cola en
+    memoria; un hilo la vuelca a la tabla asistencias por lotes cuando se
+    alcanza batch_size o pasan flush_interval segundos. Al vaciar la cola el
+    diario se rota a un segmento con un identificador de lote, que se registra
+    en asistencias_lotes en la misma transacción que sus filas, de modo que
+    reaplicar un segmento tras una caída nunca duplica asistencias.
+    """
+    def __init__(self, db_path=GYM_DB, journal_path=JOURNAL_PATH, batch_size=50,
+                 flush_interval=2.0, fsync=False):
+        self.db_path = db_path
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Con fsync=True el diario también sobrevive a un corte de energía
+        self.fsync = fsync
+
+        self._pending = []
+        self._failed_segments = []
+        self._journal = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Reaplica los segmentos pendientes y arranca el hilo de escritura"""
+        self.replay()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="attendance-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Vuelca lo pendiente y detiene el hilo de escritura"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        with self._lock:
+            # Lo anotado después del último lote queda en el diario y se
+            # reaplica en el próximo arranque
+            self._journal.close()
+            self._journal = None
+
+    def register(self, member_id, fecha=None):
+        """Anota una asistencia; se escribirá en la base de datos en el próximo lote.
+
+        Devuelve False si el escritor ya está detenido: quien llama debe
+        insertar la asistencia directamente.
+        """
+        fecha = fecha or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            if self._journal is None:
+                return False
+            self._journal.write(f"{member_id}\t{fecha}\n")
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self._pending.append((member_id, fecha))
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+        return True
+
+    def pending_count(self):
+        """Devuelve la cantidad de asistencias aún no escritas en la base de datos"""
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        """Bucle del hilo de escritura"""
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+        close_thread_connections()
+
+    def flush(self):
+        """Escribe la cola pendiente y reintenta los lotes que fallaron antes"""
+        with self._lock:
+            if self._pending:
+                batch = self._pending
+                self._pending = []
+                segment = self._rotate_journal()
+                self._failed_segments.append((segment, batch))
+
+            segments = self._failed_segments
+            self._failed_segments = []
+
+        written = 0
+        for segment, rows in segments:
+            try:
+                written += self._apply_segment(segment, rows)
+            except Exception:
+                # La base de datos sigue bloqueada: el segmento queda en disco
+                # y se reintenta en el próximo ciclo
+                with self._lock:
+                    self._failed_segments.append((segment, rows))
+        return written
+
+    def _rotate_journal(self):
+        """Mueve el diario actual a un segmento con identificador de lote propio"""
+        segment = self._segment_name()
+        if self._journal is not None:
+            self._journal.close()
+        os.replace(self.journal_path, segment)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        return segment
+
+    def _segment_name(self):
+        """Nombre de segmento nuevo; el prefijo de tiempo ordena los segmentos como se grabaron"""
+        return f"{self.journal_path}.{time.time_ns():020d}-{uuid.uuid4().hex}"
+
+    def _apply_segment(self, segment, rows=None):
+        """Inserta las filas de un segmento en una sola transacción"""
+        lote = segment.rsplit(".", 1)[1]
+        if rows is None:
+            rows = self._read_segment(segment)
+
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT 1 FROM asistencias_lotes WHERE lote = ?", (lote,))
+            if not cursor.fetchone():
+                cursor.executemany("INSERT INTO asistencias (socio_id, fecha) VALUES (?, ?)", rows)
+                cursor.execute("INSERT INTO asistencias_lotes (lote, filas, fecha_aplicacion) VALUES (?, ?, ?)",
+                               (lote, len(rows), datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        os.remove(segment)
+        return len(rows)
+
+    def _read_segment(self, segment):
+        """Lee las asistencias de un segmento, ignorando una última línea incompleta"""
+        rows = []
+        with open(segment, encoding="utf-8") as file:
+            for line in file:
+                if not line.endswith("\n"):
+                    break
+                member_id, fecha = line.rstrip("\n").split("\t")
+                rows.append((int(member_id), fecha))
+        return rows
+
+    def replay(self):
+        """Escribe las asistencias que quedaron en disco tras un cierre inesperado"""
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > 0:
+            os.replace(self.journal_path, self._segment_name())
+
+        written = 0
+        deferred = []
+        for segment in sorted(glob.glob(glob.escape(self.journal_path) + ".*")):
+            if deferred:
+                # Tras el primer fallo los demás se dejan al hilo de escritura
+                # para no bloquear el arranque ni alterar el orden
+                deferred.append((segment, None))
+                continue
+            try:
+                written += self._apply_segment(segment)
+            except Exception:
+                deferred.append((segment, None))
+
+        if deferred:
+            with self._lock:
+                self._failed_segments[:0] = deferred
+        return written
+
+
+_writer = None
+
+def start_attendance_writer(**kwargs):
+    """Crea y arranca el escritor de asistencias compartido de la aplicación"""
+    global _writer
+    if _writer is None:
+        _writer = AttendanceWriter(**kwargs)
+        _writer.start()
+    return _writer
+
+
+def get_attendance_writer():
+    """Devuelve el escritor compartido, o None si no está en marcha"""
+    return _writer
+
+
+def stop_attendance_writer():
+    """Detiene el escritor compartido volcando las asistencias pendientes"""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
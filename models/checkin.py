@@ -0,0 +1,70 @@
+from datetime import datetime
+from models.attendance_writer import get_attendance_writer
+from models.member import classify_membership
+from utils.connection import get_connection, GYM_DB
+
+class CheckInModel:
+    """Registra el ingreso de un socio con una sola transacción por escaneo"""
+    def __init__(self):
+        self.conn = get_connection(GYM_DB)
+        self.cursor = self.conn.cursor()
+
+    def check_in(self, dni, gym_id):
+        """Busca al socio, clasifica su cuota y registra la asistencia con un único commit.
+
+        No modifica socios: las cuotas vencidas las marca MemberModel.expire_memberships.
+
+        Devuelve un diccionario con found=False si el DNI no pertenece al gimnasio.
+        """
+        self.cursor.execute('''
+            SELECT s.id, s.nombre, s.apellido, s.fecha_vencimiento, s.estado_cuota,
+                p.nombre, p.descripcion
+            FROM socios s
+            LEFT JOIN planes p ON s.plan_id = p.id
+            WHERE s.dni = ? AND s.gimnasio_id = ?
+        ''', (dni, gym_id))
+        member = self.cursor.fetchone()
+
+        if not member:
+            return {"found": False}
+
+        member_id, nombre, apellido, fecha_vencimiento, estado_cuota, plan_nombre, plan_descripcion = member
+
+        # Clasificar el estado de la cuota (por la fecha, aunque el barrido todavía no la haya marcado)
+        if estado_cuota == "No Pagada":
+            status, dias_restantes = "no_pagada", 0
+        else:
+            status, dias_restantes = classify_membership(fecha_vencimiento)
+
+        fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Con el escritor en segundo plano activo, la asistencia se escribe en su
+        # próximo lote; si ya se detuvo (cierre de sesión) se inserta aquí
+        writer = get_attendance_writer()
+        queued = writer is not None and writer.register(member_id, fecha_actual)
+        try:
+            if not queued:
+                self.cursor.execute("INSERT INTO asistencias (socio_id, fecha) VALUES (?, ?)",
+                                    (member_id, fecha_actual))
+
+            if self.conn.in_transaction:
+                self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        return {
+            "found": True,
+            "member_id": member_id,
+            "nombre": nombre,
+            "apellido": apellido,
+            "plan_nombre": plan_nombre,
+            "plan_descripcion": plan_descripcion,
+            "fecha_vencimiento": fecha_vencimiento,
+            "status": status,
+            "dias_restantes": dias_restantes
+        }
+
+    def close(self):
+        """Libera el cursor; la conexión pertenece al pool compartido"""
+        if hasattr(self, 'cursor'):
+            self.cursor.close()
@@ -0,0 +1,110 @@
+import threading
+from utils.connection import get_connection, close_thread_connections, ADMIN_DB
+
+class LastAccessWriter:
+    """Guarda el último acceso de los usuarios en segundo plano.
+
+    Los inicios de sesión sólo anotan la hora en un diccionario en memoria;
+    un hilo escribe lo acumulado cada flush_interval segundos en una única
+    transacción. Varios accesos del mismo usuario entre dos volcados se
+    combinan en una sola actualización con la hora más reciente. A
+    diferencia de las asistencias no hay diario en disco: perder el último
+    acceso de unos segundos ante un cierre inesperado es aceptable.
+    """
+    def __init__(self, db_path=ADMIN_DB, flush_interval=5.0):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Arranca el hilo de escritura"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="last-access-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Vuelca lo pendiente y detiene el hilo de escritura"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def register(self, user_id, fecha):
+        """Anota un acceso; reemplaza al anterior del mismo usuario si aún no se escribió"""
+        with self._lock:
+            if fecha > self._pending.get(user_id, ""):
+                self._pending[user_id] = fecha
+        return True
+
+    def pending_count(self):
+        """Devuelve la cantidad de usuarios con un acceso aún no escrito"""
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        """Bucle del hilo de escritura"""
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+        close_thread_connections()
+
+    def flush(self):
+        """Escribe los accesos pendientes en una sola transacción"""
+        with self._lock:
+            batch = self._pending
+            self._pending = {}
+        if not batch:
+            return 0
+
+        conn = get_connection(self.db_path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Nunca se retrocede un acceso ya guardado por otra instancia de la aplicación
+            conn.executemany("""
+                UPDATE usuarios SET ultimo_acceso = ?
+                WHERE id = ? AND (ultimo_acceso IS NULL OR ultimo_acceso < ?)
+            """, [(fecha, user_id, fecha) for user_id, fecha in batch.items()])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            # La base de datos sigue bloqueada: se reintenta en el próximo ciclo
+            # sin pisar accesos más recientes anotados mientras tanto
+            with self._lock:
+                for user_id, fecha in batch.items():
+                    if fecha > self._pending.get(user_id, ""):
+                        self._pending[user_id] = fecha
+            return 0
+        return len(batch)
+
+
+_writer = None
+
+def start_last_access_writer(**kwargs):
+    """Crea y arranca el escritor de últimos accesos compartido de la aplicación"""
+    global _writer
+    if _writer is None:
+        _writer = LastAccessWriter(**kwargs)
+        _writer.start()
+    return _writer
+
+
+def get_last_access_writer():
+    """Devuelve el escritor compartido, o None si no está en marcha"""
+    return _writer
+
+
+def stop_last_access_writer():
+    """Detiene el escritor compartido volcando los accesos pendientes"""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
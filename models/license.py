@@ -1,9 +1,21 @@
-import sqlite3
 from datetime import datetime, timedelta
+from utils.connection import get_connection, ADMIN_DB
+
+# Duración en días de cada tipo de licencia
+LICENSE_DAYS = {
+    "Mensual": 30,
+    "Trimestral": 90,
+    "Semestral": 180,
+    "Anual": 365,
+}
+
+# Modos de la operación masiva: continuar desde el vencimiento actual o empezar en la fecha indicada
+BULK_RENEW = "renovar"
+BULK_ASSIGN = "asignar"
 
 class LicenseModel:
     def __init__(self):
-        self.conn = sqlite3.connect('fitapp.db')
+        self.conn = get_connection(ADMIN_DB)
         self.cursor = self.conn.cursor()
     
     def get_all_licenses(self):
@@ -29,14 +41,7 @@ class LicenseModel:
     def add_license(self, gym_id, license_type, start_date, price):
         """Añade una nueva licencia a un gimnasio"""
         # Calcular fecha de vencimiento según tipo
-        days_mapping = {
-            "Mensual": 30,
-            "Trimestral": 90,
-            "Semestral": 180,
-            "Anual": 365
-        }
-        
-        days = days_mapping.get(license_type, 30)
+        days = LICENSE_DAYS.get(license_type, 30)
         end_date = (datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
         
         # Verificar si ya existe una licencia activa
@@ -64,6 +69,85 @@ class LicenseModel:
         self.conn.commit()
         return True
     
+    def _bulk_plan_sql(self, gym_count):
+        """Consulta que calcula, por gimnasio, la licencia que dejaría una operación masiva.
+        
+        Columnas: usuario_id, nombre_gimnasio, vencimiento actual, inicio y
+        vencimiento nuevos. Parámetros: modo, fecha de inicio, días del tipo
+        de licencia y los IDs de los gimnasios.
+        """
+        placeholders = ", ".join("?" * gym_count)
+        # Al renovar, la licencia nueva empieza cuando vence la actual si eso es
+        # posterior a la fecha de inicio, así no se pierden días ya pagados
+        return f"""
+            WITH pedido AS (SELECT ? AS modo, ? AS inicio, ? AS dias),
+            actual AS (
+                SELECT u.id AS usuario_id, u.nombre_gimnasio,
+                       (SELECT MAX(l.fecha_vencimiento) FROM licencias l
+                        WHERE l.usuario_id = u.id AND l.activa = 1) AS vencimiento_actual
+                FROM usuarios u
+                WHERE u.tipo = 'gimnasio' AND u.id IN ({placeholders})
+            ),
+            plan AS (
+                SELECT a.usuario_id, a.nombre_gimnasio, a.vencimiento_actual, p.dias,
+                       CASE WHEN p.modo = '{BULK_RENEW}' AND a.vencimiento_actual > p.inicio
+                            THEN a.vencimiento_actual ELSE p.inicio END AS inicio
+                FROM actual a, pedido p
+            )
+            SELECT usuario_id, nombre_gimnasio, vencimiento_actual, inicio,
+                   date(inicio, '+' || dias || ' days') AS vencimiento
+            FROM plan
+        """
+    
+    def preview_bulk_licenses(self, gym_ids, license_type, start_date, mode=None):
+        """Calcula sin guardar nada las licencias que dejaría add_licenses_bulk.
+        
+        Devuelve filas (gym_id, nombre, vencimiento actual, inicio, vencimiento nuevo).
+        """
+        if not gym_ids:
+            return []
+        mode = mode or BULK_RENEW
+        self.cursor.execute(self._bulk_plan_sql(len(gym_ids)) + " ORDER BY nombre_gimnasio",
+                            (mode, start_date, LICENSE_DAYS.get(license_type, 30), *gym_ids))
+        return self.cursor.fetchall()
+    
+    def add_licenses_bulk(self, gym_ids, license_type, start_date, price, mode=None):
+        """Renueva o asigna una licencia a varios gimnasios en una sola transacción.
+        
+        Con BULK_RENEW la licencia nueva empieza al vencer la activa (o en
+        start_date si ya venció); con BULK_ASSIGN empieza en start_date. En
+        ambos casos la licencia activa anterior queda revocada. Devuelve la
+        cantidad de licencias creadas.
+        """
+        if not gym_ids:
+            return 0
+        mode = mode or BULK_RENEW
+        placeholders = ", ".join("?" * len(gym_ids))
+        
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM licencias")
+            last_id = self.cursor.fetchone()[0]
+            
+            # Las licencias nuevas se calculan sobre las activas antes de revocarlas
+            self.cursor.execute(f"""
+                INSERT INTO licencias (usuario_id, tipo, fecha_inicio, fecha_vencimiento, precio, activa)
+                SELECT usuario_id, ?, inicio, vencimiento, ?, 1
+                FROM ({self._bulk_plan_sql(len(gym_ids))})
+            """, (license_type, price, mode, start_date, LICENSE_DAYS.get(license_type, 30), *gym_ids))
+            created = self.cursor.rowcount
+            
+            self.cursor.execute(f"""
+                UPDATE licencias
+                SET activa = 0
+                WHERE activa = 1 AND id <= ? AND usuario_id IN ({placeholders})
+            """, (last_id, *gym_ids))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return created
+    
     def revoke_license(self, license_id):
         """Revoca una licencia activa"""
         self.cursor.execute("UPDATE licencias SET activa = 0 WHERE id = ?", (license_id,))
@@ -90,21 +174,14 @@ class LicenseModel:
     
     def get_license_stats(self):
         """Obtiene estadísticas de licencias"""
-        # Total de gimnasios
-        self.cursor.execute("SELECT COUNT(*) FROM usuarios WHERE tipo = 'gimnasio'")
-        total_gyms = self.cursor.fetchone()[0]
-        
-        # Gimnasios activos
-        self.cursor.execute("SELECT COUNT(*) FROM usuarios WHERE tipo = 'gimnasio' AND activo = 1")
-        active_gyms = self.cursor.fetchone()[0]
-        
-        # Licencias activas
-        self.cursor.execute("SELECT COUNT(*) FROM licencias WHERE activa = 1")
-        active_licenses = self.cursor.fetchone()[0]
+        # Totales globales mantenidos por triggers
+        self.cursor.execute("SELECT grupo, clave, valor FROM stats WHERE gimnasio_id = 0")
+        stats = {(grupo, clave): valor for grupo, clave, valor in self.cursor.fetchall()}
         
-        # Calcular ingresos totales
-        self.cursor.execute("SELECT SUM(precio) FROM licencias")
-        total_revenue = self.cursor.fetchone()[0] or 0
+        total_gyms = int(stats.get(("gimnasios", "total"), 0))
+        active_gyms = int(stats.get(("gimnasios", "activos"), 0))
+        active_licenses = int(stats.get(("licencias", "activas"), 0))
+        total_revenue = stats.get(("licencias", "ingresos"), 0)
         
         return {
             "total_gyms": total_gyms,
@@ -114,7 +191,31 @@ class LicenseModel:
             "percent_active": (active_gyms/total_gyms*100) if total_gyms > 0 else 0
         }
     
+    def export_gyms_report(self):
+        """Obtiene un cursor con los datos para exportar el informe de gimnasios"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT id, nombre_gimnasio, username, email, fecha_registro, 
+                   ultimo_acceso, activo
+            FROM usuarios
+            WHERE tipo = 'gimnasio'
+            ORDER BY nombre_gimnasio
+        """)
+        return cursor
+    
+    def export_licenses_report(self):
+        """Obtiene un cursor con los datos para exportar el informe de licencias"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT l.id, u.nombre_gimnasio, l.tipo, l.fecha_inicio, 
+                   l.fecha_vencimiento, l.precio, l.activa
+            FROM licencias l
+            JOIN usuarios u ON l.usuario_id = u.id
+            ORDER BY l.fecha_vencimiento DESC
+        """)
+        return cursor
+    
     def close(self):
-        """Cierra la conexión a la base de datos"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
\ No newline at end of file
+        """Libera el cursor; la conexión pertenece al pool compartido"""
+        if hasattr(self, 'cursor'):
+            self.cursor.close()
\ No newline at end of file
@@ -1,9 +1,61 @@
-import sqlite3
+import re
 from datetime import datetime, timedelta
+from models.attendance_writer import get_attendance_writer
+from utils.cache import VersionedCache
+from utils.connection import get_connection, GYM_DB
+
+# Días antes del vencimiento en los que se avisa que la cuota está por vencer
+DIAS_AVISO_VENCIMIENTO = 10
+
+
+def classify_membership(fecha_vencimiento, fecha_actual=None):
+    """Clasifica una membresía como vencida, por vencer o al día según su fecha de vencimiento"""
+    fecha_venc = datetime.strptime(fecha_vencimiento, "%Y-%m-%d")
+    fecha_actual = fecha_actual or datetime.now()
+    dias_restantes = (fecha_venc - fecha_actual).days
+    
+    if dias_restantes <= 0:
+        return "vencida", 0
+    elif dias_restantes <= DIAS_AVISO_VENCIMIENTO:
+        return "por_vencer", dias_restantes
+    else:
+        return "al_dia", dias_restantes
+
+
+# Listas de vencimientos próximos, válidas hasta que cambian los socios del gimnasio
+_expiring_cache = VersionedCache()
+
+
+# Cantidad máxima de resultados de la búsqueda de socios
+SEARCH_LIMIT = 50
+
+
+def build_search_query(text, gym_id):
+    """Arma la consulta FTS5: cada palabra como prefijo en los datos del socio, dentro del gimnasio"""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = " AND ".join(f'{{nombre apellido dni telefono}} : "{word}"*' for word in words)
+    return f'gimnasio_id : "{int(gym_id)}" AND {terms}'
+
+
+# Expresiones de ordenamiento por columna de la tabla de socios (los NULL se
+# ordenan como texto vacío para que la paginación por clave sea estable)
+MEMBER_SORT_COLUMNS = {
+    0: "s.id",
+    1: "s.nombre",
+    2: "s.apellido",
+    3: "s.dni",
+    4: "COALESCE(s.telefono, '')",
+    5: "s.fecha_vencimiento",
+    6: "s.estado_cuota",
+    7: "COALESCE(p.nombre, '')",
+}
+
 
 class MemberModel:
     def __init__(self):
-        self.conn = sqlite3.connect('gym.db')
+        self.conn = get_connection(GYM_DB)
         self.cursor = self.conn.cursor()
     
     def get_all_members(self, gym_id):
@@ -16,6 +68,87 @@ class MemberModel:
         """, (gym_id,))
         return self.cursor.fetchall()
     
+    def get_members_page(self, gym_id, limit, after=None, sort_column=0, descending=False):
+        """Obtiene una página de socios ordenada, continuando después de la clave `after`.
+        
+        Devuelve las filas (mismas columnas que get_all_members) y la clave de
+        la última fila, que se pasa como `after` para pedir la página siguiente.
+        """
+        sort_expr = MEMBER_SORT_COLUMNS[sort_column]
+        direction = "DESC" if descending else "ASC"
+        
+        params = [gym_id]
+        keyset = ""
+        if after is not None:
+            keyset = f"AND ({sort_expr}, s.id) {'<' if descending else '>'} (?, ?)"
+            params.extend(after)
+        params.append(limit)
+        
+        self.cursor.execute(f"""
+            SELECT s.id, s.nombre, s.apellido, s.dni, s.telefono, s.fecha_vencimiento, s.estado_cuota, p.nombre,
+                   {sort_expr}
+            FROM socios s
+            LEFT JOIN planes p ON s.plan_id = p.id
+            WHERE s.gimnasio_id = ? {keyset}
+            ORDER BY {sort_expr} {direction}, s.id {direction}
+            LIMIT ?
+        """, params)
+        rows = self.cursor.fetchall()
+        
+        if not rows:
+            return [], after
+        last = rows[-1]
+        return [row[:8] for row in rows], (last[8], last[0])
+    
+    def has_search_index(self):
+        """Indica si la base tiene el índice FTS5 de socios (depende de la compilación de SQLite)"""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'socios_fts'")
+        return self.cursor.fetchone() is not None
+    
+    def search_members(self, gym_id, text, limit=SEARCH_LIMIT):
+        """Busca socios por prefijos de nombre, apellido, DNI o teléfono (mismas columnas que get_all_members)"""
+        if not self.has_search_index():
+            return self._search_members_like(gym_id, text, limit)
+        
+        query = build_search_query(text, gym_id)
+        if query is None:
+            return []
+        
+        # Ordenar por relevancia (rank) obliga a puntuar todas las coincidencias antes
+        # del LIMIT, y un prefijo corto coincide con decenas de miles de socios. Se
+        # toman las primeras en el orden del índice y sólo esas se ordenan por nombre
+        self.cursor.execute("""
+            SELECT s.id, s.nombre, s.apellido, s.dni, s.telefono, s.fecha_vencimiento, s.estado_cuota, p.nombre
+            FROM (SELECT rowid FROM socios_fts WHERE socios_fts MATCH ? LIMIT ?) f
+            JOIN socios s ON s.id = f.rowid
+            LEFT JOIN planes p ON s.plan_id = p.id
+            ORDER BY s.apellido, s.nombre
+        """, (query, limit))
+        return self.cursor.fetchall()
+    
+    def _search_members_like(self, gym_id, text, limit):
+        """Búsqueda por prefijo con LIKE cuando SQLite no tiene FTS5"""
+        words = re.findall(r"\w+", text)
+        if not words:
+            return []
+        
+        conditions = []
+        params = [gym_id]
+        for word in words:
+            conditions.append("(s.nombre LIKE ? OR s.apellido LIKE ? OR s.dni LIKE ? OR s.telefono LIKE ?)")
+            params.extend([f"{word}%"] * 4)
+        params.append(limit)
+        
+        self.cursor.execute(f"""
+            SELECT s.id, s.nombre, s.apellido, s.dni, s.telefono, s.fecha_vencimiento, s.estado_cuota, p.nombre
+            FROM socios s
+            LEFT JOIN planes p ON s.plan_id = p.id
+            WHERE s.gimnasio_id = ? AND {" AND ".join(conditions)}
+            ORDER BY s.apellido, s.nombre
+            LIMIT ?
+        """, params)
+        return self.cursor.fetchall()
+    
     def get_member_by_dni(self, dni, gym_id):
         """Busca un socio por su DNI"""
         self.cursor.execute('''
@@ -30,6 +163,12 @@ class MemberModel:
     def register_attendance(self, member_id):
         """Registra la asistencia de un socio"""
         fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Con el escritor en segundo plano activo, la asistencia se agrupa en su próximo lote
+        writer = get_attendance_writer()
+        if writer is not None and writer.register(member_id, fecha_actual):
+            return True
+        
         self.cursor.execute("INSERT INTO asistencias (socio_id, fecha) VALUES (?, ?)", 
                          (member_id, fecha_actual))
         self.conn.commit()
@@ -37,24 +176,89 @@ class MemberModel:
     
     def check_membership_status(self, member_id, fecha_vencimiento):
         """Verifica el estado de la membresía de un socio"""
-        fecha_venc = datetime.strptime(fecha_vencimiento, "%Y-%m-%d")
-        fecha_actual = datetime.now()
-        dias_restantes = (fecha_venc - fecha_actual).days
+        # El cambio de estado a 'No Pagada' lo hace expire_memberships para todos los socios
+        return classify_membership(fecha_vencimiento)
+    
+    def expire_memberships(self, fecha_actual=None):
+        """Marca como no pagadas las cuotas vencidas de todos los socios y registra cuáles cambió.
+
+        Devuelve la cantidad de socios actualizados.
+        """
+        fecha_actual = fecha_actual or datetime.now()
+        # Mismo criterio que classify_membership: vence si faltan menos de 24 horas
+        fecha_corte = (fecha_actual + timedelta(days=1)).strftime("%Y-%m-%d")
+        fecha_proceso = fecha_actual.strftime("%Y-%m-%d %H:%M:%S")
         
-        if dias_restantes <= 0:
-            # Actualizar estado a no pagada si venció
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.cursor.execute('''
+                INSERT INTO cuotas_vencidas (socio_id, gimnasio_id, fecha_vencimiento, fecha_proceso)
+                SELECT id, gimnasio_id, fecha_vencimiento, ?
+                FROM socios
+                WHERE estado_cuota = 'Pagada' AND fecha_vencimiento <= ?
+            ''', (fecha_proceso, fecha_corte))
+            
             self.cursor.execute('''
                 UPDATE socios
                 SET estado_cuota = 'No Pagada'
-                WHERE id = ?
-            ''', (member_id,))
+                WHERE estado_cuota = 'Pagada' AND fecha_vencimiento <= ?
+            ''', (fecha_corte,))
+            expired = self.cursor.rowcount
             self.conn.commit()
-            
-            return "vencida", 0
-        elif dias_restantes <= 10:
-            return "por_vencer", dias_restantes
-        else:
-            return "al_dia", dias_restantes
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        return expired
+    
+    def _expiring_range(self, days):
+        """Fechas de vencimiento (desde exclusive, hasta inclusive) de las cuotas que vencen en 1 a `days` días"""
+        today = datetime.now()
+        # Mismo criterio que classify_membership: con vencimiento mañana la cuota ya está vencida
+        return ((today + timedelta(days=1)).strftime("%Y-%m-%d"),
+                (today + timedelta(days=days + 1)).strftime("%Y-%m-%d"))
+    
+    def _data_version(self, gym_id):
+        """Versión de los socios del gimnasio y de los nombres de planes (contadores mantenidos por triggers)"""
+        self.cursor.execute("""
+            SELECT (SELECT valor FROM stats WHERE grupo = 'versiones' AND gimnasio_id = ? AND clave = 'socios'),
+                   (SELECT valor FROM stats WHERE grupo = 'versiones' AND gimnasio_id = 0 AND clave = 'planes')
+        """, (gym_id,))
+        return self.cursor.fetchone()
+    
+    def get_expiring_members(self, gym_id, days=DIAS_AVISO_VENCIMIENTO):
+        """Obtiene los socios al día cuya cuota vence en los próximos `days` días, del más urgente al menos.
+        
+        Cada fila es (id, nombre, apellido, dni, teléfono, fecha de vencimiento,
+        plan, días restantes). El resultado se reutiliza hasta que cambian los
+        socios del gimnasio o la fecha.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        version = (today, *self._data_version(gym_id))
+        return _expiring_cache.get((gym_id, days), version, lambda: self._load_expiring_members(gym_id, days))
+    
+    def _load_expiring_members(self, gym_id, days):
+        """Consulta por rango en el índice (gimnasio, vencimiento) de los socios al día"""
+        return self._expiring_query(self.cursor, gym_id, days, "s.id, ").fetchall()
+    
+    def _expiring_query(self, cursor, gym_id, days, extra_columns=""):
+        """Ejecuta la consulta de vencimientos próximos en el cursor dado y lo devuelve"""
+        desde, hasta = self._expiring_range(days)
+        # Días restantes como en classify_membership: hoy ya transcurrido cuenta como un día menos
+        cursor.execute(f"""
+            SELECT {extra_columns}s.nombre, s.apellido, s.dni, s.telefono, s.fecha_vencimiento, p.nombre,
+                   CAST(julianday(s.fecha_vencimiento) - julianday(?) AS INTEGER) - 1
+            FROM socios s
+            LEFT JOIN planes p ON s.plan_id = p.id
+            WHERE s.gimnasio_id = ? AND s.estado_cuota = 'Pagada'
+              AND s.fecha_vencimiento > ? AND s.fecha_vencimiento <= ?
+            ORDER BY s.fecha_vencimiento, s.apellido, s.nombre
+        """, (datetime.now().strftime("%Y-%m-%d"), gym_id, desde, hasta))
+        return cursor
+    
+    def export_expiring_members(self, gym_id, days=DIAS_AVISO_VENCIMIENTO):
+        """Obtiene un cursor con los socios cuya cuota vence en los próximos `days` días"""
+        return self._expiring_query(self.conn.cursor(), gym_id, days)
     
     def add_member(self, nombre, apellido, dni, telefono, plan_id, estado_cuota, gym_id):
         """Agrega un nuevo socio"""
@@ -76,6 +280,44 @@ class MemberModel:
         self.conn.commit()
         return True, None
     
+    def get_all_dnis(self):
+        """Obtiene el conjunto de DNI registrados en todos los gimnasios (la unicidad es global)"""
+        self.cursor.execute("SELECT dni FROM socios")
+        return {row[0] for row in self.cursor}
+    
+    def add_members_batch(self, members):
+        """Inserta varios socios en una sola transacción.
+        
+        Cada socio es una tupla (nombre, apellido, dni, teléfono, plan_id,
+        fecha_registro, fecha_vencimiento, estado_cuota, gimnasio_id) ya
+        validada. Los DNI que otro usuario registró mientras tanto se omiten
+        sin interrumpir el lote.
+        
+        Devuelve la cantidad de socios insertados y la lista de DNI omitidos.
+        """
+        sql = '''
+            INSERT INTO socios (nombre, apellido, dni, telefono, plan_id, fecha_registro, fecha_vencimiento, estado_cuota, gimnasio_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(dni) DO NOTHING
+        '''
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.cursor.executemany(sql, members)
+            skipped = []
+            if self.cursor.rowcount < len(members):
+                # Hubo DNI repetidos: se repite el lote fila por fila para saber cuáles
+                self.conn.rollback()
+                self.conn.execute("BEGIN IMMEDIATE")
+                for member in members:
+                    self.cursor.execute(sql, member)
+                    if self.cursor.rowcount == 0:
+                        skipped.append(member[2])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return len(members) - len(skipped), skipped
+    
     def update_member(self, member_id, nombre, apellido, dni, telefono, plan_id, estado_cuota):
         """Actualiza los datos de un socio existente"""
         # Verificar si el DNI pertenece a otro socio
@@ -111,10 +353,12 @@ class MemberModel:
     
     def delete_member(self, member_id):
         """Elimina un socio y sus asistencias"""
+        # Eliminar asistencias asociadas (antes que el socio, para que las
+        # estadísticas puedan descontarlas de su gimnasio)
+        self.cursor.execute("DELETE FROM asistencias WHERE socio_id = ?", (member_id,))
+        self.cursor.execute("DELETE FROM asistencias_diarias WHERE socio_id = ?", (member_id,))
         # Eliminar socio
         self.cursor.execute("DELETE FROM socios WHERE id = ?", (member_id,))
-        # Eliminar asistencias asociadas
-        self.cursor.execute("DELETE FROM asistencias WHERE socio_id = ?", (member_id,))
         
         self.conn.commit()
         return True
@@ -122,22 +366,25 @@ class MemberModel:
     def get_attendance_stats(self, gym_id):
         """Obtiene estadísticas de asistencia para un gimnasio"""
         first_day = datetime.now().replace(day=1).strftime("%Y-%m-%d")
+        # Suma los contadores diarios del mes mantenidos por triggers
         self.cursor.execute("""
-            SELECT COUNT(*) FROM asistencias a
-            JOIN socios s ON a.socio_id = s.id
-            WHERE s.gimnasio_id = ? AND a.fecha >= ?
+            SELECT COALESCE(SUM(valor), 0) FROM stats
+            WHERE grupo = 'asistencias' AND gimnasio_id = ? AND clave >= ?
         """, (gym_id, first_day))
-        return self.cursor.fetchone()[0]
+        return int(self.cursor.fetchone()[0])
     
     def get_member_status_stats(self, gym_id):
         """Obtiene estadísticas sobre el estado de los socios"""
-        # Total de socios
-        self.cursor.execute("SELECT COUNT(*) FROM socios WHERE gimnasio_id = ?", (gym_id,))
-        total_members = self.cursor.fetchone()[0]
+        # Cantidad de socios por estado de cuota, mantenida por triggers
+        self.cursor.execute("""
+            SELECT clave, valor FROM stats
+            WHERE grupo = 'socios' AND gimnasio_id = ?
+        """, (gym_id,))
+        counts = dict(self.cursor.fetchall())
         
+        total_members = int(sum(counts.values()))
         # Socios con cuota al día
-        self.cursor.execute("SELECT COUNT(*) FROM socios WHERE gimnasio_id = ? AND estado_cuota = 'Pagada'", (gym_id,))
-        active_members = self.cursor.fetchone()[0]
+        active_members = int(counts.get("Pagada", 0))
         
         return {
             "total": total_members,
@@ -146,8 +393,9 @@ class MemberModel:
         }
     
     def export_members_report(self, gym_id):
-        """Obtiene datos para exportar reporte de socios"""
-        self.cursor.execute("""
+        """Obtiene un cursor con los datos para exportar reporte de socios"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
             SELECT s.id, s.nombre, s.apellido, s.dni, s.telefono, s.fecha_registro, 
                    s.fecha_vencimiento, s.estado_cuota, p.nombre as plan 
             FROM socios s
@@ -156,15 +404,17 @@ class MemberModel:
             ORDER BY s.apellido, s.nombre
         """, (gym_id,))
         
-        return self.cursor.fetchall()
+        # Se devuelve el cursor para que el llamador lea las filas por bloques
+        return cursor
     
     def export_attendance_report(self, gym_id):
-        """Obtiene datos para exportar reporte de asistencias"""
+        """Obtiene un cursor con los datos para exportar reporte de asistencias"""
         # Obtener rango de fechas
         start_date = datetime.now().replace(day=1).strftime("%Y-%m-%d")  # Primer día del mes
         end_date = datetime.now().strftime("%Y-%m-%d")  # Hoy
         
-        self.cursor.execute("""
+        cursor = self.conn.cursor()
+        cursor.execute("""
             SELECT a.fecha, s.nombre, s.apellido, s.dni
             FROM asistencias a
             JOIN socios s ON a.socio_id = s.id
@@ -172,9 +422,9 @@ class MemberModel:
             ORDER BY a.fecha DESC, s.apellido, s.nombre
         """, (gym_id, start_date, end_date))
         
-        return self.cursor.fetchall()
+        return cursor
     
     def close(self):
-        """Cierra la conexión a la base de datos"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
\ No newline at end of file
+        """Libera el cursor; la conexión pertenece al pool compartido"""
+        if hasattr(self, 'cursor'):
+            self.cursor.close()
\ No newline at end of file
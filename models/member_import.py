@@ -0,0 +1,252 @@
+import csv
+import os
+import threading
+import unicodedata
+from datetime import datetime, timedelta
+
+from models.member import MemberModel
+from models.plan import PlanModel
+from utils.connection import close_thread_connections
+from utils.validators import (ValidationError, normalize_name, normalize_dni, normalize_phone,
+                              normalize_date, normalize_payment_status, normalize_text)
+
+# Socios que se insertan en cada transacción
+CHUNK_SIZE = 1000
+
+# Días de cuota que se asignan si el archivo no trae la fecha de vencimiento (igual que add_member)
+DEFAULT_MEMBERSHIP_DAYS = 30
+
+# Encabezados aceptados (en minúsculas y sin acentos) -> campo
+COLUMN_ALIASES = {
+    "nombre": "nombre",
+    "nombres": "nombre",
+    "apellido": "apellido",
+    "apellidos": "apellido",
+    "dni": "dni",
+    "documento": "dni",
+    "telefono": "telefono",
+    "celular": "telefono",
+    "plan": "plan",
+    "estado": "estado_cuota",
+    "estado cuota": "estado_cuota",
+    "vencimiento": "fecha_vencimiento",
+    "fecha vencimiento": "fecha_vencimiento",
+}
+
+REQUIRED_COLUMNS = ("nombre", "apellido", "dni")
+
+
+class ImportCancelled(Exception):
+    """La importación fue cancelada antes de terminar"""
+
+
+def _header_key(header):
+    """Encabezado en minúsculas, sin acentos ni separadores, para buscarlo en COLUMN_ALIASES"""
+    text = unicodedata.normalize("NFKD", header or "").encode("ascii", "ignore").decode("ascii")
+    return " ".join(text.lower().replace("_", " ").split())
+
+
+def reject_path_for(path):
+    """Ruta del informe de rechazos junto al archivo importado"""
+    base, _ = os.path.splitext(path)
+    return f"{base}_rechazos.csv"
+
+
+def _open_rows(file):
+    """Devuelve un lector CSV detectando si el separador es coma o punto y coma"""
+    sample = file.read(4096)
+    file.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    return csv.reader(file, dialect)
+
+
+class MemberValidator:
+    """Valida y normaliza las filas del archivo y descarta los DNI ya registrados o repetidos"""
+    def __init__(self, gym_id, default_plan_id, plans_by_name, known_dnis, default_status="Pagada"):
+        self.gym_id = gym_id
+        self.default_plan_id = default_plan_id
+        self.plans_by_name = plans_by_name
+        self.seen_dnis = known_dnis
+        self.default_status = default_status
+        self.fecha_registro = datetime.now().strftime("%Y-%m-%d")
+        self.default_vencimiento = (datetime.now() + timedelta(days=DEFAULT_MEMBERSHIP_DAYS)).strftime("%Y-%m-%d")
+
+    def validate(self, record):
+        """Devuelve la tupla para add_members_batch o lanza ValidationError con el motivo"""
+        nombre = normalize_name(record.get("nombre"), "Nombre")
+        apellido = normalize_name(record.get("apellido"), "Apellido")
+        dni = normalize_dni(record.get("dni"))
+        telefono = normalize_phone(record.get("telefono"))
+
+        plan_name = normalize_text(record.get("plan"))
+        if plan_name:
+            plan_id = self.plans_by_name.get(plan_name.lower())
+            if plan_id is None:
+                raise ValidationError(f"Plan desconocido: {plan_name!r}")
+        else:
+            plan_id = self.default_plan_id
+
+        estado = record.get("estado_cuota")
+        estado_cuota = normalize_payment_status(estado) if normalize_text(estado) else self.default_status
+
+        vencimiento = record.get("fecha_vencimiento")
+        fecha_vencimiento = normalize_date(vencimiento) if normalize_text(vencimiento) else self.default_vencimiento
+
+        # El DNI se marca como visto recién cuando la fila es válida
+        if dni in self.seen_dnis:
+            raise ValidationError(f"DNI {dni} ya registrado")
+        self.seen_dnis.add(dni)
+
+        return (nombre, apellido, dni, telefono, plan_id, self.fecha_registro,
+                fecha_vencimiento, estado_cuota, self.gym_id)
+
+
+def load_known_dnis(member_model):
+    """Carga una vez los DNI existentes, normalizados para compararlos con los del archivo"""
+    known = set()
+    for dni in member_model.get_all_dnis():
+        try:
+            known.add(normalize_dni(dni))
+        except ValidationError:
+            known.add(dni)
+    return known
+
+
+def import_members(path, gym_id, default_plan_id, chunk_size=CHUNK_SIZE, progress=None,
+                   cancel_event=None, reject_path=None):
+    """Importa socios desde un CSV leyéndolo fila por fila e insertando por bloques.
+
+    Las filas inválidas o con DNI repetido (también los que se registren
+    durante la importación) se escriben en el informe de rechazos (fila original más el motivo). Devuelve un diccionario con las
+    cantidades importadas y rechazadas y la ruta del informe, o None como
+    ruta si no hubo rechazos. Si se cancela, los bloques ya insertados se
+    conservan.
+    """
+    reject_path = reject_path or reject_path_for(path)
+    member_model = MemberModel()
+    plan_model = PlanModel()
+    try:
+        plans_by_name = {nombre.lower(): plan_id for plan_id, nombre, _, _ in plan_model.get_all_plans()}
+        validator = MemberValidator(gym_id, default_plan_id, plans_by_name, load_known_dnis(member_model))
+
+        imported = rejected = 0
+        # Socios validados del bloque y su línea y fila original, para el informe de rechazos
+        batch = []
+        batch_rows = {}
+        reject_file = reject_writer = None
+
+        def reject(line_number, row, reason):
+            nonlocal reject_file, reject_writer, rejected
+            if reject_writer is None:
+                reject_file = open(reject_path, "w", encoding="utf-8", newline="")
+                reject_writer = csv.writer(reject_file)
+                reject_writer.writerow(["Línea", *headers, "Motivo"])
+            reject_writer.writerow([line_number, *row, reason])
+            rejected += 1
+
+        def insert_batch():
+            nonlocal imported
+            inserted, skipped = member_model.add_members_batch(batch)
+            imported += inserted
+            for dni in skipped:
+                reject(*batch_rows[dni], f"DNI {dni} ya registrado")
+            batch.clear()
+            batch_rows.clear()
+
+        with open(path, encoding="utf-8-sig", newline="") as file:
+            rows = _open_rows(file)
+            headers = next(rows, None)
+            if headers is None:
+                raise ValidationError("El archivo está vacío")
+            fields = [COLUMN_ALIASES.get(_header_key(header)) for header in headers]
+            missing = [column for column in REQUIRED_COLUMNS if column not in fields]
+            if missing:
+                raise ValidationError(f"Faltan las columnas: {', '.join(missing)}")
+
+            try:
+                for line_number, row in enumerate(rows, start=2):
+                    if not any(cell.strip() for cell in row):
+                        continue
+                    record = {field: value for field, value in zip(fields, row) if field}
+                    try:
+                        member = validator.validate(record)
+                    except ValidationError as e:
+                        reject(line_number, row, str(e))
+                    else:
+                        batch.append(member)
+                        batch_rows[member[2]] = (line_number, row)
+
+                    if len(batch) >= chunk_size:
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise ImportCancelled()
+                        insert_batch()
+                        if progress is not None:
+                            progress(imported, rejected)
+
+                if batch:
+                    insert_batch()
+                if progress is not None:
+                    progress(imported, rejected)
+            finally:
+                if reject_file is not None:
+                    reject_file.close()
+    finally:
+        member_model.close()
+        plan_model.close()
+
+    return {
+        "importados": imported,
+        "rechazados": rejected,
+        "rechazos": reject_path if rejected else None,
+    }
+
+
+class ImportJob:
+    """Ejecuta una importación en un hilo aparte para no bloquear la interfaz.
+
+    Los callbacks se invocan desde el hilo de importación.
+    """
+    def __init__(self, path, gym_id, default_plan_id, on_progress=None, on_finished=None,
+                 on_cancelled=None, on_error=None):
+        self.path = path
+        self.gym_id = gym_id
+        self.default_plan_id = default_plan_id
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.on_cancelled = on_cancelled
+        self.on_error = on_error
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Inicia la importación en segundo plano"""
+        self._thread = threading.Thread(target=self._run, name="import", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Pide que la importación se detenga antes del próximo bloque"""
+        self._cancel_event.set()
+
+    def wait(self, timeout=None):
+        """Espera a que termine el hilo de importación"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            summary = import_members(self.path, self.gym_id, self.default_plan_id,
+                                     progress=self.on_progress, cancel_event=self._cancel_event)
+        except ImportCancelled:
+            if self.on_cancelled is not None:
+                self.on_cancelled()
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(e)
+        else:
+            if self.on_finished is not None:
+                self.on_finished(summary)
+        finally:
+            close_thread_connections()
@@ -1,24 +1,91 @@
-import sqlite3
+import threading
+import weakref
+from utils.connection import get_connection, GYM_DB
+
+
+class PlanCatalog:
+    """Planes en memoria, indexados por ID y por nombre.
+
+    Los planes son pocos y se leen en cada formulario de socios, así que se
+    cargan una vez y se reutilizan. PlanModel descarta el catálogo después de
+    cada alta, modificación o baja. Para los cambios hechos por otros procesos,
+    cada lectura consulta PRAGMA data_version de la conexión (que sólo cambia
+    cuando otra conexión confirmó una escritura) y, si cambió, el contador
+    ('versiones', 0, 'planes') que mantienen los triggers de planes.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        # (planes ordenados por ID, {id: plan}, {nombre: plan}, nombres ordenados)
+        self._data = None
+        # data_version visto por cada conexión la última vez que validó el catálogo
+        self._seen = weakref.WeakKeyDictionary()
+
+    def invalidate(self):
+        """Descarta el catálogo; la próxima lectura lo vuelve a cargar"""
+        with self._lock:
+            self._data = None
+            self._version = None
+            self._seen.clear()
+
+    def _load(self, conn):
+        """Devuelve el catálogo vigente para la conexión, recargándolo si cambió"""
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        with self._lock:
+            if self._data is not None and self._seen.get(conn) == data_version:
+                return self._data
+
+        version = conn.execute("""
+            SELECT valor FROM stats WHERE grupo = 'versiones' AND gimnasio_id = 0 AND clave = 'planes'
+        """).fetchone()
+        with self._lock:
+            if self._data is not None and self._version == version:
+                self._seen[conn] = data_version
+                return self._data
+
+        plans = conn.execute("SELECT id, nombre, descripcion, precio FROM planes ORDER BY id").fetchall()
+        by_name = {plan[1]: plan for plan in plans}
+        data = (plans, {plan[0]: plan for plan in plans}, by_name, sorted(by_name))
+        with self._lock:
+            self._data = data
+            self._version = version
+            self._seen.clear()
+            self._seen[conn] = data_version
+        return data
+
+    def plans(self, conn):
+        return list(self._load(conn)[0])
+
+    def by_id(self, conn, plan_id):
+        return self._load(conn)[1].get(plan_id)
+
+    def by_name(self, conn, name):
+        return self._load(conn)[2].get(name)
+
+    def names(self, conn):
+        return list(self._load(conn)[3])
+
+
+_catalog = PlanCatalog()
+
 
 class PlanModel:
     def __init__(self):
-        self.conn = sqlite3.connect('gym.db')
+        self.conn = get_connection(GYM_DB)
         self.cursor = self.conn.cursor()
     
     def get_all_plans(self):
         """Obtiene todos los planes"""
-        self.cursor.execute("SELECT id, nombre, descripcion, precio FROM planes")
-        return self.cursor.fetchall()
+        return _catalog.plans(self.conn)
     
     def get_plan_by_id(self, plan_id):
         """Obtiene un plan por su ID"""
-        self.cursor.execute("SELECT id, nombre, descripcion, precio FROM planes WHERE id = ?", (plan_id,))
-        return self.cursor.fetchone()
+        return _catalog.by_id(self.conn, plan_id)
     
     def get_plan_by_name(self, name):
         """Obtiene un plan por su nombre"""
-        self.cursor.execute("SELECT id FROM planes WHERE nombre = ?", (name,))
-        return self.cursor.fetchone()
+        plan = _catalog.by_name(self.conn, name)
+        return (plan[0],) if plan else None
     
     def add_plan(self, nombre, descripcion, precio):
         """Agrega un nuevo plan"""
@@ -34,6 +101,7 @@ class PlanModel:
         ''', (nombre, descripcion, precio))
         
         self.conn.commit()
+        _catalog.invalidate()
         return True, None
     
     def update_plan(self, plan_id, nombre, descripcion, precio):
@@ -51,6 +119,7 @@ class PlanModel:
         ''', (nombre, descripcion, precio, plan_id))
         
         self.conn.commit()
+        _catalog.invalidate()
         return True, None
     
     def delete_plan(self, plan_id, gym_id):
@@ -66,14 +135,14 @@ class PlanModel:
         # Eliminar plan
         self.cursor.execute("DELETE FROM planes WHERE id = ?", (plan_id,))
         self.conn.commit()
+        _catalog.invalidate()
         return True, None
     
     def get_all_plan_names(self):
         """Obtiene los nombres de todos los planes"""
-        self.cursor.execute("SELECT nombre FROM planes ORDER BY nombre")
-        return [plan[0] for plan in self.cursor.fetchall()]
+        return _catalog.names(self.conn)
     
     def close(self):
-        """Cierra la conexión a la base de datos"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
\ No newline at end of file
+        """Libera el cursor; la conexión pertenece al pool compartido"""
+        if hasattr(self, 'cursor'):
+            self.cursor.close()
\ No newline at end of file
@@ -1,57 +1,74 @@
-import sqlite3
 from datetime import datetime
-from utils.auth import verify_password, hash_password
+from utils.auth import verify_password, hash_password, needs_rehash, dummy_verify
+from utils.connection import get_connection, ADMIN_DB
+from models.last_access_writer import get_last_access_writer
 
 class UserModel:
     def __init__(self):
-        self.conn = sqlite3.connect('fitapp.db')
+        self.conn = get_connection(ADMIN_DB)
         self.cursor = self.conn.cursor()
     
     def check_credentials(self, username, password):
         """Verifica las credenciales del usuario y devuelve la información si son correctas"""
-        # Verificar hash de contraseña
-        self.cursor.execute("SELECT id, password, tipo, nombre_gimnasio FROM usuarios WHERE username = ? AND activo = 1", (username,))
+        # Usuario y vencimiento de su licencia activa en una sola consulta por índices
+        self.cursor.execute("""
+            SELECT u.id, u.password, u.tipo, u.nombre_gimnasio,
+                   (SELECT MAX(l.fecha_vencimiento) FROM licencias l
+                    WHERE l.usuario_id = u.id AND l.activa = 1) AS vencimiento
+            FROM usuarios u
+            WHERE u.username = ? AND u.activo = 1
+        """, (username,))
         user = self.cursor.fetchone()
         
+        if not user:
+            # Mismo costo que un usuario real, para no revelar qué usuarios existen
+            dummy_verify(password)
+        
         if user and verify_password(password, user[1]):
             # Guardar ID, tipo de usuario y nombre del gimnasio para la sesión
-            user_id = user[0]
-            user_type = user[2]
-            gym_name = user[3]
+            user_id, stored_password, user_type, gym_name, license_expiry = user
+            
+            self.record_last_access(user_id)
             
-            # Actualizar último acceso
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cursor.execute("UPDATE usuarios SET ultimo_acceso = ? WHERE id = ?", (current_time, user_id))
-            self.conn.commit()
+            # Regenerar hashes del formato anterior o con costo desactualizado
+            if needs_rehash(stored_password):
+                self.cursor.execute("UPDATE usuarios SET password = ? WHERE id = ?",
+                                    (hash_password(password), user_id))
+                self.conn.commit()
             
             # Verificar licencia para gimnasios
             if user_type == "gimnasio":
-                self.cursor.execute("""
-                    SELECT fecha_vencimiento, activa
-                    FROM licencias
-                    WHERE usuario_id = ? AND activa = 1
-                    ORDER BY fecha_vencimiento DESC
-                    LIMIT 1
-                """, (user_id,))
-                
-                license_info = self.cursor.fetchone()
-                if not license_info:
+                if not license_expiry:
                     error_msg = "Su gimnasio no tiene una licencia activa. Contacte al administrador."
                     return False, error_msg
                 
-                fecha_venc = datetime.strptime(license_info[0], "%Y-%m-%d")
+                fecha_venc = datetime.strptime(license_expiry, "%Y-%m-%d")
                 if fecha_venc < datetime.now():
                     error_msg = "Su licencia ha vencido. Contacte al administrador para renovarla."
                     return False, error_msg
                 
                 # Licencia activa y no vencida
-                license_expiry = license_info[0]
                 return True, {"user_id": user_id, "user_type": user_type, "gym_name": gym_name, "license_expiry": license_expiry}
             
             return True, {"user_id": user_id, "user_type": user_type, "gym_name": gym_name}
         
         return False, "Usuario o contraseña incorrectos"
     
+    def record_last_access(self, user_id):
+        """Registra el último acceso del usuario.
+        
+        Con el escritor en segundo plano activo el acceso se agrupa con los
+        demás y el inicio de sesión no espera el bloqueo de escritura.
+        """
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        writer = get_last_access_writer()
+        if writer is not None:
+            return writer.register(user_id, current_time)
+        
+        self.cursor.execute("UPDATE usuarios SET ultimo_acceso = ? WHERE id = ?", (current_time, user_id))
+        self.conn.commit()
+        return True
+    
     def get_all_gyms(self):
         """Obtiene todos los gimnasios registrados"""
         self.cursor.execute("""
@@ -133,6 +150,11 @@ class UserModel:
         self.cursor.execute("SELECT nombre_gimnasio FROM usuarios WHERE id = ?", (gym_id,))
         return self.cursor.fetchone()[0]
     
+    def get_username(self, user_id):
+        """Obtiene el nombre de usuario de un usuario por su ID"""
+        self.cursor.execute("SELECT username FROM usuarios WHERE id = ?", (user_id,))
+        return self.cursor.fetchone()[0]
+    
     def change_password(self, user_id, current_password, new_password):
         """Cambia la contraseña de un usuario"""
         # Verificar contraseña actual
@@ -150,6 +172,6 @@ class UserModel:
         return True, None
     
     def close(self):
-        """Cierra la conexión a la base de datos"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
\ No newline at end of file
+        """Libera el cursor; la conexión pertenece al pool compartido"""
+        if hasattr(self, 'cursor'):
+            self.cursor.close()
\ No newline at end of file
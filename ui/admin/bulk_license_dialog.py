@@ -0,0 +1,226 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel,
+                           QLineEdit, QPushButton, QListWidget, QListWidgetItem, QTableWidget,
+                           QTableWidgetItem, QHeaderView, QComboBox, QDateEdit, QMessageBox)
+from PyQt6.QtCore import Qt, QDate, QTimer
+
+from config.constants import (INPUT_STYLE, BUTTON_STYLE, SECONDARY_BUTTON_STYLE,
+                            COMBOBOX_STYLE, TABLE_STYLE)
+from models.license import LicenseModel, LICENSE_DAYS, BULK_RENEW, BULK_ASSIGN
+from ui.workers import TaskRunner
+
+# Espera tras el último cambio antes de recalcular la vista previa
+PREVIEW_DEBOUNCE_MS = 250
+
+
+class BulkLicenseDialog(QDialog):
+    """Renueva o asigna una licencia a varios gimnasios de una vez"""
+    HEADERS = ["Gimnasio", "Vencimiento Actual", "Nuevo Inicio", "Nuevo Vencimiento"]
+
+    def __init__(self, parent=None, on_applied=None):
+        super().__init__(parent)
+        self.setWindowTitle("Renovación Masiva de Licencias")
+        self.resize(900, 600)
+        self.on_applied = on_applied
+        self.tasks = TaskRunner(self)
+
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.preview_timer.timeout.connect(self.load_preview)
+
+        self.setup_ui()
+        self.tasks.call("active_gyms", LicenseModel, "get_active_gyms",
+                        on_result=self.populate_gyms, on_error=self.show_load_error)
+
+    def setup_ui(self):
+        """Configura el diálogo de renovación masiva"""
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(20)
+
+        # Lista de gimnasios a incluir
+        gyms_layout = QVBoxLayout()
+        gyms_layout.addWidget(QLabel("Gimnasios:"))
+
+        self.gym_list = QListWidget()
+        self.gym_list.itemChanged.connect(self.schedule_preview)
+        gyms_layout.addWidget(self.gym_list)
+
+        select_layout = QHBoxLayout()
+        select_all_button = QPushButton("Seleccionar Todos")
+        select_all_button.setStyleSheet(SECONDARY_BUTTON_STYLE)
+        select_all_button.clicked.connect(lambda: self.set_all_checked(True))
+        select_none_button = QPushButton("Ninguno")
+        select_none_button.setStyleSheet(SECONDARY_BUTTON_STYLE)
+        select_none_button.clicked.connect(lambda: self.set_all_checked(False))
+        select_layout.addWidget(select_all_button)
+        select_layout.addWidget(select_none_button)
+        gyms_layout.addLayout(select_layout)
+
+        layout.addLayout(gyms_layout, 1)
+
+        # Datos de la licencia y vista previa
+        right_layout = QVBoxLayout()
+        form_layout = QFormLayout()
+
+        self.mode_combo = QComboBox()
+        self.mode_combo.setStyleSheet(COMBOBOX_STYLE)
+        self.mode_combo.addItem("Renovar (desde el vencimiento actual)", BULK_RENEW)
+        self.mode_combo.addItem("Asignar (desde la fecha de inicio)", BULK_ASSIGN)
+        self.mode_combo.currentIndexChanged.connect(self.schedule_preview)
+
+        self.type_combo = QComboBox()
+        self.type_combo.setStyleSheet(COMBOBOX_STYLE)
+        self.type_combo.addItems(list(LICENSE_DAYS))
+        self.type_combo.setCurrentText("Anual")
+        self.type_combo.currentIndexChanged.connect(self.schedule_preview)
+
+        self.start_date = QDateEdit()
+        self.start_date.setStyleSheet(INPUT_STYLE)
+        self.start_date.setCalendarPopup(True)
+        self.start_date.setDate(QDate.currentDate())
+        self.start_date.dateChanged.connect(self.schedule_preview)
+
+        self.price_input = QLineEdit()
+        self.price_input.setStyleSheet(INPUT_STYLE)
+        self.price_input.setPlaceholderText("Ej: 5000.00")
+
+        form_layout.addRow("Modo:", self.mode_combo)
+        form_layout.addRow("Tipo de Licencia:", self.type_combo)
+        form_layout.addRow("Fecha de Inicio:", self.start_date)
+        form_layout.addRow("Precio:", self.price_input)
+        right_layout.addLayout(form_layout)
+
+        self.summary_label = QLabel("Seleccione los gimnasios a incluir.")
+        right_layout.addWidget(self.summary_label)
+
+        self.preview_table = QTableWidget()
+        self.preview_table.setStyleSheet(TABLE_STYLE)
+        self.preview_table.setColumnCount(len(self.HEADERS))
+        self.preview_table.setHorizontalHeaderLabels(self.HEADERS)
+        self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.preview_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.preview_table.setAlternatingRowColors(True)
+        right_layout.addWidget(self.preview_table)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.apply_button = QPushButton("Aplicar")
+        self.apply_button.setStyleSheet(BUTTON_STYLE)
+        self.apply_button.setEnabled(False)
+        self.apply_button.clicked.connect(self.apply)
+        cancel_button = QPushButton("Cancelar")
+        cancel_button.setStyleSheet(SECONDARY_BUTTON_STYLE)
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(self.apply_button)
+        button_layout.addWidget(cancel_button)
+        right_layout.addLayout(button_layout)
+
+        layout.addLayout(right_layout, 2)
+
+    def populate_gyms(self, gyms):
+        """Llena la lista con los gimnasios activos, sin marcar"""
+        self.gym_list.blockSignals(True)
+        self.gym_list.clear()
+        for gym_id, gym_name in gyms:
+            item = QListWidgetItem(gym_name)
+            item.setData(Qt.ItemDataRole.UserRole, gym_id)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            self.gym_list.addItem(item)
+        self.gym_list.blockSignals(False)
+
+    def set_all_checked(self, checked):
+        """Marca o desmarca todos los gimnasios"""
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        # Un solo recálculo en lugar de uno por gimnasio
+        self.gym_list.blockSignals(True)
+        for row in range(self.gym_list.count()):
+            self.gym_list.item(row).setCheckState(state)
+        self.gym_list.blockSignals(False)
+        self.schedule_preview()
+
+    def selected_gym_ids(self):
+        """IDs de los gimnasios marcados"""
+        return [self.gym_list.item(row).data(Qt.ItemDataRole.UserRole)
+                for row in range(self.gym_list.count())
+                if self.gym_list.item(row).checkState() == Qt.CheckState.Checked]
+
+    def current_request(self):
+        """Tipo de licencia, fecha de inicio y modo elegidos"""
+        return (self.type_combo.currentText(),
+                self.start_date.date().toString("yyyy-MM-dd"),
+                self.mode_combo.currentData())
+
+    def schedule_preview(self, *args):
+        """Recalcula la vista previa cuando se dejan de hacer cambios"""
+        self.apply_button.setEnabled(False)
+        self.preview_timer.start()
+
+    def load_preview(self):
+        """Pide la vista previa de los vencimientos fuera del hilo de la interfaz"""
+        gym_ids = self.selected_gym_ids()
+        if not gym_ids:
+            self.show_preview([])
+            return
+        license_type, start_date, mode = self.current_request()
+        self.tasks.call("bulk_preview", LicenseModel, "preview_bulk_licenses",
+                        gym_ids, license_type, start_date, mode,
+                        on_result=self.show_preview, on_error=self.show_load_error)
+
+    def show_preview(self, rows):
+        """Muestra cómo quedaría la licencia de cada gimnasio"""
+        self.preview_table.setRowCount(len(rows))
+        for row_idx, (_, gym_name, current_end, start, end) in enumerate(rows):
+            values = [gym_name, current_end or "Sin licencia", start, end]
+            for col_idx, value in enumerate(values):
+                self.preview_table.setItem(row_idx, col_idx, QTableWidgetItem(value))
+
+        if rows:
+            self.summary_label.setText(f"Se crearán {len(rows)} licencias de tipo "
+                                       f"{self.type_combo.currentText()}.")
+        else:
+            self.summary_label.setText("Seleccione los gimnasios a incluir.")
+        self.apply_button.setEnabled(bool(rows))
+
+    def show_load_error(self, error):
+        QMessageBox.critical(self, "Error", f"Error al cargar licencias: {str(error)}")
+
+    def apply(self):
+        """Crea las licencias de todos los gimnasios marcados"""
+        gym_ids = self.selected_gym_ids()
+        if not gym_ids:
+            return
+
+        price_text = self.price_input.text().strip()
+        try:
+            price = float(price_text)
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Debe ingresar un precio válido.")
+            return
+        if price <= 0:
+            QMessageBox.warning(self, "Error", "El precio debe ser mayor que cero.")
+            return
+
+        license_type, start_date, mode = self.current_request()
+        reply = QMessageBox.question(self, "Confirmar",
+                                     f"¿Crear una licencia {license_type} para {len(gym_ids)} gimnasios? "
+                                     "Las licencias activas actuales quedarán revocadas.",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        self.apply_button.setEnabled(False)
+
+        def on_applied(created):
+            QMessageBox.information(self, "Éxito", f"Se crearon {created} licencias {license_type}.")
+            if self.on_applied is not None:
+                self.on_applied()
+            self.accept()
+
+        def on_error(error):
+            self.apply_button.setEnabled(True)
+            QMessageBox.critical(self, "Error", f"Error al crear las licencias: {str(error)}")
+
+        self.tasks.call(None, LicenseModel, "add_licenses_bulk", gym_ids, license_type, start_date, price, mode,
+                        on_result=on_applied, on_error=on_error)
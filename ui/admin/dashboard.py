@@ -1,19 +1,22 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                            QLabel, QPushButton, QListWidget, QListWidgetItem, 
-                           QStackedWidget, QMessageBox)
-from PyQt6.QtCore import Qt, QSize
+                           QMessageBox)
+from PyQt6.QtCore import Qt, QSize, pyqtSignal
 
 from config.constants import (BG_COLOR, TEXT_PRIMARY, TEXT_SECONDARY, 
                             SIDEBAR_BG, BORDER_COLOR, PRIMARY_COLOR,
                             CARD_COLOR, SECONDARY_BUTTON_STYLE, SIDEBAR_STYLE)
-from ui.admin.gyms_tab import GymsTab
-from ui.admin.licenses_tab import LicensesTab
-from ui.admin.stats_tab import StatsTab
-from ui.admin.settings_tab import SettingsTab
 from models.user import UserModel
+from ui.lazy_pages import LazyPageStack, mark_on_first_paint
+from ui.workers import TaskRunner
+from utils.migrations import migrate_gym_database
+from utils.startup import FIRST_TAB
 
 class AdminDashboard(QMainWindow):
     """Panel de administración para el dueño de la aplicación"""
+    # Se emite al cerrar sesión, antes de cerrar la ventana
+    logged_out = pyqtSignal()
+    
     def __init__(self, user_id):
         super().__init__()
         self.user_id = user_id
@@ -40,7 +43,10 @@ class AdminDashboard(QMainWindow):
             }}
         """)
         
-        self.user_model = UserModel()
+        # Los informes cruzados leen las tablas y estadísticas de gym.db
+        migrate_gym_database()
+        
+        self.tasks = TaskRunner(self)
         self.setup_ui()
         
     def setup_ui(self):
@@ -83,17 +89,18 @@ class AdminDashboard(QMainWindow):
         self.menu_list.setIconSize(QSize(24, 24))
         self.menu_list.setStyleSheet(SIDEBAR_STYLE)
         
-        # Opciones de menú para admin
+        # Opciones de menú para admin: (texto, módulo y clase de la página, argumentos)
         menu_items = [
-            ("Gestionar Gimnasios", "gyms_page"),
-            ("Gestionar Licencias", "licenses_page"),
-            ("Estadísticas", "stats_page"),
-            ("Configuración", "settings_page")
+            ("Gestionar Gimnasios", "ui.admin.gyms_tab", "GymsTab", (self.user_id,)),
+            ("Gestionar Licencias", "ui.admin.licenses_tab", "LicensesTab", ()),
+            ("Estadísticas", "ui.admin.stats_tab", "StatsTab", ()),
+            ("Rendimiento", "ui.admin.performance_tab", "PerformanceTab", ()),
+            ("Configuración", "ui.admin.settings_tab", "SettingsTab", (self.user_id,))
         ]
         
-        for text, page_name in menu_items:
+        for text, _, class_name, _ in menu_items:
             item = QListWidgetItem(text)
-            item.setData(Qt.ItemDataRole.UserRole, page_name)
+            item.setData(Qt.ItemDataRole.UserRole, class_name)
             self.menu_list.addItem(item)
         
         left_layout.addWidget(self.menu_list)
@@ -108,14 +115,14 @@ class AdminDashboard(QMainWindow):
         info_layout = QVBoxLayout(info_widget)
         info_layout.setSpacing(5)
         
-        # Obtener el nombre de usuario
-        self.user_model.cursor.execute("SELECT username FROM usuarios WHERE id = ?", (self.user_id,))
-        username = self.user_model.cursor.fetchone()[0]
-        
-        user_label = QLabel(f"Usuario: {username}")
-        user_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        user_label.setStyleSheet(f"color: {TEXT_PRIMARY}; font-weight: bold;")
-        info_layout.addWidget(user_label)
+        # El nombre de usuario se completa cuando llega la consulta
+        self.user_label = QLabel("Usuario:")
+        self.user_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.user_label.setStyleSheet(f"color: {TEXT_PRIMARY}; font-weight: bold;")
+        info_layout.addWidget(self.user_label)
+        self.tasks.call("username", UserModel, "get_username", self.user_id,
+                        on_result=lambda username: self.user_label.setText(f"Usuario: {username}"),
+                        on_error=lambda error: self.user_label.setText("Usuario: ?"))
         
         role_label = QLabel("Rol: Administrador")
         role_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -157,21 +164,11 @@ class AdminDashboard(QMainWindow):
         
         right_layout.addWidget(top_bar)
         
-        # Contenido principal (páginas apiladas)
-        self.content_stack = QStackedWidget()
-        
-        # Configurar páginas
-        self.gyms_page = GymsTab(self.user_id)
-        self.content_stack.addWidget(self.gyms_page)
-        
-        self.licenses_page = LicensesTab()
-        self.content_stack.addWidget(self.licenses_page)
-        
-        self.stats_page = StatsTab()
-        self.content_stack.addWidget(self.stats_page)
-        
-        self.settings_page = SettingsTab(self.user_id)
-        self.content_stack.addWidget(self.settings_page)
+        # Contenido principal: cada página se importa y construye al visitarla
+        self.content_stack = LazyPageStack()
+        for _, module_name, class_name, args in menu_items:
+            self.content_stack.add_page(module_name, class_name, *args)
+        mark_on_first_paint(self.content_stack, FIRST_TAB)
         
         right_layout.addWidget(self.content_stack)
         
@@ -190,20 +187,17 @@ class AdminDashboard(QMainWindow):
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
+            # El administrador de sesiones vuelve a mostrar la ventana de login
+            self.logged_out.emit()
             self.close()
-            # El flujo regresará al main() que mostrará nuevamente la ventana de login
     
     def change_page(self, index):
         """Cambia la página mostrada en el contenido principal"""
         # Cambiar el título de la página
         self.page_title.setText(self.menu_list.item(index).text())
-        # Cambiar la página mostrada
-        self.content_stack.setCurrentIndex(index)
+        # Cambiar la página mostrada (se construye la primera vez)
+        self.content_stack.show_page(index)
     
     def closeEvent(self, event):
         """Maneja el cierre de la ventana"""
-        # Cerrar conexión a la base de datos
-        if hasattr(self, 'user_model'):
-            self.user_model.close()
-        
         event.accept()
\ No newline at end of file
@@ -8,13 +8,15 @@ from config.constants import (TEXT_PRIMARY, FRAME_STYLE, INPUT_STYLE, BUTTON_STY
                             SECONDARY_BUTTON_STYLE, TABLE_STYLE, SUCCESS_COLOR, 
                             DANGER_COLOR)
 from models.user import UserModel
+from models.admin_reports import invalidate_gym_metrics
+from ui.workers import TaskRunner
 
 class GymsTab(QWidget):
     def __init__(self, user_id, parent=None):
         super().__init__(parent)
         self.user_id = user_id
         self.parent = parent  # Guardar referencia al padre
-        self.user_model = UserModel()
+        self.tasks = TaskRunner(self)
         self.selected_gym_id = None
         self.setup_ui()
         
@@ -109,8 +111,16 @@ class GymsTab(QWidget):
     
     def load_gyms(self):
         """Carga la lista de gimnasios en la tabla"""
-        gyms = self.user_model.get_all_gyms()
-        
+        # Una recarga nueva reemplaza a la que todavía esté pendiente
+        self.tasks.call("gyms", UserModel, "get_all_gyms",
+                        on_result=self.populate_gyms, on_error=self.show_load_error)
+    
+    def show_load_error(self, error):
+        """Informa un error al cargar datos"""
+        QMessageBox.critical(self, "Error", f"Error al cargar gimnasios: {str(error)}")
+    
+    def populate_gyms(self, gyms):
+        """Llena la tabla con la lista de gimnasios"""
         self.gyms_table.setRowCount(0)  # Limpiar tabla
         
         for row_idx, gym in enumerate(gyms):
@@ -177,9 +187,21 @@ class GymsTab(QWidget):
             QMessageBox.warning(self, "Error", "Todos los campos son obligatorios.")
             return
         
-        success, error_msg = self.user_model.add_gym(nombre, username, email, password)
+        # El hash de la contraseña lleva cientos de ms: se genera en segundo plano
+        self.tasks.call(None, UserModel, "add_gym", nombre, username, email, password,
+                        on_result=lambda outcome: self.on_gym_added(nombre, outcome),
+                        on_error=self.show_write_error)
+    
+    def show_write_error(self, error):
+        """Informa un error al guardar un gimnasio"""
+        QMessageBox.critical(self, "Error", f"Error al guardar gimnasio: {str(error)}")
+    
+    def on_gym_added(self, nombre, outcome):
+        """Completa el alta de un gimnasio"""
+        success, error_msg = outcome
         
         if success:
+            invalidate_gym_metrics()
             QMessageBox.information(self, "Éxito", f"Gimnasio '{nombre}' registrado correctamente.")
             self.clear_gym_form()
             self.load_gyms()
@@ -205,9 +227,16 @@ class GymsTab(QWidget):
             QMessageBox.warning(self, "Error", "Los campos Nombre, Usuario y Email son obligatorios.")
             return
         
-        success, error_msg = self.user_model.update_gym(self.selected_gym_id, nombre, username, email, password)
+        self.tasks.call(None, UserModel, "update_gym", self.selected_gym_id, nombre, username, email, password,
+                        on_result=lambda outcome: self.on_gym_updated(nombre, outcome),
+                        on_error=self.show_write_error)
+    
+    def on_gym_updated(self, nombre, outcome):
+        """Completa la actualización de un gimnasio"""
+        success, error_msg = outcome
         
         if success:
+            invalidate_gym_metrics()
             QMessageBox.information(self, "Éxito", f"Gimnasio '{nombre}' actualizado correctamente.")
             self.clear_gym_form()
             self.load_gyms()
@@ -238,11 +267,17 @@ class GymsTab(QWidget):
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.user_model.toggle_gym_active(self.selected_gym_id)
-            QMessageBox.information(self, "Éxito", f"Gimnasio '{nombre_gimnasio}' {action}do correctamente.")
-            self.clear_gym_form()
-            self.load_gyms()
-            
-            # Si se activó un gimnasio, actualizar la lista de licencias
-            if current_state == "Inactivo" and hasattr(self.parent, 'update_licenses_tab'):
-                self.parent.update_licenses_tab()
\ No newline at end of file
+            self.tasks.call(None, UserModel, "toggle_gym_active", self.selected_gym_id,
+                            on_result=lambda result: self.on_gym_toggled(nombre_gimnasio, action, current_state),
+                            on_error=self.show_write_error)
+    
+    def on_gym_toggled(self, nombre, action, previous_state):
+        """Completa la activación o desactivación de un gimnasio"""
+        invalidate_gym_metrics()
+        QMessageBox.information(self, "Éxito", f"Gimnasio '{nombre}' {action}do correctamente.")
+        self.clear_gym_form()
+        self.load_gyms()
+        
+        # Si se activó un gimnasio, actualizar la lista de licencias
+        if previous_state == "Inactivo" and hasattr(self.parent, 'update_licenses_tab'):
+            self.parent.update_licenses_tab()
\ No newline at end of file
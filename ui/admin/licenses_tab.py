@@ -8,11 +8,14 @@ from config.constants import (TEXT_PRIMARY, FRAME_STYLE, INPUT_STYLE, BUTTON_STY
                             SECONDARY_BUTTON_STYLE, COMBOBOX_STYLE, TABLE_STYLE, 
                             SUCCESS_COLOR, DANGER_COLOR, DANGER_BUTTON_STYLE)
 from models.license import LicenseModel
+from models.admin_reports import invalidate_gym_metrics
+from ui.admin.bulk_license_dialog import BulkLicenseDialog
+from ui.workers import TaskRunner
 
 class LicensesTab(QWidget):
     def __init__(self):
         super().__init__()
-        self.license_model = LicenseModel()
+        self.tasks = TaskRunner(self)
         self.selected_license_id = None
         self.selected_license_state = None
         self.setup_ui()
@@ -85,6 +88,11 @@ class LicensesTab(QWidget):
         button_layout.addWidget(self.revoke_license_button)
         button_layout.addWidget(self.clear_license_button)
         
+        self.bulk_license_button = QPushButton("Renovación Masiva")
+        self.bulk_license_button.setStyleSheet(SECONDARY_BUTTON_STYLE)
+        self.bulk_license_button.clicked.connect(self.open_bulk_licenses)
+        button_layout.addWidget(self.bulk_license_button)
+        
         layout.addLayout(button_layout)
         
         # Tabla de licencias
@@ -106,17 +114,28 @@ class LicensesTab(QWidget):
     
     def update_gym_combo(self):
         """Actualiza el combo box de gimnasios"""
+        self.tasks.call("active_gyms", LicenseModel, "get_active_gyms",
+                        on_result=self.populate_gym_combo, on_error=self.show_load_error)
+    
+    def populate_gym_combo(self, gyms):
+        """Llena el combo box con los gimnasios activos"""
         self.license_gym_combo.clear()
         
-        gyms = self.license_model.get_active_gyms()
-        
         for gym_id, gym_name in gyms:
             self.license_gym_combo.addItem(gym_name, gym_id)
     
     def load_licenses(self):
         """Carga la lista de licencias en la tabla"""
-        licenses = self.license_model.get_all_licenses()
-        
+        # Una recarga nueva reemplaza a la que todavía esté pendiente
+        self.tasks.call("licenses", LicenseModel, "get_all_licenses",
+                        on_result=self.populate_licenses, on_error=self.show_load_error)
+    
+    def show_load_error(self, error):
+        """Informa un error al cargar datos"""
+        QMessageBox.critical(self, "Error", f"Error al cargar licencias: {str(error)}")
+    
+    def populate_licenses(self, licenses):
+        """Llena la tabla con la lista de licencias"""
         self.licenses_table.setRowCount(0)  # Limpiar tabla
         
         for row_idx, license in enumerate(licenses):
@@ -195,18 +214,31 @@ class LicensesTab(QWidget):
             QMessageBox.warning(self, "Error", "El precio debe ser un número válido.")
             return
         
-        try:
-            # Añadir licencia
-            self.license_model.add_license(gym_id, license_type, start_date, price)
-            
-            gym_name = self.license_gym_combo.currentText()
+        gym_name = self.license_gym_combo.currentText()
+        self.add_license_button.setEnabled(False)
+        
+        def on_added(result):
+            invalidate_gym_metrics()
             QMessageBox.information(self, "Éxito", f"Licencia {license_type} añadida al gimnasio '{gym_name}' correctamente.")
-            
             self.clear_license_form()
             self.load_licenses()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al añadir licencia: {str(e)}")
+        
+        def on_error(error):
+            self.add_license_button.setEnabled(True)
+            QMessageBox.critical(self, "Error", f"Error al añadir licencia: {str(error)}")
+        
+        # Añadir licencia en segundo plano; las escrituras nunca se descartan
+        self.tasks.call(None, LicenseModel, "add_license", gym_id, license_type, start_date, price,
+                        on_result=on_added, on_error=on_error)
+    
+    def open_bulk_licenses(self):
+        """Abre el diálogo para renovar o asignar licencias a varios gimnasios"""
+        def on_applied():
+            invalidate_gym_metrics()
+            self.clear_license_form()
+            self.load_licenses()
+        
+        BulkLicenseDialog(self, on_applied=on_applied).exec()
     
     def revoke_license(self):
         """Revoca una licencia activa"""
@@ -230,7 +262,14 @@ class LicensesTab(QWidget):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.license_model.revoke_license(self.selected_license_id)
-            QMessageBox.information(self, "Éxito", f"Licencia revocada correctamente.")
-            self.clear_license_form()
-            self.load_licenses()
\ No newline at end of file
+            def on_revoked(result):
+                invalidate_gym_metrics()
+                QMessageBox.information(self, "Éxito", f"Licencia revocada correctamente.")
+                self.clear_license_form()
+                self.load_licenses()
+            
+            def on_error(error):
+                QMessageBox.critical(self, "Error", f"Error al revocar licencia: {str(error)}")
+            
+            self.tasks.call(None, LicenseModel, "revoke_license", self.selected_license_id,
+                            on_result=on_revoked, on_error=on_error)
\ No newline at end of file
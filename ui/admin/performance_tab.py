@@ -0,0 +1,168 @@
+from datetime import datetime
+
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                           QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView,
+                           QFileDialog, QMessageBox)
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QColor
+
+from config.constants import (BUTTON_STYLE, SECONDARY_BUTTON_STYLE, TABLE_STYLE, DANGER_COLOR)
+from utils.startup import get_marks
+from utils.tracing import tracer
+
+# Intervalo de actualización de la vista en vivo (ms)
+REFRESH_INTERVAL_MS = 1000
+
+# Consultas con p95 por encima de este valor se resaltan
+SLOW_QUERY_MS = 50
+
+
+class PerformanceTab(QWidget):
+    """Muestra en vivo las métricas de las consultas registradas por utils.tracing"""
+    HEADERS = ["Origen", "Consulta", "Llamadas", "Total (ms)", "Promedio (ms)", "p95 (ms)",
+               "Máx (ms)", "Filas", "Espera bloqueo (ms)"]
+    RECENT_HEADERS = ["Hora", "Origen", "Consulta", "ms"]
+
+    def __init__(self):
+        super().__init__()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configura la pestaña de rendimiento"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(15)
+
+        title_label = QLabel("Rendimiento de Consultas")
+        title_label.setObjectName("sectionTitle")
+        layout.addWidget(title_label)
+
+        # Controles de las trazas
+        controls_layout = QHBoxLayout()
+
+        self.enabled_checkbox = QCheckBox("Registrar consultas")
+        self.enabled_checkbox.setChecked(tracer.enabled)
+        self.enabled_checkbox.toggled.connect(self.toggle_tracing)
+        controls_layout.addWidget(self.enabled_checkbox)
+
+        self.since_label = QLabel("")
+        controls_layout.addWidget(self.since_label)
+        controls_layout.addStretch()
+
+        clear_button = QPushButton("Limpiar")
+        clear_button.setStyleSheet(SECONDARY_BUTTON_STYLE)
+        clear_button.clicked.connect(self.clear_traces)
+        controls_layout.addWidget(clear_button)
+
+        dump_button = QPushButton("Guardar en Archivo")
+        dump_button.setStyleSheet(BUTTON_STYLE)
+        dump_button.clicked.connect(self.dump_traces)
+        controls_layout.addWidget(dump_button)
+
+        layout.addLayout(controls_layout)
+
+        self.startup_label = QLabel("")
+        layout.addWidget(self.startup_label)
+
+        # Métricas agrupadas por consulta
+        self.stats_table = QTableWidget()
+        self.stats_table.setStyleSheet(TABLE_STYLE)
+        self.stats_table.setColumnCount(len(self.HEADERS))
+        self.stats_table.setHorizontalHeaderLabels(self.HEADERS)
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.stats_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.stats_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.stats_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.stats_table.setAlternatingRowColors(True)
+        layout.addWidget(self.stats_table, 3)
+
+        # Últimas sentencias ejecutadas
+        recent_label = QLabel("Últimas consultas")
+        recent_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        layout.addWidget(recent_label)
+
+        self.recent_table = QTableWidget()
+        self.recent_table.setStyleSheet(TABLE_STYLE)
+        self.recent_table.setColumnCount(len(self.RECENT_HEADERS))
+        self.recent_table.setHorizontalHeaderLabels(self.RECENT_HEADERS)
+        self.recent_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.recent_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.recent_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.recent_table, 2)
+
+    def showEvent(self, event):
+        # Sólo se actualiza mientras la pestaña está visible
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def toggle_tracing(self, checked):
+        """Activa o desactiva el registro de consultas"""
+        if checked:
+            tracer.enable()
+        else:
+            tracer.disable()
+        self.refresh()
+
+    def clear_traces(self):
+        """Descarta las métricas acumuladas"""
+        tracer.reset()
+        self.refresh()
+
+    def dump_traces(self):
+        """Guarda las métricas acumuladas en un archivo JSON"""
+        default_name = f"trazas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        file_path, _ = QFileDialog.getSaveFileName(self, "Guardar Trazas", default_name, "JSON Files (*.json)")
+
+        if not file_path:
+            return
+
+        try:
+            tracer.dump(file_path)
+            QMessageBox.information(self, "Trazas Guardadas", f"Trazas guardadas en {file_path}")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Error al guardar trazas: {str(e)}")
+
+    def refresh(self):
+        """Actualiza las tablas con las métricas actuales"""
+        if tracer.enabled:
+            self.since_label.setText(f"Registrando desde {tracer.started_at}")
+        else:
+            self.since_label.setText("Registro desactivado")
+
+        marks = " · ".join(f"{name}: {ms:.0f} ms" for name, ms in get_marks().items())
+        self.startup_label.setText(f"Tiempos de inicio: {marks or 'sin medir'}")
+
+        stats = tracer.snapshot()
+        self.stats_table.setRowCount(len(stats))
+        for row_idx, query in enumerate(stats):
+            values = [
+                query["origen"], query["sql"], query["llamadas"], f"{query['total_ms']:.1f}",
+                f"{query['promedio_ms']:.2f}", f"{query['p95_ms']:.1f}", f"{query['max_ms']:.1f}",
+                query["filas"], f"{query['espera_bloqueo_ms']:.1f}",
+            ]
+            slow = query["p95_ms"] >= SLOW_QUERY_MS or query["esperas_bloqueo"] > 0
+            for col_idx, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if col_idx == 1:
+                    item.setToolTip(query["sql"])
+                if slow:
+                    item.setForeground(QColor(DANGER_COLOR))
+                self.stats_table.setItem(row_idx, col_idx, item)
+
+        recent = list(reversed(tracer.recent()))
+        self.recent_table.setRowCount(len(recent))
+        for row_idx, (timestamp, caller, sql, elapsed_ms, failed) in enumerate(recent):
+            values = [datetime.fromtimestamp(timestamp).strftime("%H:%M:%S"), caller, sql, f"{elapsed_ms:.2f}"]
+            for col_idx, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if failed:
+                    item.setForeground(QColor(DANGER_COLOR))
+                self.recent_table.setItem(row_idx, col_idx, item)
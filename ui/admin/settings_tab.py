@@ -3,12 +3,14 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QLabel,
 
 from config.constants import (FRAME_STYLE, INPUT_STYLE, BUTTON_STYLE)
 from models.user import UserModel
+from ui.workers import TaskRunner
 
 class SettingsTab(QWidget):
     def __init__(self, user_id):
         super().__init__()
         self.user_id = user_id
         self.user_model = UserModel()
+        self.tasks = TaskRunner(self)
         self.setup_ui()
     
     def setup_ui(self):
@@ -97,7 +99,14 @@ class SettingsTab(QWidget):
             QMessageBox.warning(self, "Error", "La nueva contraseña debe tener al menos 6 caracteres.")
             return
         
-        success, error_msg = self.user_model.change_password(self.user_id, current_password, new_password)
+        # Verificar y generar el nuevo hash lleva cientos de ms: se hace en segundo plano
+        self.tasks.call(None, UserModel, "change_password", self.user_id, current_password, new_password,
+                        on_result=self.on_password_changed,
+                        on_error=lambda e: QMessageBox.critical(self, "Error", f"Error al cambiar contraseña: {str(e)}"))
+    
+    def on_password_changed(self, outcome):
+        """Informa el resultado del cambio de contraseña"""
+        success, error_msg = outcome
         
         if success:
             QMessageBox.information(self, "Éxito", "Contraseña actualizada correctamente.")
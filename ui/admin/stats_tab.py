@@ -1,15 +1,35 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, 
-                           QLabel, QPushButton, QFrame, QFileDialog)
-from PyQt6.QtCore import Qt
-import csv
+                           QLabel, QPushButton, QFrame, QTableWidget, QTableWidgetItem,
+                           QHeaderView, QMessageBox)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor
 
-from config.constants import (FRAME_STYLE, BUTTON_STYLE)
+from config.constants import (FRAME_STYLE, BUTTON_STYLE, TABLE_STYLE, SUCCESS_COLOR,
+                            DANGER_COLOR, WARNING_COLOR)
 from models.license import LicenseModel
+from models.admin_reports import AdminReportsModel
+from ui.export_dialog import start_export
+from ui.workers import TaskRunner
+
+# Intervalo de actualización de las métricas mientras la pestaña está visible (ms)
+REFRESH_INTERVAL_MS = 10000
+
+# Días de licencia por debajo de los cuales se resalta el gimnasio
+LICENSE_WARNING_DAYS = 7
 
 class StatsTab(QWidget):
+    METRICS_HEADERS = ["Gimnasio", "Estado", "Socios", "% al Día", "Asistencias del Mes",
+                       "Último Acceso", "Días de Licencia"]
+    
     def __init__(self):
         super().__init__()
         self.license_model = LicenseModel()
+        self.tasks = TaskRunner(self)
+        # gym_id -> (fila de la tabla, valores mostrados), para actualizar sólo lo que cambió
+        self.metrics_rows = {}
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
         self.setup_ui()
         
     def setup_ui(self):
@@ -28,24 +48,41 @@ class StatsTab(QWidget):
         stats_frame.setStyleSheet(FRAME_STYLE)
         stats_layout = QGridLayout(stats_frame)
         
-        # Obtener estadísticas
-        license_stats = self.license_model.get_license_stats()
+        self.total_gyms_label = QLabel("-")
+        self.active_gyms_label = QLabel("-")
+        self.active_licenses_label = QLabel("-")
+        self.total_revenue_label = QLabel("-")
         
         # Agregar datos al grid
         stats_layout.addWidget(QLabel("Total de Gimnasios:"), 0, 0)
-        stats_layout.addWidget(QLabel(str(license_stats["total_gyms"])), 0, 1)
+        stats_layout.addWidget(self.total_gyms_label, 0, 1)
         
         stats_layout.addWidget(QLabel("Gimnasios Activos:"), 1, 0)
-        stats_layout.addWidget(QLabel(f"{license_stats['active_gyms']} ({license_stats['percent_active']:.1f}% del total)"), 1, 1)
+        stats_layout.addWidget(self.active_gyms_label, 1, 1)
         
         stats_layout.addWidget(QLabel("Licencias Activas:"), 2, 0)
-        stats_layout.addWidget(QLabel(str(license_stats["active_licenses"])), 2, 1)
+        stats_layout.addWidget(self.active_licenses_label, 2, 1)
         
         stats_layout.addWidget(QLabel("Ingresos Totales:"), 3, 0)
-        stats_layout.addWidget(QLabel(f"${license_stats['total_revenue']:.2f}"), 3, 1)
+        stats_layout.addWidget(self.total_revenue_label, 3, 1)
         
         layout.addWidget(stats_frame)
         
+        # Métricas por gimnasio
+        metrics_title = QLabel("Métricas por Gimnasio")
+        metrics_title.setStyleSheet("font-size: 16px; font-weight: bold;")
+        layout.addWidget(metrics_title)
+        
+        self.metrics_table = QTableWidget()
+        self.metrics_table.setStyleSheet(TABLE_STYLE)
+        self.metrics_table.setColumnCount(len(self.METRICS_HEADERS))
+        self.metrics_table.setHorizontalHeaderLabels(self.METRICS_HEADERS)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.metrics_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.metrics_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.metrics_table.setAlternatingRowColors(True)
+        layout.addWidget(self.metrics_table, 1)
+        
         # Botones para exportar informes
         reports_frame = QFrame()
         reports_frame.setFrameShape(QFrame.Shape.StyledPanel)
@@ -64,82 +101,133 @@ class StatsTab(QWidget):
         export_licenses_button.setStyleSheet(BUTTON_STYLE)
         export_licenses_button.clicked.connect(self.export_licenses_report)
         
+        export_gym_report_button = QPushButton("Exportar Informe por Gimnasio")
+        export_gym_report_button.setStyleSheet(BUTTON_STYLE)
+        export_gym_report_button.clicked.connect(self.export_gym_report)
+        
         reports_layout.addWidget(export_gyms_button)
         reports_layout.addWidget(export_licenses_button)
+        reports_layout.addWidget(export_gym_report_button)
         
         layout.addWidget(reports_frame)
-        layout.addStretch()
+    
+    def showEvent(self, event):
+        # Las métricas se actualizan sólo mientras la pestaña está visible
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+    
+    def refresh(self):
+        """Pide en segundo plano los totales y las métricas por gimnasio"""
+        self.tasks.call("license_stats", LicenseModel, "get_license_stats",
+                        on_result=self.show_license_stats, on_error=self.show_refresh_error)
+        self.tasks.call("gym_metrics", AdminReportsModel, "get_gym_metrics",
+                        on_result=self.show_gym_metrics, on_error=self.show_refresh_error)
+    
+    def show_refresh_error(self, error):
+        """Detiene la actualización automática si falla la consulta"""
+        self.refresh_timer.stop()
+        QMessageBox.critical(self, "Error", f"Error al actualizar estadísticas: {str(error)}")
+    
+    def show_license_stats(self, license_stats):
+        """Muestra los totales generales"""
+        self.total_gyms_label.setText(str(license_stats["total_gyms"]))
+        self.active_gyms_label.setText(f"{license_stats['active_gyms']} ({license_stats['percent_active']:.1f}% del total)")
+        self.active_licenses_label.setText(str(license_stats["active_licenses"]))
+        self.total_revenue_label.setText(f"${license_stats['total_revenue']:.2f}")
+    
+    def show_gym_metrics(self, metrics):
+        """Actualiza la tabla tocando sólo las celdas cuyos valores cambiaron"""
+        # Si cambió el conjunto de gimnasios o su orden, se reconstruye la tabla
+        if list(metrics) != list(self.metrics_rows):
+            self.metrics_table.setRowCount(len(metrics))
+            self.metrics_rows = {gym_id: (row, None) for row, gym_id in enumerate(metrics)}
+        
+        for gym_id, values in metrics.items():
+            row, shown = self.metrics_rows[gym_id]
+            if values == shown:
+                continue
+            for col, text in enumerate(self.format_metrics(values)):
+                if shown is None or values[col] != shown[col]:
+                    self.set_metrics_cell(row, col, text, values)
+            self.metrics_rows[gym_id] = (row, values)
+    
+    def format_metrics(self, values):
+        """Convierte las métricas de un gimnasio en los textos de cada columna"""
+        nombre, activo, socios, percent_paid, asistencias, ultimo_acceso, days_left = values
+        return [
+            nombre,
+            "Activo" if activo else "Inactivo",
+            str(socios),
+            f"{percent_paid:.1f}%",
+            str(asistencias),
+            ultimo_acceso or "Nunca",
+            "Sin licencia" if days_left is None else str(days_left),
+        ]
+    
+    def set_metrics_cell(self, row, col, text, values):
+        """Escribe una celda de la tabla de métricas con su color"""
+        item = self.metrics_table.item(row, col)
+        if item is None:
+            item = QTableWidgetItem()
+            self.metrics_table.setItem(row, col, item)
+        item.setText(text)
+        
+        # Colorear estado y días de licencia
+        if col == 1:
+            item.setForeground(QColor(SUCCESS_COLOR if values[1] else DANGER_COLOR))
+        elif col == 6:
+            days_left = values[6]
+            if days_left is None or days_left < 0:
+                item.setForeground(QColor(DANGER_COLOR))
+            elif days_left <= LICENSE_WARNING_DAYS:
+                item.setForeground(QColor(WARNING_COLOR))
+            else:
+                item.setForeground(QColor(SUCCESS_COLOR))
     
     def export_gyms_report(self):
-        """Exporta un informe de gimnasios a CSV"""
-        file_path, _ = QFileDialog.getSaveFileName(self, "Guardar Informe de Gimnasios", "", "CSV Files (*.csv)")
-        
-        if not file_path:
-            return
-        
-        try:
-            # Obtener datos de gimnasios
-            gyms = self.license_model.conn.cursor().execute("""
-                SELECT id, nombre_gimnasio, username, email, fecha_registro, 
-                       ultimo_acceso, activo
-                FROM usuarios
-                WHERE tipo = 'gimnasio'
-                ORDER BY nombre_gimnasio
-            """).fetchall()
-            
-            with open(file_path, 'w', newline='') as file:
-                writer = csv.writer(file)
-                # Escribir encabezados
-                writer.writerow(["ID", "Nombre", "Usuario", "Email", "Fecha Registro", 
-                               "Último Acceso", "Estado"])
-                
-                # Escribir datos
-                for gym in gyms:
-                    # Formatear estado
-                    row = list(gym)
-                    row[6] = "Activo" if row[6] == 1 else "Inactivo"
-                    writer.writerow(row)
-            
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.information(self, "Exportación Exitosa", f"Informe exportado a {file_path}")
-            
-        except Exception as e:
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.critical(self, "Error", f"Error al exportar informe: {str(e)}")
+        """Exporta un informe de gimnasios en segundo plano"""
+        def format_row(gym):
+            # Formatear estado
+            row = list(gym)
+            row[6] = "Activo" if row[6] == 1 else "Inactivo"
+            return row
+        
+        total = self.license_model.get_license_stats()["total_gyms"]
+        start_export(self, "Guardar Informe de Gimnasios",
+                     lambda: LicenseModel().export_gyms_report(),
+                     ["ID", "Nombre", "Usuario", "Email", "Fecha Registro", 
+                      "Último Acceso", "Estado"],
+                     transform=format_row, total=total)
     
     def export_licenses_report(self):
-        """Exporta un informe de licencias a CSV"""
-        file_path, _ = QFileDialog.getSaveFileName(self, "Guardar Informe de Licencias", "", "CSV Files (*.csv)")
-        
-        if not file_path:
-            return
-        
-        try:
-            # Obtener datos de licencias
-            licenses = self.license_model.conn.cursor().execute("""
-                SELECT l.id, u.nombre_gimnasio, l.tipo, l.fecha_inicio, 
-                       l.fecha_vencimiento, l.precio, l.activa
-                FROM licencias l
-                JOIN usuarios u ON l.usuario_id = u.id
-                ORDER BY l.fecha_vencimiento DESC
-            """).fetchall()
-            
-            with open(file_path, 'w', newline='') as file:
-                writer = csv.writer(file)
-                # Escribir encabezados
-                writer.writerow(["ID", "Gimnasio", "Tipo", "Fecha Inicio", 
-                               "Fecha Vencimiento", "Precio", "Estado"])
-                
-                # Escribir datos
-                for license in licenses:
-                    # Formatear estado
-                    row = list(license)
-                    row[6] = "Activa" if row[6] == 1 else "Revocada"
-                    writer.writerow(row)
-            
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.information(self, "Exportación Exitosa", f"Informe exportado a {file_path}")
-            
-        except Exception as e:
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.critical(self, "Error", f"Error al exportar informe: {str(e)}")
\ No newline at end of file
+        """Exporta un informe de licencias en segundo plano"""
+        def format_row(license):
+            # Formatear estado
+            row = list(license)
+            row[6] = "Activa" if row[6] == 1 else "Revocada"
+            return row
+        
+        start_export(self, "Guardar Informe de Licencias",
+                     lambda: LicenseModel().export_licenses_report(),
+                     ["ID", "Gimnasio", "Tipo", "Fecha Inicio", 
+                      "Fecha Vencimiento", "Precio", "Estado"],
+                     transform=format_row)
+    
+    def export_gym_report(self):
+        """Exporta socios, asistencias e ingresos de cada gimnasio en segundo plano"""
+        def format_row(gym):
+            row = list(gym)
+            row[2] = "Activo" if row[2] == 1 else "Inactivo"
+            return row
+        
+        start_export(self, "Guardar Informe por Gimnasio",
+                     lambda: AdminReportsModel().export_gym_report(),
+                     ["ID", "Gimnasio", "Estado", "Último Acceso", "Socios", "Socios al Día",
+                      "Asistencias del Mes", "Ingresos por Cuotas", "Vencimiento Licencia",
+                      "Ingresos por Licencias"],
+                     transform=format_row, report_name="Informe por gimnasio")
@@ -0,0 +1,97 @@
+from PyQt6.QtWidgets import QFileDialog, QProgressDialog, QMessageBox
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from utils.exports import ExportJob, FORMATS, format_for_path
+
+# Filtros del diálogo de guardado -> formato de exportación
+EXPORT_FILTERS = {
+    "CSV Files (*.csv)": "csv",
+    "CSV comprimido (*.csv.gz)": "csv.gz",
+    "JSON Lines (*.jsonl)": "jsonl",
+    "JSON Lines comprimido (*.jsonl.gz)": "jsonl.gz",
+}
+
+def get_export_path(parent, title):
+    """Pide el archivo de destino y devuelve (ruta, formato), o (None, None) si se cancela"""
+    file_path, selected_filter = QFileDialog.getSaveFileName(parent, title, "", ";;".join(EXPORT_FILTERS))
+
+    if not file_path:
+        return None, None
+
+    # Respetar la extensión escrita por el usuario; si no tiene, usar la del filtro
+    if any(file_path.lower().endswith("." + fmt) for fmt in FORMATS):
+        return file_path, format_for_path(file_path)
+
+    fmt = EXPORT_FILTERS.get(selected_filter, "csv")
+    return f"{file_path}.{fmt}", fmt
+
+
+def start_export(parent, title, query, headers, transform=None, total=None, report_name="Informe"):
+    """Pide el destino y lanza la exportación en segundo plano con un diálogo de progreso"""
+    file_path, fmt = get_export_path(parent, title)
+
+    if not file_path:
+        return None
+
+    dialog = ExportProgressDialog(parent, title, query, headers, file_path, fmt, transform, total, report_name)
+    # Mantener una referencia mientras dura la exportación
+    parent._export_dialog = dialog
+    dialog.start()
+    return dialog
+
+
+class ExportProgressDialog(QProgressDialog):
+    """Muestra el avance de una exportación que corre fuera del hilo de la interfaz"""
+    progress_changed = pyqtSignal(int, object)
+    export_finished = pyqtSignal(int)
+    export_cancelled = pyqtSignal()
+    export_failed = pyqtSignal(str)
+
+    def __init__(self, parent, title, query, headers, path, fmt=None, transform=None, total=None,
+                 report_name="Informe"):
+        super().__init__("Exportando...", "Cancelar", 0, total or 0, parent)
+        self.setWindowTitle(title)
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+        self.setMinimumDuration(300)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+
+        self.path = path
+        self.report_name = report_name
+
+        # Las señales llevan los avisos del hilo de exportación al hilo de la interfaz
+        self.progress_changed.connect(self.update_progress)
+        self.export_finished.connect(self.on_finished)
+        self.export_cancelled.connect(self.on_cancelled)
+        self.export_failed.connect(self.on_failed)
+
+        self.job = ExportJob(query, headers, path, fmt, transform, total,
+                             on_progress=self.progress_changed.emit,
+                             on_finished=self.export_finished.emit,
+                             on_cancelled=self.export_cancelled.emit,
+                             on_error=lambda e: self.export_failed.emit(str(e)))
+        self.canceled.connect(self.job.cancel)
+
+    def start(self):
+        """Inicia la exportación"""
+        self.job.start()
+
+    def update_progress(self, written, total):
+        """Actualiza la barra con la cantidad de filas escritas"""
+        if total:
+            self.setMaximum(max(total, written))
+        self.setValue(written)
+        self.setLabelText(f"{written} filas exportadas")
+
+    def on_finished(self, written):
+        self.close()
+        QMessageBox.information(self.parent(), "Exportación Exitosa",
+                                f"{self.report_name} exportado a {self.path} ({written} filas)")
+
+    def on_cancelled(self):
+        self.close()
+        QMessageBox.information(self.parent(), "Exportación Cancelada", "La exportación fue cancelada.")
+
+    def on_failed(self, error):
+        self.close()
+        QMessageBox.critical(self.parent(), "Error", f"Error al exportar informe: {error}")
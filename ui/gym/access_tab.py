@@ -1,15 +1,16 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, 
-                           QLabel, QLineEdit, QPushButton, QFrame)
+                           QLabel, QLineEdit, QPushButton, QFrame, QMessageBox)
 from PyQt6.QtCore import Qt
 
 from config.constants import (INPUT_STYLE, BUTTON_STYLE, FRAME_STYLE)
-from models.member import MemberModel
+from models.checkin import CheckInModel
+from ui.workers import TaskRunner
 
 class AccessTab(QWidget):
     def __init__(self, gym_id):
         super().__init__()
         self.gym_id = gym_id
-        self.member_model = MemberModel()
+        self.tasks = TaskRunner(self)
         self.setup_ui()
         
     def setup_ui(self):
@@ -90,22 +91,31 @@ class AccessTab(QWidget):
         dni = self.dni_input.text().strip()
         
         if not dni:
-            from PyQt6.QtWidgets import QMessageBox
             QMessageBox.warning(self, "Error", "Debe ingresar un DNI.")
             return
         
-        member = self.member_model.get_member_by_dni(dni, self.gym_id)
-        
-        if not member:
+        # Búsqueda, clasificación y registro de asistencia en una sola
+        # transacción, fuera del hilo de la interfaz. Cada escaneo es una
+        # escritura independiente: nunca se descarta.
+        self.tasks.call(None, CheckInModel, "check_in", dni, self.gym_id,
+                        on_result=self.show_check_in, on_error=self.show_check_in_error)
+    
+    def show_check_in_error(self, error):
+        """Informa un error al registrar el ingreso"""
+        QMessageBox.critical(self, "Error", f"Error al verificar socio: {str(error)}")
+    
+    def show_check_in(self, result):
+        """Muestra el resultado de la verificación de un socio"""
+        if not result["found"]:
             self.member_name_label.setText("Socio no encontrado")
             self.quota_status_label.setText("")
             self.plan_desc_label.setText("")
             return
         
-        member_id, nombre, apellido, fecha_vencimiento, estado_cuota, plan_nombre, plan_descripcion = member
-        
-        # Registrar asistencia
-        self.member_model.register_attendance(member_id)
+        nombre = result["nombre"]
+        apellido = result["apellido"]
+        plan_nombre = result["plan_nombre"]
+        plan_descripcion = result["plan_descripcion"]
         
         # Mostrar nombre del socio y plan
         self.member_name_label.setText(f"{nombre} {apellido}")
@@ -117,20 +127,17 @@ class AccessTab(QWidget):
         else:
             self.plan_desc_label.setText("")
         
-        # Verificar estado de cuota
-        if estado_cuota == "No Pagada":
+        # Mostrar estado de cuota
+        status = result["status"]
+        if status == "no_pagada":
             self.quota_status_label.setText("Cuota no pagada")
             self.quota_status_label.setStyleSheet("font-size: 16px; color: #e74c3c; font-weight: bold;")
+        elif status == "vencida":
+            self.quota_status_label.setText("Cuota vencida")
+            self.quota_status_label.setStyleSheet("font-size: 16px; color: #e74c3c; font-weight: bold;")
+        elif status == "por_vencer":
+            self.quota_status_label.setText(f"Vence en {result['dias_restantes']} días")
+            self.quota_status_label.setStyleSheet("font-size: 16px; color: #f39c12; font-weight: bold;")
         else:
-            # Verificar estado de membresía
-            status, dias_restantes = self.member_model.check_membership_status(member_id, fecha_vencimiento)
-            
-            if status == "vencida":
-                self.quota_status_label.setText("Cuota vencida")
-                self.quota_status_label.setStyleSheet("font-size: 16px; color: #e74c3c; font-weight: bold;")
-            elif status == "por_vencer":
-                self.quota_status_label.setText(f"Vence en {dias_restantes} días")
-                self.quota_status_label.setStyleSheet("font-size: 16px; color: #f39c12; font-weight: bold;")
-            else:
-                self.quota_status_label.setText("Cuota al día")
-                self.quota_status_label.setStyleSheet("font-size: 16px; color: #2ecc71; font-weight: bold;")
\ No newline at end of file
+            self.quota_status_label.setText("Cuota al día")
+            self.quota_status_label.setStyleSheet("font-size: 16px; color: #2ecc71; font-weight: bold;")
\ No newline at end of file
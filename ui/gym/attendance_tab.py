@@ -0,0 +1,139 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+                           QTableView, QAbstractItemView, QHeaderView, QComboBox, QDateEdit,
+                           QCheckBox, QMessageBox)
+from PyQt6.QtCore import QDate, QTimer
+
+from config.constants import (BUTTON_STYLE, SECONDARY_BUTTON_STYLE, INPUT_STYLE, COMBOBOX_STYLE,
+                            TABLE_STYLE)
+from models.member import MemberModel
+from ui.gym.attendance_table_model import AttendanceTableModel
+from ui.workers import TaskRunner
+
+
+class AttendanceTab(QWidget):
+    """Registro de asistencias del gimnasio con filtros por socio, fechas y hora"""
+    def __init__(self, gym_id):
+        super().__init__()
+        self.gym_id = gym_id
+        self.tasks = TaskRunner(self)
+        # Se incrementa con cada filtrado; un DNI resuelto tarde no pisa un filtrado posterior
+        self.filter_request = 0
+        self.setup_ui()
+        # La primera página se pide después de pintar la pestaña
+        QTimer.singleShot(0, self.apply_filters)
+
+    def setup_ui(self):
+        """Configura la pestaña del registro de asistencias"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        filters_layout = QHBoxLayout()
+
+        self.dni_input = QLineEdit()
+        self.dni_input.setStyleSheet(INPUT_STYLE)
+        self.dni_input.setPlaceholderText("DNI del socio")
+        self.dni_input.setClearButtonEnabled(True)
+        self.dni_input.returnPressed.connect(self.apply_filters)
+        filters_layout.addWidget(self.dni_input)
+
+        self.dates_checkbox = QCheckBox("Entre")
+        self.dates_checkbox.toggled.connect(self.toggle_dates)
+        filters_layout.addWidget(self.dates_checkbox)
+
+        today = QDate.currentDate()
+        self.date_from = QDateEdit()
+        self.date_from.setStyleSheet(INPUT_STYLE)
+        self.date_from.setCalendarPopup(True)
+        self.date_from.setDate(today.addDays(1 - today.day()))
+        filters_layout.addWidget(self.date_from)
+
+        filters_layout.addWidget(QLabel("y"))
+
+        self.date_to = QDateEdit()
+        self.date_to.setStyleSheet(INPUT_STYLE)
+        self.date_to.setCalendarPopup(True)
+        self.date_to.setDate(today)
+        filters_layout.addWidget(self.date_to)
+        self.toggle_dates(False)
+
+        self.hour_combo = QComboBox()
+        self.hour_combo.setStyleSheet(COMBOBOX_STYLE)
+        self.hour_combo.addItem("Todas las horas", None)
+        for hour in range(24):
+            self.hour_combo.addItem(f"{hour:02d}:00 a {hour:02d}:59", hour)
+        filters_layout.addWidget(self.hour_combo)
+
+        filter_button = QPushButton("Filtrar")
+        filter_button.setStyleSheet(BUTTON_STYLE)
+        filter_button.clicked.connect(self.apply_filters)
+        filters_layout.addWidget(filter_button)
+
+        clear_button = QPushButton("Limpiar")
+        clear_button.setStyleSheet(SECONDARY_BUTTON_STYLE)
+        clear_button.clicked.connect(self.clear_filters)
+        filters_layout.addWidget(clear_button)
+
+        layout.addLayout(filters_layout)
+
+        # Tabla de asistencias (las filas se traen por páginas a medida que se muestran)
+        self.log_model = AttendanceTableModel(self.gym_id, self)
+        self.log_model.load_failed.connect(self.show_load_error)
+        self.log_table = QTableView()
+        self.log_table.setModel(self.log_model)
+        self.log_table.setStyleSheet(TABLE_STYLE)
+        self.log_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.log_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.log_table.setAlternatingRowColors(True)
+        layout.addWidget(self.log_table)
+
+    def toggle_dates(self, checked):
+        self.date_from.setEnabled(checked)
+        self.date_to.setEnabled(checked)
+
+    def apply_filters(self):
+        """Vuelve a cargar el registro con los filtros elegidos"""
+        self.filter_request += 1
+        request = self.filter_request
+        filters = {"hour": self.hour_combo.currentData()}
+
+        if self.dates_checkbox.isChecked():
+            date_from = self.date_from.date()
+            date_to = self.date_to.date()
+            if date_from > date_to:
+                QMessageBox.warning(self, "Error", "La fecha inicial es posterior a la final.")
+                return
+            filters["date_from"] = date_from.toString("yyyy-MM-dd")
+            filters["date_to"] = date_to.toString("yyyy-MM-dd")
+
+        dni = self.dni_input.text().strip()
+        if not dni:
+            self.show_log(filters)
+            return
+
+        def on_member(member):
+            if request != self.filter_request:
+                return
+            if member is None:
+                QMessageBox.warning(self, "Error", f"No hay ningún socio con DNI {dni}.")
+                return
+            self.show_log(dict(filters, member_id=member[0]))
+
+        self.tasks.call("member", MemberModel, "get_member_by_dni", dni, self.gym_id,
+                        on_result=on_member, on_error=self.show_load_error)
+
+    def show_log(self, filters):
+        """Vuelve a paginar el registro desde el principio con los filtros dados"""
+        self.log_model.set_filters(**filters)
+        self.log_table.scrollToTop()
+
+    def show_load_error(self, error):
+        """Informa un error al cargar el registro de asistencias"""
+        QMessageBox.critical(self, "Error", f"Error al cargar asistencias: {str(error)}")
+
+    def clear_filters(self):
+        """Quita los filtros y muestra todo el registro"""
+        self.dni_input.clear()
+        self.dates_checkbox.setChecked(False)
+        self.hour_combo.setCurrentIndex(0)
+        self.apply_filters()
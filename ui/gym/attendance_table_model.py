@@ -0,0 +1,104 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from models.attendance import AttendanceModel
+from ui.workers import TaskRunner
+
+class AttendanceTableModel(QAbstractTableModel):
+    """Modelo del registro de asistencias que trae las filas por páginas a medida que se muestran.
+
+    Las páginas se consultan en el pool de hilos; al cambiar los filtros, la
+    página que estaba en curso se descarta.
+    """
+    load_failed = pyqtSignal(object)
+
+    HEADERS = ["Fecha", "Hora", "Nombre", "Apellido", "DNI"]
+    PAGE_SIZE = 200
+
+    def __init__(self, gym_id, parent=None):
+        super().__init__(parent)
+        self.tasks = TaskRunner(self)
+        self.gym_id = gym_id
+        self.filters = {}
+        self._rows = []
+        self._last_key = None
+        self._exhausted = False
+        self._loading = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        _, fecha, nombre, apellido, dni = self._rows[index.row()]
+        values = (fecha[:10], fecha[11:16], nombre, apellido, dni)
+        return values[index.column()]
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        # Celdas seleccionables pero no editables
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Pide la siguiente página de asistencias a la base de datos"""
+        if parent.isValid() or self._exhausted or self._loading:
+            return
+
+        self._loading = True
+        self.tasks.call("page", AttendanceModel, "get_attendance_page", self.gym_id, self.PAGE_SIZE,
+                        self._last_key, **self.filters,
+                        on_result=self._append_page, on_error=self._on_load_error)
+
+    def _append_page(self, page):
+        """Agrega al final las filas de la página recibida"""
+        rows, self._last_key = page
+        self._loading = False
+
+        if len(rows) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not rows:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def _on_load_error(self, error):
+        # No se piden más páginas hasta la próxima recarga
+        self._loading = False
+        self._exhausted = True
+        self.load_failed.emit(error)
+
+    def set_filters(self, **filters):
+        """Aplica los filtros de get_attendance_page y vuelve a paginar desde el principio"""
+        self.filters = filters
+        self.reload()
+
+    def reload(self):
+        """Descarta las filas cargadas y trae la primera página"""
+        self.beginResetModel()
+        self._rows = []
+        self._last_key = None
+        self._exhausted = False
+        # Una página todavía en curso queda reemplazada por la nueva consulta
+        self._loading = False
+        self.endResetModel()
+        self.fetchMore()
@@ -1,21 +1,28 @@
+from datetime import datetime, timedelta
+
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                            QLabel, QPushButton, QListWidget, QListWidgetItem, 
-                           QStackedWidget, QMessageBox)
-from PyQt6.QtCore import Qt, QSize
+                           QMessageBox)
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal
 
 from config.constants import (BG_COLOR, TEXT_PRIMARY, TEXT_SECONDARY, 
                             SIDEBAR_BG, BORDER_COLOR, PRIMARY_COLOR,
                             CARD_COLOR, SECONDARY_BUTTON_STYLE, SIDEBAR_STYLE,
                             WARNING_COLOR, SUCCESS_COLOR)
-from ui.gym.access_tab import AccessTab
-from ui.gym.members_tab import MembersTab
-from ui.gym.plans_tab import PlansTab
-from ui.gym.reports_tab import ReportsTab
 from models.license import LicenseModel
-from config.database import init_gym_database
+from models.member import MemberModel
+from models.attendance_archive import AttendanceArchiveModel
+from models.attendance_writer import start_attendance_writer, stop_attendance_writer
+from utils.migrations import migrate_gym_database
+from ui.lazy_pages import LazyPageStack, mark_on_first_paint
+from ui.workers import TaskRunner
+from utils.startup import FIRST_TAB
 
 class GymApp(QMainWindow):
     """Aplicación principal para los gimnasios"""
+    # Se emite al cerrar sesión, antes de cerrar la ventana
+    logged_out = pyqtSignal()
+    
     def __init__(self, user_id, user_type, gym_name):
         super().__init__()
         self.user_id = user_id
@@ -55,10 +62,21 @@ class GymApp(QMainWindow):
             }}
         """)
         
-        init_gym_database()
-        self.license_model = LicenseModel()
+        migrate_gym_database()
+        start_attendance_writer()
+        self.tasks = TaskRunner(self)
         self.setup_ui()
         
+        # Resumir los meses cerrados y archivar el detalle antiguo sin demorar el inicio
+        self.tasks.call(None, AttendanceArchiveModel, "run_maintenance",
+                        on_error=self.show_maintenance_error)
+        
+        # Vencer las cuotas al iniciar y después de cada medianoche
+        self.expiry_timer = QTimer(self)
+        self.expiry_timer.setSingleShot(True)
+        self.expiry_timer.timeout.connect(self.expire_memberships)
+        self.expire_memberships()
+        
     def setup_ui(self):
         """Configura la interfaz de usuario principal"""
         # Widget central y layout principal
@@ -96,17 +114,19 @@ class GymApp(QMainWindow):
         self.menu_list.setSpacing(5)
         self.menu_list.setStyleSheet(SIDEBAR_STYLE)
         
-        # Agregar opciones de menú para gimnasios
+        # Agregar opciones de menú para gimnasios: (texto, módulo y clase de la página)
         menu_items = [
-            ("Control de Acceso", "access_tab"),
-            ("Gestión de Socios", "members_tab"),
-            ("Gestión de Planes", "plans_tab"),
-            ("Informes", "reports_tab")
+            ("Control de Acceso", "ui.gym.access_tab", "AccessTab"),
+            ("Gestión de Socios", "ui.gym.members_tab", "MembersTab"),
+            ("Gestión de Planes", "ui.gym.plans_tab", "PlansTab"),
+            ("Vencimientos", "ui.gym.renewals_tab", "RenewalsTab"),
+            ("Registro de Asistencias", "ui.gym.attendance_tab", "AttendanceTab"),
+            ("Informes", "ui.gym.reports_tab", "ReportsTab")
         ]
         
-        for text, page_name in menu_items:
+        for text, _, class_name in menu_items:
             item = QListWidgetItem(text)
-            item.setData(Qt.ItemDataRole.UserRole, page_name)
+            item.setData(Qt.ItemDataRole.UserRole, class_name)
             self.menu_list.addItem(item)
         
         left_layout.addWidget(self.menu_list)
@@ -117,9 +137,6 @@ class GymApp(QMainWindow):
         info_widget.setStyleSheet(f"background-color: {SIDEBAR_BG}; border-top: 1px solid {BORDER_COLOR};")
         info_layout = QVBoxLayout(info_widget)
         
-        # Obtener información de licencia
-        license_info = self.license_model.get_gym_license_info(self.user_id)
-        
         gym_label = QLabel(f"Gimnasio: {self.gym_name}")
         gym_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         gym_label.setStyleSheet(f"""
@@ -129,13 +146,13 @@ class GymApp(QMainWindow):
         """)
         info_layout.addWidget(gym_label)
         
-        if license_info:
-            days_left = license_info["days_left"]
-            license_label = QLabel(f"Licencia: {days_left} días restantes")
-            license_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            color = SUCCESS_COLOR if days_left > 30 else WARNING_COLOR
-            license_label.setStyleSheet(f"color: {color}; padding: 5px;")
-            info_layout.addWidget(license_label)
+        # Los días de licencia se completan cuando llega la consulta
+        self.license_label = QLabel("")
+        self.license_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        info_layout.addWidget(self.license_label)
+        self.tasks.call("license_info", LicenseModel, "get_gym_license_info", self.user_id,
+                        on_result=self.show_license_info,
+                        on_error=self.show_license_error)
         
         version_label = QLabel("FIT APP v1.0")
         version_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -171,21 +188,11 @@ class GymApp(QMainWindow):
         
         right_layout.addWidget(top_bar)
         
-        # Contenido principal (páginas apiladas)
-        self.content_stack = QStackedWidget()
-        
-        # Configurar páginas para gimnasios
-        self.access_tab = AccessTab(self.user_id)
-        self.content_stack.addWidget(self.access_tab)
-        
-        self.members_tab = MembersTab(self.user_id)
-        self.content_stack.addWidget(self.members_tab)
-        
-        self.plans_tab = PlansTab(self.user_id)
-        self.content_stack.addWidget(self.plans_tab)
-        
-        self.reports_tab = ReportsTab(self.user_id)
-        self.content_stack.addWidget(self.reports_tab)
+        # Contenido principal: cada página se importa y construye al visitarla
+        self.content_stack = LazyPageStack()
+        for _, module_name, class_name in menu_items:
+            self.content_stack.add_page(module_name, class_name, self.user_id)
+        mark_on_first_paint(self.content_stack, FIRST_TAB)
         
         right_layout.addWidget(self.content_stack)
         
@@ -197,6 +204,43 @@ class GymApp(QMainWindow):
         self.menu_list.currentRowChanged.connect(self.change_page)
         self.menu_list.setCurrentRow(0)  # Seleccionar la primera opción por defecto
     
+    def expire_memberships(self):
+        """Marca las cuotas vencidas en segundo plano y programa el próximo barrido"""
+        self.tasks.call("expiry", MemberModel, "expire_memberships",
+                        on_result=self.on_memberships_expired, on_error=self.show_expiry_error)
+        
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        # Un segundo de margen para que el barrido ya vea la fecha nueva
+        self.expiry_timer.start(int((next_midnight - now).total_seconds() * 1000) + 1000)
+    
+    def on_memberships_expired(self, expired):
+        """Actualiza la tabla de socios si el barrido cambió alguna cuota"""
+        members_tab = self.content_stack.page(1)
+        if expired and members_tab is not None:
+            members_tab.load_members()
+    
+    def show_license_info(self, license_info):
+        """Muestra los días de licencia restantes"""
+        if license_info:
+            days_left = license_info["days_left"]
+            color = SUCCESS_COLOR if days_left > 30 else WARNING_COLOR
+            self.license_label.setText(f"Licencia: {days_left} días restantes")
+            self.license_label.setStyleSheet(f"color: {color}; padding: 5px;")
+    
+    def show_license_error(self, error):
+        self.license_label.setText("Licencia: no disponible")
+        self.license_label.setStyleSheet(f"color: {WARNING_COLOR}; padding: 5px;")
+
+    def show_expiry_error(self, error):
+        QMessageBox.warning(self, "Vencimiento de Cuotas",
+                            f"No se pudieron actualizar las cuotas vencidas: {str(error)}")
+    
+    def show_maintenance_error(self, error):
+        """Informa que no se pudo cerrar el período de asistencias"""
+        QMessageBox.warning(self, "Archivo de Asistencias",
+                            f"No se pudo resumir ni archivar las asistencias antiguas: {str(error)}")
+    
     def logout(self):
         """Cierra la sesión actual y regresa a la pantalla de login."""
         reply = QMessageBox.question(self, "Cerrar Sesión", 
@@ -204,19 +248,19 @@ class GymApp(QMainWindow):
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
+            # El administrador de sesiones vuelve a mostrar la ventana de login
+            self.logged_out.emit()
             self.close()
-            # El flujo regresará al main() que mostrará nuevamente la ventana de login
     
     def change_page(self, index):
         """Cambia la página mostrada en el contenido principal"""
         # Cambiar el título de la página
         self.page_title.setText(self.menu_list.item(index).text())
-        # Cambiar la página mostrada
-        self.content_stack.setCurrentIndex(index)
+        # Cambiar la página mostrada (se construye la primera vez)
+        self.content_stack.show_page(index)
         
     def closeEvent(self, event):
         """Maneja el cierre de la aplicación"""
-        # Cerrar conexión a la base de datos
-        if hasattr(self, 'license_model'):
-            self.license_model.close()
+        # Volcar las asistencias pendientes antes de salir
+        stop_attendance_writer()
         event.accept()
\ No newline at end of file
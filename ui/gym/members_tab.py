@@ -1,19 +1,24 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, 
-                           QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, 
+                           QLineEdit, QPushButton, QTableView, QAbstractItemView, 
                            QHeaderView, QFrame, QComboBox, QMessageBox)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
+from PyQt6.QtCore import Qt, QTimer
 
 from config.constants import (TEXT_PRIMARY, FRAME_STYLE, INPUT_STYLE, BUTTON_STYLE, 
                             SECONDARY_BUTTON_STYLE, COMBOBOX_STYLE, TABLE_STYLE)
 from models.member import MemberModel
 from models.plan import PlanModel
+from ui.gym.members_table_model import MembersTableModel
+from ui.import_dialog import start_import
+from ui.workers import TaskRunner
+
+# Espera (ms) desde la última tecla antes de buscar
+SEARCH_DEBOUNCE_MS = 200
 
 class MembersTab(QWidget):
     def __init__(self, gym_id):
         super().__init__()
         self.gym_id = gym_id
-        self.member_model = MemberModel()
+        self.tasks = TaskRunner(self)
         self.plan_model = PlanModel()
         self.selected_member_id = None
         self.setup_ui()
@@ -56,8 +61,8 @@ class MembersTab(QWidget):
         self.estado_cuota.setMinimumHeight(30)
         self.estado_cuota.addItems(["Pagada", "No Pagada"])
         
-        # Actualizar lista de planes
-        self.update_plan_combo()
+        # La lista de planes se completa al mostrar la pestaña
+        self.plan_indexes = {}
         
         form_layout.addRow("Nombre:", self.nombre_input)
         form_layout.addRow("Apellido:", self.apellido_input)
@@ -93,30 +98,60 @@ class MembersTab(QWidget):
         button_layout.addWidget(self.delete_button)
         button_layout.addWidget(self.clear_button)
         
+        self.import_button = QPushButton("Importar CSV")
+        self.import_button.setStyleSheet(SECONDARY_BUTTON_STYLE)
+        self.import_button.setToolTip("Columnas: nombre, apellido, dni y opcionalmente telefono, plan, "
+                                      "estado y vencimiento. Sin plan se usa el seleccionado.")
+        self.import_button.clicked.connect(self.import_members)
+        button_layout.addWidget(self.import_button)
+        
         layout.addLayout(button_layout)
         
-        # Tabla de socios
-        self.members_table = QTableWidget()
+        # Búsqueda incremental: se consulta cuando se deja de escribir
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar por nombre, apellido, DNI o teléfono...")
+        self.search_input.setStyleSheet(INPUT_STYLE)
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.schedule_search)
+        layout.addWidget(self.search_input)
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        
+        # Tabla de socios (las filas se traen por páginas a medida que se muestran)
+        self.members_model = MembersTableModel(self.gym_id, self)
+        self.members_model.load_failed.connect(self.show_load_error)
+        self.members_table = QTableView()
+        self.members_table.setModel(self.members_model)
         self.members_table.setStyleSheet(TABLE_STYLE)
-        self.members_table.setColumnCount(8)
-        self.members_table.setHorizontalHeaderLabels([
-            "ID", "Nombre", "Apellido", "DNI", "Teléfono", "Fecha Vencimiento", "Estado Cuota", "Plan"
-        ])
         self.members_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.members_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.members_table.cellClicked.connect(self.select_member)
+        self.members_table.horizontalHeader().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+        self.members_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.members_table.clicked.connect(self.select_member)
         self.members_table.setAlternatingRowColors(True)
+        # Al habilitar el ordenamiento se carga la primera página
+        self.members_table.setSortingEnabled(True)
         
         layout.addWidget(self.members_table)
-        
-        # Cargar datos en la tabla
-        self.load_members()
+    
+    def showEvent(self, event):
+        # El catálogo de planes está en memoria, así que refrescar la lista
+        # cada vez que se muestra la pestaña es barato
+        super().showEvent(event)
+        self.update_plan_combo()
     
     def update_plan_combo(self):
-        """Actualiza el combo box de planes"""
+        """Actualiza el combo box de planes, conservando el plan elegido"""
+        current = self.plan_combo.currentText()
         self.plan_combo.clear()
-        plans = self.plan_model.get_all_plan_names()
-        self.plan_combo.addItems(plans)
+        self.plan_indexes = {}
+        for index, name in enumerate(self.plan_model.get_all_plan_names()):
+            self.plan_combo.addItem(name, self.plan_model.get_plan_by_name(name)[0])
+            self.plan_indexes[name] = index
+        if current in self.plan_indexes:
+            self.plan_combo.setCurrentIndex(self.plan_indexes[current])
     
     def clear_form(self):
         """Limpia el formulario de socios"""
@@ -138,44 +173,41 @@ class MembersTab(QWidget):
     
     def load_members(self):
         """Carga la lista de socios en la tabla"""
-        members = self.member_model.get_all_members(self.gym_id)
-        
-        self.members_table.setRowCount(0)  # Limpiar tabla
-        
-        for row_idx, member in enumerate(members):
-            self.members_table.insertRow(row_idx)
-            
-            for col_idx, value in enumerate(member):
-                item = QTableWidgetItem(str(value))
-                # Aplicar color según el estado de la cuota
-                if col_idx == 6:  # Columna de estado de cuota
-                    if value == "Pagada":
-                        item.setForeground(QColor("#2ecc71"))  # Verde para pagada
-                    else:
-                        item.setForeground(QColor("#e74c3c"))  # Rojo para no pagada
-                
-                # Hacer las celdas no editables
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.members_table.setItem(row_idx, col_idx, item)
-    
-    def select_member(self, row, column):
+        self.members_model.reload()
+    
+    def show_load_error(self, error):
+        """Informa un error al cargar los socios"""
+        QMessageBox.critical(self, "Error", f"Error al cargar socios: {str(error)}")
+    
+    def show_write_error(self, error):
+        """Informa un error al guardar un socio"""
+        QMessageBox.critical(self, "Error", f"Error al guardar socio: {str(error)}")
+    
+    def schedule_search(self):
+        """Reinicia la espera de la búsqueda con cada tecla"""
+        self.search_timer.start()
+    
+    def run_search(self):
+        """Filtra la tabla con el texto de búsqueda"""
+        self.members_model.set_search(self.search_input.text())
+    
+    def select_member(self, model_index):
         """Selecciona un socio de la tabla para editar"""
-        self.selected_member_id = int(self.members_table.item(row, 0).text())
+        member = self.members_model.row_data(model_index.row())
+        self.selected_member_id = member[0]
         
         # Cargar datos en el formulario
-        self.nombre_input.setText(self.members_table.item(row, 1).text())
-        self.apellido_input.setText(self.members_table.item(row, 2).text())
-        self.member_dni_input.setText(self.members_table.item(row, 3).text())
-        self.telefono_input.setText(self.members_table.item(row, 4).text())
+        self.nombre_input.setText(member[1])
+        self.apellido_input.setText(member[2])
+        self.member_dni_input.setText(member[3])
+        self.telefono_input.setText(member[4] or "")
         
         # Seleccionar el plan
-        plan_nombre = self.members_table.item(row, 7).text()
-        for i in range(self.plan_combo.count()):
-            if self.plan_combo.itemText(i) == plan_nombre:
-                self.plan_combo.setCurrentIndex(i)
-                break
+        plan_nombre = member[7]
+        if plan_nombre in self.plan_indexes:
+            self.plan_combo.setCurrentIndex(self.plan_indexes[plan_nombre])
         
-        estado = self.members_table.item(row, 6).text()
+        estado = member[6]
         index = 0 if estado == "Pagada" else 1
         self.estado_cuota.setCurrentIndex(index)
         
@@ -193,15 +225,20 @@ class MembersTab(QWidget):
         estado_cuota = self.estado_cuota.currentText()
         
         # Obtener el ID del plan seleccionado
-        plan_nombre = self.plan_combo.currentText()
-        plan_id = self.plan_model.get_plan_by_name(plan_nombre)[0]
+        plan_id = self.plan_combo.currentData()
         
         # Validación básica
         if not nombre or not apellido or not dni:
             QMessageBox.warning(self, "Error", "Los campos Nombre, Apellido y DNI son obligatorios.")
             return
         
-        success, error_msg = self.member_model.add_member(nombre, apellido, dni, telefono, plan_id, estado_cuota, self.gym_id)
+        self.tasks.call(None, MemberModel, "add_member", nombre, apellido, dni, telefono, plan_id,
+                        estado_cuota, self.gym_id,
+                        on_result=self.on_member_added, on_error=self.show_write_error)
+    
+    def on_member_added(self, outcome):
+        """Completa el alta de un socio"""
+        success, error_msg = outcome
         
         if success:
             QMessageBox.information(self, "Éxito", "Socio registrado correctamente.")
@@ -210,6 +247,15 @@ class MembersTab(QWidget):
         else:
             QMessageBox.warning(self, "Error", error_msg)
     
+    def import_members(self):
+        """Importa socios desde un archivo CSV en segundo plano"""
+        plan_id = self.plan_combo.currentData()
+        if plan_id is None:
+            QMessageBox.warning(self, "Error", "Debe crear al menos un plan antes de importar socios.")
+            return
+        
+        start_import(self, self.gym_id, plan_id, on_imported=self.load_members)
+    
     def update_member(self):
         """Actualiza los datos de un socio existente"""
         if not self.selected_member_id:
@@ -222,15 +268,20 @@ class MembersTab(QWidget):
         estado_cuota = self.estado_cuota.currentText()
         
         # Obtener el ID del plan seleccionado
-        plan_nombre = self.plan_combo.currentText()
-        plan_id = self.plan_model.get_plan_by_name(plan_nombre)[0]
+        plan_id = self.plan_combo.currentData()
         
         # Validación básica
         if not nombre or not apellido or not dni:
             QMessageBox.warning(self, "Error", "Los campos Nombre, Apellido y DNI son obligatorios.")
             return
         
-        success, error_msg = self.member_model.update_member(self.selected_member_id, nombre, apellido, dni, telefono, plan_id, estado_cuota)
+        self.tasks.call(None, MemberModel, "update_member", self.selected_member_id, nombre, apellido,
+                        dni, telefono, plan_id, estado_cuota,
+                        on_result=self.on_member_updated, on_error=self.show_write_error)
+    
+    def on_member_updated(self, outcome):
+        """Completa la actualización de un socio"""
+        success, error_msg = outcome
         
         if success:
             QMessageBox.information(self, "Éxito", "Socio actualizado correctamente.")
@@ -249,7 +300,11 @@ class MembersTab(QWidget):
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.member_model.delete_member(self.selected_member_id)
-            QMessageBox.information(self, "Éxito", "Socio eliminado correctamente.")
-            self.clear_form()
-            self.load_members()
\ No newline at end of file
+            self.tasks.call(None, MemberModel, "delete_member", self.selected_member_id,
+                            on_result=self.on_member_deleted, on_error=self.show_write_error)
+    
+    def on_member_deleted(self, result):
+        """Completa la eliminación de un socio"""
+        QMessageBox.information(self, "Éxito", "Socio eliminado correctamente.")
+        self.clear_form()
+        self.load_members()
\ No newline at end of file
@@ -0,0 +1,146 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QColor
+
+from models.member import MemberModel
+from ui.workers import TaskRunner
+
+PAID_COLOR = QColor("#2ecc71")  # Verde para pagada
+UNPAID_COLOR = QColor("#e74c3c")  # Rojo para no pagada
+
+class MembersTableModel(QAbstractTableModel):
+    """Modelo de la tabla de socios que trae las filas por páginas a medida que se muestran.
+
+    Las páginas se consultan en el pool de hilos; al recargar, la página que
+    estaba en curso se descarta.
+    """
+    load_failed = pyqtSignal(object)
+
+    HEADERS = ["ID", "Nombre", "Apellido", "DNI", "Teléfono", "Fecha Vencimiento", "Estado Cuota", "Plan"]
+    STATUS_COLUMN = 6
+    PAGE_SIZE = 200
+
+    def __init__(self, gym_id, parent=None):
+        super().__init__(parent)
+        self.tasks = TaskRunner(self)
+        self.gym_id = gym_id
+        self.sort_column = 0
+        self.descending = False
+        self.search_text = ""
+        self._rows = []
+        self._last_key = None
+        self._exhausted = False
+        self._loading = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        value = self._rows[index.row()][index.column()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(value)
+
+        # Aplicar color según el estado de la cuota
+        if role == Qt.ItemDataRole.ForegroundRole and index.column() == self.STATUS_COLUMN:
+            return PAID_COLOR if value == "Pagada" else UNPAID_COLOR
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        # Celdas seleccionables pero no editables
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Pide la siguiente página de socios a la base de datos"""
+        if parent.isValid() or self._exhausted or self._loading:
+            return
+
+        self._loading = True
+        if self.search_text:
+            self.tasks.call("page", MemberModel, "search_members", self.gym_id, self.search_text,
+                            on_result=self._show_search_results, on_error=self._on_load_error)
+        else:
+            self.tasks.call("page", MemberModel, "get_members_page", self.gym_id, self.PAGE_SIZE,
+                            self._last_key, self.sort_column, self.descending,
+                            on_result=self._append_page, on_error=self._on_load_error)
+
+    def _append_page(self, page):
+        """Agrega al final las filas de la página recibida"""
+        rows, self._last_key = page
+        self._loading = False
+
+        if len(rows) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not rows:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Ordena en la base de datos y vuelve a paginar desde el principio"""
+        self.sort_column = column
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.reload()
+
+    def set_search(self, text):
+        """Muestra sólo los socios que coinciden con el texto (vacío vuelve a la lista completa)"""
+        self.search_text = text.strip()
+        self.reload()
+
+    def _show_search_results(self, rows):
+        """Muestra las mejores coincidencias de la búsqueda (llegan en una sola consulta)"""
+        self._loading = False
+        self._exhausted = True
+        if not rows:
+            return
+
+        # Son pocas filas: el orden de la columna elegida se aplica en memoria
+        rows.sort(key=lambda row: (row[self.sort_column] is None, row[self.sort_column] or ""),
+                  reverse=self.descending)
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        self._rows = rows
+        self.endInsertRows()
+
+    def _on_load_error(self, error):
+        # No se piden más páginas hasta la próxima recarga
+        self._loading = False
+        self._exhausted = True
+        self.load_failed.emit(error)
+
+    def reload(self):
+        """Descarta las filas cargadas y trae la primera página"""
+        self.beginResetModel()
+        self._rows = []
+        self._last_key = None
+        self._exhausted = False
+        # Una página todavía en curso queda reemplazada por la nueva consulta
+        self._loading = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def row_data(self, row):
+        """Devuelve la fila completa de un socio"""
+        return self._rows[row]
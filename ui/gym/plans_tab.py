@@ -1,17 +1,18 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, 
                            QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, 
                            QHeaderView, QFrame, QMessageBox)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 
 from config.constants import (FRAME_STYLE, INPUT_STYLE, BUTTON_STYLE, 
                             SECONDARY_BUTTON_STYLE, TABLE_STYLE)
 from models.plan import PlanModel
+from ui.workers import TaskRunner
 
 class PlansTab(QWidget):
     def __init__(self, gym_id):
         super().__init__()
         self.gym_id = gym_id
-        self.plan_model = PlanModel()
+        self.tasks = TaskRunner(self)
         self.selected_plan_id = None
         self.setup_ui()
         
@@ -81,8 +82,8 @@ class PlansTab(QWidget):
         
         layout.addWidget(self.plans_table)
         
-        # Cargar datos en la tabla
-        self.load_plans()
+        # Cargar datos en la tabla después de pintar la pestaña
+        QTimer.singleShot(0, self.load_plans)
     
     def clear_plan_form(self):
         """Limpia el formulario de planes"""
@@ -99,9 +100,20 @@ class PlansTab(QWidget):
         self.selected_plan_id = None
     
     def load_plans(self):
-        """Carga la lista de planes en la tabla"""
-        planes = self.plan_model.get_all_plans()
-        
+        """Carga la lista de planes en la tabla en segundo plano"""
+        self.tasks.call("plans", PlanModel, "get_all_plans",
+                        on_result=self.populate_plans, on_error=self.show_load_error)
+    
+    def show_load_error(self, error):
+        """Informa un error al cargar los planes"""
+        QMessageBox.critical(self, "Error", f"Error al cargar planes: {str(error)}")
+    
+    def show_write_error(self, error):
+        """Informa un error al guardar un plan"""
+        QMessageBox.critical(self, "Error", f"Error al guardar plan: {str(error)}")
+    
+    def populate_plans(self, planes):
+        """Llena la tabla con los planes recibidos"""
         self.plans_table.setRowCount(0)  # Limpiar tabla
         
         for row_idx, plan in enumerate(planes):
@@ -153,7 +165,12 @@ class PlansTab(QWidget):
             QMessageBox.warning(self, "Error", "El precio debe ser un número válido.")
             return
         
-        success, error_msg = self.plan_model.add_plan(nombre, descripcion, precio)
+        self.tasks.call(None, PlanModel, "add_plan", nombre, descripcion, precio,
+                        on_result=self.on_plan_added, on_error=self.show_write_error)
+    
+    def on_plan_added(self, outcome):
+        """Completa el alta de un plan"""
+        success, error_msg = outcome
         
         if success:
             QMessageBox.information(self, "Éxito", "Plan registrado correctamente.")
@@ -185,7 +202,12 @@ class PlansTab(QWidget):
             QMessageBox.warning(self, "Error", "El precio debe ser un número válido.")
             return
         
-        success, error_msg = self.plan_model.update_plan(self.selected_plan_id, nombre, descripcion, precio)
+        self.tasks.call(None, PlanModel, "update_plan", self.selected_plan_id, nombre, descripcion, precio,
+                        on_result=self.on_plan_updated, on_error=self.show_write_error)
+    
+    def on_plan_updated(self, outcome):
+        """Completa la actualización de un plan"""
+        success, error_msg = outcome
         
         if success:
             QMessageBox.information(self, "Éxito", "Plan actualizado correctamente.")
@@ -199,17 +221,21 @@ class PlansTab(QWidget):
         if not self.selected_plan_id:
             return
         
-        success, error_msg = self.plan_model.delete_plan(self.selected_plan_id, self.gym_id)
-        
-        if not success:
-            QMessageBox.warning(self, "Error", error_msg)
-            return
-        
         reply = QMessageBox.question(self, "Confirmar", 
                                     "¿Está seguro que desea eliminar este plan? Esta acción no se puede deshacer.",
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
+            self.tasks.call(None, PlanModel, "delete_plan", self.selected_plan_id, self.gym_id,
+                            on_result=self.on_plan_deleted, on_error=self.show_write_error)
+    
+    def on_plan_deleted(self, outcome):
+        """Completa la eliminación de un plan"""
+        success, error_msg = outcome
+        
+        if success:
             QMessageBox.information(self, "Éxito", "Plan eliminado correctamente.")
             self.clear_plan_form()
-            self.load_plans()
\ No newline at end of file
+            self.load_plans()
+        else:
+            QMessageBox.warning(self, "Error", error_msg)
\ No newline at end of file
@@ -0,0 +1,104 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                           QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtGui import QColor
+
+from config.constants import (BUTTON_STYLE, TABLE_STYLE, INPUT_STYLE, DANGER_COLOR, WARNING_COLOR)
+from models.member import MemberModel, DIAS_AVISO_VENCIMIENTO
+from ui.export_dialog import start_export
+from ui.workers import TaskRunner
+
+# Grupos de urgencia que se cuentan arriba de la lista: (hasta días, etiqueta)
+URGENCY_GROUPS = [(3, "en 3 días o menos"), (7, "en 4 a 7 días"), (None, "en más de 7 días")]
+
+
+class RenewalsTab(QWidget):
+    """Lista de socios con la cuota por vencer, para gestionar las renovaciones"""
+    HEADERS = ["Nombre", "Apellido", "DNI", "Teléfono", "Vencimiento", "Plan", "Días restantes"]
+
+    def __init__(self, gym_id):
+        super().__init__()
+        self.gym_id = gym_id
+        self.tasks = TaskRunner(self)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configura la pestaña de vencimientos"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Vencen en los próximos"))
+
+        self.days_input = QSpinBox()
+        self.days_input.setStyleSheet(INPUT_STYLE)
+        self.days_input.setRange(1, 90)
+        self.days_input.setValue(DIAS_AVISO_VENCIMIENTO)
+        self.days_input.setSuffix(" días")
+        self.days_input.valueChanged.connect(self.load_expiring)
+        controls_layout.addWidget(self.days_input)
+        controls_layout.addStretch()
+
+        export_button = QPushButton("Exportar CSV")
+        export_button.setStyleSheet(BUTTON_STYLE)
+        export_button.clicked.connect(self.export_expiring)
+        controls_layout.addWidget(export_button)
+
+        layout.addLayout(controls_layout)
+
+        self.counts_label = QLabel("")
+        self.counts_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        layout.addWidget(self.counts_label)
+
+        self.expiring_table = QTableWidget()
+        self.expiring_table.setStyleSheet(TABLE_STYLE)
+        self.expiring_table.setColumnCount(len(self.HEADERS))
+        self.expiring_table.setHorizontalHeaderLabels(self.HEADERS)
+        self.expiring_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.expiring_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.expiring_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.expiring_table.setAlternatingRowColors(True)
+        layout.addWidget(self.expiring_table)
+
+    def showEvent(self, event):
+        # La lista se reutiliza mientras no cambien los socios, así que
+        # consultarla cada vez que se muestra la pestaña es barato
+        super().showEvent(event)
+        self.load_expiring()
+
+    def load_expiring(self):
+        """Pide la lista de vencimientos fuera del hilo de la interfaz"""
+        self.tasks.call("expiring", MemberModel, "get_expiring_members", self.gym_id, self.days_input.value(),
+                        on_result=self.show_expiring, on_error=self.show_expiring_error)
+
+    def show_expiring(self, members):
+        """Muestra los conteos por urgencia y la lista"""
+        counts = []
+        lower = 0
+        for upper, label in URGENCY_GROUPS:
+            count = sum(1 for member in members if member[7] > lower and (upper is None or member[7] <= upper))
+            counts.append(f"{count} {label}")
+            lower = upper
+        self.counts_label.setText(f"{len(members)} cuotas por vencer: " + " · ".join(counts))
+
+        self.expiring_table.setRowCount(len(members))
+        for row_idx, (_, nombre, apellido, dni, telefono, vencimiento, plan, dias) in enumerate(members):
+            values = [nombre, apellido, dni, telefono or "", vencimiento, plan or "", str(dias)]
+            for col_idx, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col_idx == len(values) - 1:
+                    item.setForeground(QColor(DANGER_COLOR if dias <= URGENCY_GROUPS[0][0] else WARNING_COLOR))
+                self.expiring_table.setItem(row_idx, col_idx, item)
+
+    def show_expiring_error(self, error):
+        self.counts_label.setText(f"No se pudo cargar la lista de vencimientos: {str(error)}")
+
+    def export_expiring(self):
+        """Exporta la lista de vencimientos en segundo plano"""
+        gym_id = self.gym_id
+        days = self.days_input.value()
+
+        start_export(self, "Guardar Lista de Vencimientos",
+                     lambda: MemberModel().export_expiring_members(gym_id, days),
+                     self.HEADERS, total=self.expiring_table.rowCount(),
+                     report_name="Lista de vencimientos")
@@ -1,17 +1,25 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, 
-                    QLabel, QPushButton, QFrame, QFileDialog, QMessageBox)
+                    QLabel, QPushButton, QFrame, QMessageBox, QTableWidget,
+                    QTableWidgetItem, QHeaderView)
 from PyQt6.QtCore import Qt
-import csv
+from PyQt6.QtGui import QColor
 
-from config.constants import (FRAME_STYLE, BUTTON_STYLE)
+from config.constants import (FRAME_STYLE, BUTTON_STYLE, TABLE_STYLE, PRIMARY_COLOR)
+from models.attendance import AttendanceModel
+from models.attendance_analytics import AttendanceAnalyticsModel, WEEKDAYS, analytics_available
 from models.member import MemberModel
+from ui.export_dialog import start_export
+from ui.workers import TaskRunner
 
 class ReportsTab(QWidget):
     def __init__(self, gym_id):
         super().__init__()
         self.gym_id = gym_id
         self.member_model = MemberModel()
+        self.tasks = TaskRunner(self)
         self.setup_ui()
+        self.load_stats()
+        self.load_analytics()
         
     def setup_ui(self):
         """Configura la pestaña de informes"""
@@ -37,24 +45,54 @@ class ReportsTab(QWidget):
         # Grid de estadísticas
         stats_grid = QGridLayout()
         
-        # Obtener estadísticas
-        member_stats = self.member_model.get_member_status_stats(self.gym_id)
-        attendance_count = self.member_model.get_attendance_stats(self.gym_id)
+        # Los valores se completan cuando llegan las consultas
+        self.total_members_label = QLabel("...")
+        self.active_members_label = QLabel("...")
+        self.attendance_count_label = QLabel("...")
         
-        # Agregar al grid
         stats_grid.addWidget(QLabel("Total de Socios:"), 0, 0)
-        stats_grid.addWidget(QLabel(str(member_stats["total"])), 0, 1)
+        stats_grid.addWidget(self.total_members_label, 0, 1)
         
         stats_grid.addWidget(QLabel("Socios con Cuota al Día:"), 1, 0)
-        stats_grid.addWidget(QLabel(f"{member_stats['active']} ({member_stats['percent_active']:.1f}%)"), 1, 1)
+        stats_grid.addWidget(self.active_members_label, 1, 1)
         
         stats_grid.addWidget(QLabel("Asistencias este Mes:"), 2, 0)
-        stats_grid.addWidget(QLabel(str(attendance_count)), 2, 1)
+        stats_grid.addWidget(self.attendance_count_label, 2, 1)
         
         stats_layout.addLayout(stats_grid)
         
         layout.addWidget(stats_frame)
         
+        # Panel de análisis de asistencias (se completa en segundo plano)
+        analytics_frame = QFrame()
+        analytics_frame.setFrameShape(QFrame.Shape.StyledPanel)
+        analytics_frame.setStyleSheet(FRAME_STYLE)
+        analytics_layout = QVBoxLayout(analytics_frame)
+        
+        analytics_title = QLabel("Análisis de Asistencias del Último Año")
+        analytics_title.setStyleSheet("font-size: 16px; font-weight: bold;")
+        analytics_layout.addWidget(analytics_title)
+        
+        self.analytics_summary_label = QLabel("Calculando...")
+        self.analytics_summary_label.setWordWrap(True)
+        analytics_layout.addWidget(self.analytics_summary_label)
+        
+        self.peak_hours_label = QLabel("")
+        self.peak_hours_label.setWordWrap(True)
+        analytics_layout.addWidget(self.peak_hours_label)
+        
+        # Promedio de asistencias por día de la semana y hora
+        self.heatmap_table = QTableWidget(len(WEEKDAYS), 24)
+        self.heatmap_table.setStyleSheet(TABLE_STYLE)
+        self.heatmap_table.setVerticalHeaderLabels(WEEKDAYS)
+        self.heatmap_table.setHorizontalHeaderLabels([f"{hour:02d}" for hour in range(24)])
+        self.heatmap_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.heatmap_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.heatmap_table.setToolTip("Promedio de asistencias por día de la semana y hora")
+        analytics_layout.addWidget(self.heatmap_table)
+        
+        layout.addWidget(analytics_frame)
+        
         # Panel de exportación de informes
         export_frame = QFrame()
         export_frame.setFrameShape(QFrame.Shape.StyledPanel)
@@ -74,64 +112,107 @@ class ReportsTab(QWidget):
         attendance_button.setStyleSheet(BUTTON_STYLE)
         attendance_button.clicked.connect(self.export_attendance_report)
         
+        summary_button = QPushButton("Exportar Resumen Anual de Asistencias")
+        summary_button.setStyleSheet(BUTTON_STYLE)
+        summary_button.clicked.connect(self.export_attendance_summary)
+        
         payments_button = QPushButton("Exportar Informe de Pagos")
         payments_button.setStyleSheet(BUTTON_STYLE)
         payments_button.clicked.connect(self.export_payments_report)
         
         export_layout.addWidget(members_button)
         export_layout.addWidget(attendance_button)
+        export_layout.addWidget(summary_button)
         export_layout.addWidget(payments_button)
         
         layout.addWidget(export_frame)
         
         layout.addStretch()
     
-    def export_members_report(self):
-        """Exporta un informe de socios a un archivo CSV"""
-        file_path, _ = QFileDialog.getSaveFileName(self, "Guardar Informe de Socios", "", "CSV Files (*.csv)")
-        
-        if not file_path:
+    def load_stats(self):
+        """Pide las estadísticas del gimnasio fuera del hilo de la interfaz"""
+        self.tasks.call("member_stats", MemberModel, "get_member_status_stats", self.gym_id,
+                        on_result=self.show_member_stats, on_error=self.show_stats_error)
+        self.tasks.call("attendance_stats", MemberModel, "get_attendance_stats", self.gym_id,
+                        on_result=lambda count: self.attendance_count_label.setText(str(count)),
+                        on_error=self.show_stats_error)
+    
+    def show_member_stats(self, member_stats):
+        self.total_members_label.setText(str(member_stats["total"]))
+        self.active_members_label.setText(f"{member_stats['active']} ({member_stats['percent_active']:.1f}%)")
+    
+    def show_stats_error(self, error):
+        QMessageBox.critical(self, "Error", f"Error al cargar las estadísticas: {str(error)}")
+    
+    def load_analytics(self):
+        """Pide el análisis de asistencias fuera del hilo de la interfaz"""
+        if not analytics_available():
+            self.analytics_summary_label.setText("El análisis de asistencias requiere el paquete numpy.")
+            self.heatmap_table.hide()
             return
         
-        try:
-            members = self.member_model.export_members_report(self.gym_id)
-            
-            with open(file_path, 'w', newline='') as file:
-                writer = csv.writer(file)
-                # Escribir encabezados
-                writer.writerow(["ID", "Nombre", "Apellido", "DNI", "Teléfono", "Fecha Registro", 
-                                "Fecha Vencimiento", "Estado Cuota", "Plan"])
-                # Escribir datos
-                for member in members:
-                    writer.writerow(member)
-            
-            QMessageBox.information(self, "Exportación Exitosa", f"Informe de socios exportado a {file_path}")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al exportar informe: {str(e)}")
+        self.tasks.call("analytics", AttendanceAnalyticsModel, "get_attendance_analytics", self.gym_id,
+                        on_result=self.show_analytics, on_error=self.show_analytics_error)
+    
+    def show_analytics(self, analytics):
+        """Muestra el resumen, las horas pico y el mapa de calor"""
+        frequency = ", ".join(f"{label}: {count}" for label, count in analytics["frecuencia"])
+        self.analytics_summary_label.setText(
+            f"{analytics['total']} asistencias del {analytics['desde']} al {analytics['hasta']} · "
+            f"{analytics['socios_activos']} socios asistieron, "
+            f"{analytics['visitas_semanales_promedio']:.1f} visitas por semana en promedio.\n"
+            f"Socios por visitas semanales: {frequency}")
+        
+        peaks = ", ".join(f"{WEEKDAYS[weekday]} {hour:02d}:00 ({average:.1f})"
+                          for weekday, hour, average in analytics["horas_pico"])
+        self.peak_hours_label.setText(f"Horas pico (promedio de asistencias): {peaks or 'sin datos'}")
+        
+        averages = analytics["promedio_por_franja"]
+        highest = averages.max() or 1
+        color = QColor(PRIMARY_COLOR)
+        for weekday in range(len(WEEKDAYS)):
+            for hour in range(24):
+                value = averages[weekday, hour]
+                item = QTableWidgetItem(f"{value:.0f}" if value else "")
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                # La intensidad del color es proporcional al promedio de la franja
+                cell_color = QColor(color)
+                cell_color.setAlphaF(float(value / highest))
+                item.setBackground(cell_color)
+                self.heatmap_table.setItem(weekday, hour, item)
+    
+    def show_analytics_error(self, error):
+        self.analytics_summary_label.setText(f"No se pudo calcular el análisis de asistencias: {str(error)}")
+    
+    def export_members_report(self):
+        """Exporta un informe de socios en segundo plano"""
+        gym_id = self.gym_id
+        total = self.member_model.get_member_status_stats(gym_id)["total"]
+        
+        start_export(self, "Guardar Informe de Socios",
+                     lambda: MemberModel().export_members_report(gym_id),
+                     ["ID", "Nombre", "Apellido", "DNI", "Teléfono", "Fecha Registro", 
+                      "Fecha Vencimiento", "Estado Cuota", "Plan"],
+                     total=total, report_name="Informe de socios")
     
     def export_attendance_report(self):
-        """Exporta un informe de asistencias a un archivo CSV"""
-        file_path, _ = QFileDialog.getSaveFileName(self, "Guardar Informe de Asistencias", "", "CSV Files (*.csv)")
-        
-        if not file_path:
-            return
-        
-        try:
-            attendances = self.member_model.export_attendance_report(self.gym_id)
-            
-            with open(file_path, 'w', newline='') as file:
-                writer = csv.writer(file)
-                # Escribir encabezados
-                writer.writerow(["Fecha", "Nombre", "Apellido", "DNI"])
-                # Escribir datos
-                for attendance in attendances:
-                    writer.writerow(attendance)
-            
-            QMessageBox.information(self, "Exportación Exitosa", f"Informe de asistencias exportado a {file_path}")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al exportar informe: {str(e)}")
+        """Exporta un informe de asistencias en segundo plano"""
+        gym_id = self.gym_id
+        total = self.member_model.get_attendance_stats(gym_id)
+        
+        start_export(self, "Guardar Informe de Asistencias",
+                     lambda: MemberModel().export_attendance_report(gym_id),
+                     ["Fecha", "Nombre", "Apellido", "DNI"],
+                     total=total, report_name="Informe de asistencias")
+    
+    def export_attendance_summary(self):
+        """Exporta las asistencias por socio y mes de los últimos doce meses"""
+        gym_id = self.gym_id
+        
+        start_export(self, "Guardar Resumen de Asistencias",
+                     lambda: AttendanceModel().export_attendance_summary(gym_id),
+                     ["Mes", "Apellido", "Nombre", "DNI", "Asistencias"],
+                     report_name="Resumen de asistencias")
     
     def export_payments_report(self):
         """Exporta un informe de pagos a un archivo CSV (pendiente para implementación futura)"""
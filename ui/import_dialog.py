@@ -0,0 +1,77 @@
+from PyQt6.QtWidgets import QFileDialog, QProgressDialog, QMessageBox
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from models.member_import import ImportJob
+
+
+def start_import(parent, gym_id, default_plan_id, on_imported=None):
+    """Pide el archivo CSV y lanza la importación de socios en segundo plano"""
+    file_path, _ = QFileDialog.getOpenFileName(parent, "Importar Socios", "", "CSV Files (*.csv)")
+
+    if not file_path:
+        return None
+
+    dialog = ImportProgressDialog(parent, file_path, gym_id, default_plan_id, on_imported)
+    # Mantener una referencia mientras dura la importación
+    parent._import_dialog = dialog
+    dialog.start()
+    return dialog
+
+
+class ImportProgressDialog(QProgressDialog):
+    """Muestra el avance de una importación que corre fuera del hilo de la interfaz"""
+    progress_changed = pyqtSignal(int, int)
+    import_finished = pyqtSignal(object)
+    import_cancelled = pyqtSignal()
+    import_failed = pyqtSignal(str)
+
+    def __init__(self, parent, path, gym_id, default_plan_id, on_imported=None):
+        # Sin máximo: el archivo se lee a medida que se importa
+        super().__init__("Importando...", "Cancelar", 0, 0, parent)
+        self.setWindowTitle("Importar Socios")
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+        self.setMinimumDuration(300)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+
+        self.on_imported = on_imported
+
+        self.progress_changed.connect(self.update_progress)
+        self.import_finished.connect(self.on_finished)
+        self.import_cancelled.connect(self.on_cancelled)
+        self.import_failed.connect(self.on_failed)
+
+        self.job = ImportJob(path, gym_id, default_plan_id,
+                             on_progress=self.progress_changed.emit,
+                             on_finished=self.import_finished.emit,
+                             on_cancelled=self.import_cancelled.emit,
+                             on_error=lambda e: self.import_failed.emit(str(e)))
+        self.canceled.connect(self.job.cancel)
+
+    def start(self):
+        """Inicia la importación"""
+        self.job.start()
+
+    def update_progress(self, imported, rejected):
+        self.setLabelText(f"{imported} socios importados, {rejected} rechazados")
+
+    def on_finished(self, summary):
+        self.close()
+        message = f"Se importaron {summary['importados']} socios."
+        if summary["rechazos"]:
+            message += (f"\n{summary['rechazados']} filas rechazadas; el detalle está en "
+                        f"{summary['rechazos']}")
+        QMessageBox.information(self.parent(), "Importación Finalizada", message)
+        if self.on_imported is not None:
+            self.on_imported()
+
+    def on_cancelled(self):
+        self.close()
+        QMessageBox.information(self.parent(), "Importación Cancelada",
+                                "La importación fue cancelada. Los socios ya importados se conservan.")
+        if self.on_imported is not None:
+            self.on_imported()
+
+    def on_failed(self, error):
+        self.close()
+        QMessageBox.critical(self.parent(), "Error", f"Error al importar socios: {error}")
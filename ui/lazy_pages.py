@@ -0,0 +1,68 @@
+from importlib import import_module
+
+from PyQt6.QtWidgets import QStackedWidget, QWidget
+from PyQt6.QtCore import QObject, QEvent, QTimer, pyqtSignal
+
+from utils.startup import mark
+
+
+class _FirstPaintProbe(QObject):
+    """Registra un hito de inicio cuando el widget termina de pintarse por primera vez"""
+    def __init__(self, widget, name):
+        super().__init__(widget)
+        self.name = name
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            # El hito se toma al volver al bucle de eventos, con el cuadro ya pintado
+            QTimer.singleShot(0, lambda: mark(self.name))
+        return False
+
+
+def mark_on_first_paint(widget, name):
+    """Registra el hito name de utils.startup cuando el widget se pinta por primera vez"""
+    return _FirstPaintProbe(widget, name)
+
+
+class LazyPageStack(QStackedWidget):
+    """Páginas apiladas que se importan y construyen recién al mostrarlas.
+
+    Cada página se declara con el módulo y la clase que la implementan; hasta
+    que se navega a ella ocupa su lugar un widget vacío, así el módulo no se
+    importa ni se ejecutan sus consultas al abrir la ventana.
+    """
+    page_created = pyqtSignal(int, QWidget)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._factories = []
+        self._pages = []
+
+    def add_page(self, module_name, class_name, *args):
+        """Declara una página; se construye con class_name(*args) al mostrarla"""
+        self._factories.append((module_name, class_name, args))
+        self._pages.append(None)
+        return self.addWidget(QWidget())
+
+    def page(self, index):
+        """Devuelve la página ya construida, o None si todavía no se mostró"""
+        return self._pages[index]
+
+    def show_page(self, index):
+        """Muestra una página, construyéndola si es la primera vez"""
+        if self._pages[index] is None:
+            module_name, class_name, args = self._factories[index]
+            page = getattr(import_module(module_name), class_name)(*args)
+
+            placeholder = self.widget(index)
+            self.insertWidget(index, page)
+            self.removeWidget(placeholder)
+            placeholder.deleteLater()
+
+            self._pages[index] = page
+            self.page_created.emit(index, page)
+
+        self.setCurrentIndex(index)
+        return self._pages[index]
@@ -1,14 +1,18 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QLabel, 
                            QLineEdit, QCheckBox, QPushButton)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 
 from config.constants import (BG_COLOR, TEXT_PRIMARY, TEXT_SECONDARY, 
                             PRIMARY_COLOR, BORDER_COLOR, DANGER_COLOR,
                             BUTTON_STYLE, INPUT_STYLE)
 from models.user import UserModel
-from config.database import init_admin_database
+from ui.workers import TaskRunner
+from utils.migrations import migrate_admin_database
 
 class LoginWindow(QWidget):
+    # Datos de la sesión iniciada: user_id, user_type, gym_name
+    logged_in = pyqtSignal(dict)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("FIT APP - Iniciar Sesión")
@@ -46,9 +50,9 @@ class LoginWindow(QWidget):
             }}
         """)
         
+        self.tasks = TaskRunner(self)
         self.setup_ui()
-        init_admin_database()
-        self.user_model = UserModel()
+        migrate_admin_database()
         
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -98,11 +102,14 @@ class LoginWindow(QWidget):
         layout.addSpacing(10)
         
         # Login button
-        login_button = QPushButton("Iniciar Sesión")
-        login_button.setStyleSheet(BUTTON_STYLE)
-        login_button.setFixedHeight(45)
-        login_button.clicked.connect(self.authenticate)
-        layout.addWidget(login_button)
+        self.login_button = QPushButton("Iniciar Sesión")
+        self.login_button.setStyleSheet(BUTTON_STYLE)
+        self.login_button.setFixedHeight(45)
+        self.login_button.clicked.connect(self.authenticate)
+        layout.addWidget(self.login_button)
+        
+        # Enter en la contraseña también inicia sesión
+        self.password_input.returnPressed.connect(self.authenticate)
         
         # Info about default admin account
         info_label = QLabel("Admin por defecto: usuario=admin, contraseña=admin123")
@@ -126,8 +133,27 @@ class LoginWindow(QWidget):
             self.error_label.setText("Ingrese usuario y contraseña")
             return
         
-        # Verificar credenciales
-        success, result = self.user_model.check_credentials(username, password)
+        if not self.login_button.isEnabled():
+            return  # Ya hay una verificación en curso
+        
+        # La verificación tarda a propósito (KDF calibrado): se hace en segundo plano
+        self.login_button.setEnabled(False)
+        self.error_label.setText("")
+        self.login_button.setText("Verificando...")
+        self.tasks.call("login", UserModel, "check_credentials", username, password,
+                        on_result=self.on_credentials_checked, on_error=self.on_credentials_error)
+    
+    def on_credentials_error(self, error):
+        """Informa un error inesperado al verificar las credenciales"""
+        self.login_button.setEnabled(True)
+        self.login_button.setText("Iniciar Sesión")
+        self.error_label.setText(f"Error al iniciar sesión: {str(error)}")
+    
+    def on_credentials_checked(self, outcome):
+        """Completa el inicio de sesión con el resultado de la verificación"""
+        success, result = outcome
+        self.login_button.setEnabled(True)
+        self.login_button.setText("Iniciar Sesión")
         
         if success:
             # Guardar los datos de la sesión
@@ -137,16 +163,30 @@ class LoginWindow(QWidget):
             if "license_expiry" in result:
                 self.license_expiry = result["license_expiry"]
             
+            # El panel se abre antes de cerrar el login para que la aplicación no termine
+            self.logged_in.emit(result)
             self.accept()
         else:
             self.error_label.setText(result)
             
+    def reset(self):
+        """Deja la ventana lista para otro inicio de sesión, sin datos del usuario anterior"""
+        self.accepted = False
+        for attr in ("user_id", "user_type", "gym_name", "license_expiry"):
+            if hasattr(self, attr):
+                delattr(self, attr)
+        
+        self.password_input.clear()
+        if not self.remember_checkbox.isChecked():
+            self.username_input.clear()
+        self.error_label.setText("")
+        self.login_button.setEnabled(True)
+        self.login_button.setText("Iniciar Sesión")
+        (self.password_input if self.username_input.text() else self.username_input).setFocus()
+    
     def accept(self):
         self.accepted = True
         self.close()
         
     def closeEvent(self, event):
-        # Cerrar conexión a la base de datos
-        if hasattr(self, 'user_model'):
-            self.user_model.close()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,65 @@
+from PyQt6.QtCore import QObject, Qt
+
+from ui.lazy_pages import mark_on_first_paint
+from ui.login import LoginWindow
+from utils import startup
+
+
+class SessionManager(QObject):
+    """Alterna login y panel dentro del mismo proceso.
+
+    La aplicación Qt, el pool de conexiones, los cachés de solo lectura y la
+    ventana de login se conservan entre sesiones. Lo propio de cada usuario
+    (el panel con sus pestañas, tareas y temporizadores) se destruye al cerrar
+    sesión. Cerrar la ventana de login o el panel sin cerrar sesión termina
+    la aplicación.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.login_window = None
+        self.window = None
+        self.session = None
+
+    def start(self):
+        """Muestra la ventana de login"""
+        self.show_login()
+
+    def show_login(self):
+        """Muestra la ventana de login, creándola la primera vez"""
+        if self.login_window is None:
+            self.login_window = LoginWindow()
+            self.login_window.logged_in.connect(self.open_dashboard)
+            mark_on_first_paint(self.login_window, startup.LOGIN_WINDOW)
+        else:
+            self.login_window.reset()
+        self.login_window.show()
+
+    def open_dashboard(self, session):
+        """Abre el panel que corresponde al usuario que inició sesión"""
+        startup.start(startup.FIRST_TAB)
+        self.session = session
+
+        # Los paneles se importan recién aquí para no demorar la ventana de login
+        if session["user_type"] == "admin":
+            from ui.admin.dashboard import AdminDashboard
+            window = AdminDashboard(session["user_id"])
+        else:  # gimnasio
+            from ui.gym.dashboard import GymApp
+            window = GymApp(session["user_id"], session["user_type"], session["gym_name"])
+
+        # Al cerrarse se liberan sus pestañas, tareas y temporizadores
+        window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        window.logged_out.connect(self.end_session)
+        window.destroyed.connect(self.forget_window)
+        window.show()
+        self.window = window
+
+    def end_session(self):
+        """Vuelve al login; el panel se cierra a continuación"""
+        self.session = None
+        # Mostrar el login antes de que se cierre el panel evita que Qt
+        # termine la aplicación al quedarse sin ventanas
+        self.show_login()
+
+    def forget_window(self):
+        self.window = None
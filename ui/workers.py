@@ -0,0 +1,136 @@
+import itertools
+import sys
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Hilos dedicados a las consultas de los modelos. No expiran, así cada hilo
+# conserva su conexión del pool en lugar de abrir una nueva en cada tarea.
+MAX_WORKERS = 4
+
+_pool = None
+
+
+def get_thread_pool():
+    """Devuelve el pool de hilos compartido para las llamadas a los modelos"""
+    global _pool
+    if _pool is None:
+        _pool = QThreadPool()
+        _pool.setMaxThreadCount(MAX_WORKERS)
+        _pool.setExpiryTimeout(-1)
+    return _pool
+
+
+def shutdown_workers(timeout_ms=5000):
+    """Espera a que terminen las tareas en curso y las encoladas (al salir de la aplicación).
+
+    No se vacía la cola: entre las tareas pendientes puede haber escrituras.
+    """
+    if _pool is not None:
+        _pool.waitForDone(timeout_ms)
+
+
+class _ModelTask(QRunnable):
+    """Crea el modelo dentro del hilo del pool y ejecuta uno de sus métodos"""
+    def __init__(self, runner, key, generation, model_cls, method, args, kwargs):
+        super().__init__()
+        self.runner = runner
+        self.key = key
+        self.generation = generation
+        self.model_cls = model_cls
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        # El modelo se crea aquí para que use la conexión de este hilo
+        try:
+            model = self.model_cls()
+            try:
+                result = getattr(model, self.method)(*self.args, **self.kwargs)
+            finally:
+                model.close()
+        except Exception as e:
+            signal, payload = self.runner.task_failed, e
+        else:
+            signal, payload = self.runner.task_finished, result
+
+        try:
+            signal.emit(self.key, self.generation, payload)
+        except RuntimeError:
+            # La pestaña que pidió la tarea ya fue destruida
+            pass
+
+
+class TaskRunner(QObject):
+    """Ejecuta métodos de los modelos fuera del hilo de la interfaz.
+
+    Los resultados llegan por señales al hilo de la interfaz, donde se llaman
+    `on_result` u `on_error`. Las llamadas con la misma clave se agrupan: una
+    llamada nueva descarta la anterior si todavía no empezó y, si ya empezó,
+    ignora su resultado. Las llamadas sin clave (escrituras) nunca se descartan.
+    """
+    task_finished = pyqtSignal(object, int, object)
+    task_failed = pyqtSignal(object, int, object)
+
+    _generation = itertools.count(1)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or get_thread_pool()
+        # Última generación pedida por clave y callbacks de cada una
+        self._latest = {}
+        self._tasks = {}
+
+        self.task_finished.connect(self._on_finished)
+        self.task_failed.connect(self._on_failed)
+
+    def call(self, key, model_cls, method, *args, on_result=None, on_error=None, **kwargs):
+        """Ejecuta `model_cls().method(*args, **kwargs)` en el pool de hilos.
+
+        Con `key=None` la llamada es independiente de las demás.
+        """
+        generation = next(self._generation)
+        if key is None:
+            key = ("anonima", generation)
+        else:
+            # Sacar de la cola la llamada anterior con la misma clave
+            previous = self._latest.get(key)
+            if previous is not None and self.pool.tryTake(self._tasks[previous][0]):
+                del self._tasks[previous]
+
+        task = _ModelTask(self, key, generation, model_cls, method, args, kwargs)
+        task.setAutoDelete(False)
+        # La referencia se conserva hasta recibir el resultado
+        self._tasks[generation] = (task, on_result, on_error)
+        self._latest[key] = generation
+        self.pool.start(task)
+        return generation
+
+    def is_busy(self, key):
+        """Indica si hay una llamada pendiente con la clave dada"""
+        return key in self._latest
+
+    def _take(self, key, generation):
+        """Devuelve los callbacks de la llamada si sigue siendo la última con esa clave"""
+        pending = self._tasks.pop(generation, None)
+        if pending is None or self._latest.get(key) != generation:
+            # Resultado de una llamada reemplazada por otra más nueva
+            return None
+        del self._latest[key]
+        return pending
+
+    def _on_finished(self, key, generation, result):
+        pending = self._take(key, generation)
+        if pending is not None and pending[1] is not None:
+            pending[1](result)
+
+    def _on_failed(self, key, generation, error):
+        pending = self._take(key, generation)
+        if pending is None:
+            return
+        if pending[2] is not None:
+            pending[2](error)
+        else:
+            # Una excepción sin capturar en un slot aborta el proceso con PyQt6:
+            # sin on_error sólo se informa el error y se descarta el resultado
+            sys.excepthook(type(error), error, error.__traceback__)
@@ -1,14 +1,124 @@
+import base64
 import hashlib
+import hmac
+import os
+import threading
+import time
 
-def hash_password(password):
-    """Crea un hash seguro de la contraseña con salt."""
-    salt = "fitapp2025"  # Este salt debería ser único por usuario en un sistema real
-    salted = password + salt
-    return hashlib.sha256(salted.encode()).hexdigest()
+# Formato de los hashes: pbkdf2_sha256$<iteraciones>$<salt base64>$<hash base64>
+ALGORITHM = "pbkdf2_sha256"
+
+# Tiempo objetivo (ms) de una verificación en esta máquina
+KDF_TARGET_MS = 250
+
+# Nunca se usan menos iteraciones que estas, aunque la máquina sea lenta
+MIN_ITERATIONS = 100_000
+
+# Iteraciones de la medición inicial con la que se calibra el costo
+_PROBE_ITERATIONS = 20_000
+
+# Un hash se regenera al iniciar sesión si usa menos de esta fracción del costo actual
+REHASH_THRESHOLD = 0.8
+
+SALT_BYTES = 16
+
+# Salt fijo de los hashes SHA-256 anteriores, sólo para poder verificarlos
+_LEGACY_SALT = "fitapp2025"
+
+_calibrated_iterations = None
+_calibration_lock = threading.Lock()
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+def measure_kdf(iterations, password="calibracion"):
+    """Devuelve los milisegundos que tarda una derivación con las iteraciones dadas"""
+    salt = os.urandom(SALT_BYTES)
+    start = time.perf_counter()
+    _pbkdf2(password, salt, iterations)
+    return (time.perf_counter() - start) * 1000
+
+
+def calibrate_iterations(target_ms=KDF_TARGET_MS):
+    """Calcula cuántas iteraciones tardan aproximadamente target_ms en esta máquina"""
+    # La mejor de tres mediciones descarta el ruido del arranque
+    elapsed = min(measure_kdf(_PROBE_ITERATIONS) for _ in range(3))
+    iterations = int(_PROBE_ITERATIONS * target_ms / max(elapsed, 0.001))
+    # Redondear para que recalibrar no genere valores distintos por ruido
+    iterations = round(iterations, -4)
+    return max(iterations, MIN_ITERATIONS)
+
+
+def get_iterations():
+    """Iteraciones para los hashes nuevos, calibradas una vez por ejecución"""
+    global _calibrated_iterations
+    with _calibration_lock:
+        if _calibrated_iterations is None:
+            _calibrated_iterations = calibrate_iterations()
+        return _calibrated_iterations
+
+
+def hash_password(password, iterations=None):
+    """Crea un hash de la contraseña con salt propio y PBKDF2-SHA256 de costo calibrado."""
+    iterations = iterations or get_iterations()
+    salt = os.urandom(SALT_BYTES)
+    digest = _pbkdf2(password, salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def _is_legacy(stored_password):
+    return "$" not in stored_password
 
 
 def verify_password(input_password, stored_password):
-    """Verifica si la contraseña ingresada coincide con la almacenada."""
-    salt = "fitapp2025"  # Debe ser el mismo salt usado para crear el hash
-    input_hash = hashlib.sha256((input_password + salt).encode()).hexdigest()
-    return input_hash == stored_password
\ No newline at end of file
+    """Verifica si la contraseña ingresada coincide con la almacenada (formato actual o SHA-256 anterior)."""
+    if not stored_password:
+        return False
+
+    if _is_legacy(stored_password):
+        legacy_hash = hashlib.sha256((input_password + _LEGACY_SALT).encode()).hexdigest()
+        return hmac.compare_digest(legacy_hash, stored_password)
+
+    try:
+        algorithm, iterations, salt, digest = stored_password.split("$")
+        if algorithm != ALGORITHM:
+            return False
+        expected = _b64decode(digest)
+        actual = _pbkdf2(input_password, _b64decode(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
+
+
+def needs_rehash(stored_password):
+    """Indica si el hash es del formato anterior o quedó por debajo del costo actual"""
+    if _is_legacy(stored_password):
+        return True
+    try:
+        algorithm, iterations, _, _ = stored_password.split("$")
+        return algorithm != ALGORITHM or int(iterations) < get_iterations() * REHASH_THRESHOLD
+    except ValueError:
+        return True
+
+
+# Hash de referencia para que un usuario inexistente tarde lo mismo que uno real
+_dummy_hash = None
+
+
+def dummy_verify(password):
+    """Realiza una verificación descartable con el costo actual"""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("usuario-inexistente")
+    verify_password(password, _dummy_hash)
+    return False
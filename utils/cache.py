@@ -0,0 +1,68 @@
+import threading
+import time
+
+
+class TTLCache:
+    """Caché en memoria cuyas entradas vencen después de `ttl` segundos.
+
+    Es segura entre hilos: los modelos que la usan se crean tanto en el hilo
+    de la interfaz como en los hilos del pool de tareas.
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, loader, max_age=None):
+        """Devuelve el valor guardado si tiene menos de `max_age` (o ttl) segundos; si no, lo recalcula con loader()"""
+        max_age = self.ttl if max_age is None else max_age
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < max_age:
+                return entry[1]
+
+        # La carga se hace fuera del lock para no bloquear a otros hilos
+        value = loader()
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self, key=None):
+        """Descarta una entrada, o todas si no se indica la clave"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class VersionedCache:
+    """Caché en memoria cuyas entradas valen mientras no cambie su versión.
+
+    La versión la calcula el llamador (por ejemplo, un contador mantenido por
+    triggers), así una consulta barata decide si hay que recalcular.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, version, loader):
+        """Devuelve el valor guardado para la clave si se calculó con la misma versión; si no, llama a loader()"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (version, value)
+        return value
+
+    def invalidate(self, key=None):
+        """Descarta una entrada, o todas si no se indica la clave"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,103 @@
+import sqlite3
+import threading
+
+from utils.tracing import TracingConnection
+
+# Archivos de base de datos de la aplicación
+GYM_DB = "gym.db"
+ADMIN_DB = "fitapp.db"
+
+# Asistencias detalladas que superaron el período de retención de gym.db
+ARCHIVE_DB = "gym_archivo.db"
+ARCHIVE_SCHEMA = "archivo"
+
+# Conexión unificada: fitapp.db como base principal con gym.db adjunta como
+# esquema "gym", para consultas que cruzan gimnasios, licencias y socios
+UNIFIED_DB = "unificada"
+GYM_SCHEMA = "gym"
+
+# Tiempo máximo (ms) que una conexión espera a que se libere un bloqueo
+BUSY_TIMEOUT_MS = 5000
+
+# PRAGMAs que se aplican a toda conexión nueva
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA temp_store = MEMORY",
+)
+
+_local = threading.local()
+_lock = threading.Lock()
+_all_connections = []
+
+
+def _open_connection(db_path):
+    """Abre una conexión nueva y le aplica la configuración común"""
+    if db_path == UNIFIED_DB:
+        return _open_unified_connection()
+
+    # TracingConnection sólo mide cuando las trazas están activas (utils.tracing)
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000, factory=TracingConnection)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _open_unified_connection():
+    """Abre fitapp.db y adjunta gym.db; las tablas se califican como main.* y gym.*"""
+    conn = _open_connection(ADMIN_DB)
+    conn.execute(f"ATTACH DATABASE ? AS {GYM_SCHEMA}", (GYM_DB,))
+    # journal_mode, synchronous y cache_size se configuran por esquema
+    conn.execute(f"PRAGMA {GYM_SCHEMA}.journal_mode = WAL")
+    conn.execute(f"PRAGMA {GYM_SCHEMA}.synchronous = NORMAL")
+    conn.execute(f"PRAGMA {GYM_SCHEMA}.cache_size = -8000")
+    return conn
+
+
+def get_connection(db_path):
+    """Devuelve la conexión del hilo actual para la base de datos indicada.
+
+    Cada hilo reutiliza una única conexión por archivo, de modo que todos los
+    modelos creados en el mismo hilo comparten la caché de páginas.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = _open_connection(db_path)
+        connections[db_path] = conn
+        with _lock:
+            _all_connections.append(conn)
+    return conn
+
+
+def close_thread_connections():
+    """Cierra las conexiones abiertas por el hilo actual"""
+    connections = getattr(_local, "connections", None)
+    if not connections:
+        return
+    with _lock:
+        for conn in connections.values():
+            if conn in _all_connections:
+                _all_connections.remove(conn)
+            conn.close()
+    connections.clear()
+
+
+def close_all_connections():
+    """Cierra todas las conexiones del pool (al salir de la aplicación)"""
+    with _lock:
+        for conn in _all_connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # La conexión pertenece a otro hilo que ya terminó
+                pass
+        _all_connections.clear()
+    connections = getattr(_local, "connections", None)
+    if connections:
+        connections.clear()
@@ -0,0 +1,152 @@
+import csv
+import gzip
+import json
+import os
+import threading
+
+from utils.connection import close_thread_connections
+
+# Filas que se leen de la base de datos en cada bloque
+CHUNK_SIZE = 1000
+
+
+class ExportCancelled(Exception):
+    """La exportación fue cancelada antes de terminar"""
+
+
+class CsvWriter:
+    """Escribe las filas como CSV con una fila de encabezados"""
+    def __init__(self, file, headers):
+        self._writer = csv.writer(file)
+        self._writer.writerow(headers)
+
+    def write_rows(self, rows):
+        self._writer.writerows(rows)
+
+
+class JsonLinesWriter:
+    """Escribe cada fila como un objeto JSON por línea usando los encabezados como claves"""
+    def __init__(self, file, headers):
+        self._file = file
+        self._headers = headers
+
+    def write_rows(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(dict(zip(self._headers, row)), ensure_ascii=False, default=str))
+            self._file.write("\n")
+
+
+# Formatos disponibles: extensión -> (clase escritora, comprimido con gzip)
+FORMATS = {
+    "csv": (CsvWriter, False),
+    "csv.gz": (CsvWriter, True),
+    "jsonl": (JsonLinesWriter, False),
+    "jsonl.gz": (JsonLinesWriter, True),
+}
+
+
+def format_for_path(path):
+    """Deduce el formato de exportación a partir de la extensión del archivo"""
+    lower = path.lower()
+    for fmt in sorted(FORMATS, key=len, reverse=True):
+        if lower.endswith("." + fmt):
+            return fmt
+    return "csv"
+
+
+def open_output(path, compress):
+    """Abre el archivo de salida en modo texto, comprimido si corresponde"""
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def export_rows(cursor, headers, path, fmt=None, transform=None, chunk_size=CHUNK_SIZE,
+                total=None, progress=None, cancel_event=None):
+    """Escribe las filas de un cursor en el archivo leyendo por bloques con fetchmany.
+
+    Devuelve la cantidad de filas escritas. Si se cancela o falla, borra el
+    archivo parcial y vuelve a lanzar la excepción.
+    """
+    writer_class, compress = FORMATS[fmt or format_for_path(path)]
+    written = 0
+
+    try:
+        with open_output(path, compress) as file:
+            writer = writer_class(file, headers)
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if transform is not None:
+                    rows = [transform(row) for row in rows]
+
+                writer.write_rows(rows)
+                written += len(rows)
+                if progress is not None:
+                    progress(written, total)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    finally:
+        cursor.close()
+
+    return written
+
+
+class ExportJob:
+    """Ejecuta una exportación en un hilo aparte para no bloquear la interfaz.
+
+    `query` se invoca dentro del hilo y debe devolver un cursor ya ejecutado,
+    de modo que la consulta use la conexión propia de ese hilo. Los callbacks
+    también se invocan desde el hilo de exportación.
+    """
+    def __init__(self, query, headers, path, fmt=None, transform=None, total=None,
+                 on_progress=None, on_finished=None, on_cancelled=None, on_error=None):
+        self.query = query
+        self.headers = headers
+        self.path = path
+        self.fmt = fmt
+        self.transform = transform
+        self.total = total
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.on_cancelled = on_cancelled
+        self.on_error = on_error
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Inicia la exportación en segundo plano"""
+        self._thread = threading.Thread(target=self._run, name="export", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Pide que la exportación se detenga en el próximo bloque"""
+        self._cancel_event.set()
+
+    def wait(self, timeout=None):
+        """Espera a que termine el hilo de exportación"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            written = export_rows(self.query(), self.headers, self.path, self.fmt, self.transform,
+                                  total=self.total, progress=self.on_progress,
+                                  cancel_event=self._cancel_event)
+        except ExportCancelled:
+            if self.on_cancelled is not None:
+                self.on_cancelled()
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(e)
+        else:
+            if self.on_finished is not None:
+                self.on_finished(written)
+        finally:
+            close_thread_connections()
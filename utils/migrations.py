@@ -0,0 +1,425 @@
+import sqlite3
+from datetime import datetime
+
+from config.database import init_gym_database, init_admin_database
+from utils.connection import get_connection, GYM_DB, ADMIN_DB
+
+# Tabla de estadísticas mantenida por triggers: cantidad de socios por estado
+# de cuota y asistencias por día, ambas por gimnasio
+_STATS_TABLE = """CREATE TABLE IF NOT EXISTS stats (
+            grupo TEXT NOT NULL,
+            gimnasio_id INTEGER NOT NULL,
+            clave TEXT NOT NULL,
+            valor REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (grupo, gimnasio_id, clave)
+        ) WITHOUT ROWID"""
+
+_GYM_STATS = [
+    _STATS_TABLE,
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_socios_insert
+        AFTER INSERT ON socios WHEN NEW.gimnasio_id IS NOT NULL
+        BEGIN
+            INSERT INTO stats (grupo, gimnasio_id, clave, valor)
+            VALUES ('socios', NEW.gimnasio_id, NEW.estado_cuota, 1)
+            ON CONFLICT (grupo, gimnasio_id, clave) DO UPDATE SET valor = valor + 1;
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_socios_delete
+        AFTER DELETE ON socios WHEN OLD.gimnasio_id IS NOT NULL
+        BEGIN
+            UPDATE stats SET valor = valor - 1
+            WHERE grupo = 'socios' AND gimnasio_id = OLD.gimnasio_id AND clave = OLD.estado_cuota;
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_socios_update
+        AFTER UPDATE OF estado_cuota, gimnasio_id ON socios
+        WHEN OLD.estado_cuota IS NOT NEW.estado_cuota OR OLD.gimnasio_id IS NOT NEW.gimnasio_id
+        BEGIN
+            UPDATE stats SET valor = valor - 1
+            WHERE grupo = 'socios' AND gimnasio_id = OLD.gimnasio_id AND clave = OLD.estado_cuota;
+            INSERT INTO stats (grupo, gimnasio_id, clave, valor)
+            SELECT 'socios', NEW.gimnasio_id, NEW.estado_cuota, 1 WHERE NEW.gimnasio_id IS NOT NULL
+            ON CONFLICT (grupo, gimnasio_id, clave) DO UPDATE SET valor = valor + 1;
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_asistencias_insert
+        AFTER INSERT ON asistencias
+        BEGIN
+            INSERT INTO stats (grupo, gimnasio_id, clave, valor)
+            SELECT 'asistencias', s.gimnasio_id, substr(NEW.fecha, 1, 10), 1
+            FROM socios s WHERE s.id = NEW.socio_id AND s.gimnasio_id IS NOT NULL
+            ON CONFLICT (grupo, gimnasio_id, clave) DO UPDATE SET valor = valor + 1;
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_asistencias_delete
+        AFTER DELETE ON asistencias
+        BEGIN
+            UPDATE stats SET valor = valor - 1
+            WHERE grupo = 'asistencias' AND clave = substr(OLD.fecha, 1, 10)
+              AND gimnasio_id = (SELECT gimnasio_id FROM socios WHERE id = OLD.socio_id);
+        END""",
+    # Carga inicial con los datos existentes
+    """INSERT OR REPLACE INTO stats (grupo, gimnasio_id, clave, valor)
+        SELECT 'socios', gimnasio_id, estado_cuota, COUNT(*)
+        FROM socios WHERE gimnasio_id IS NOT NULL
+        GROUP BY gimnasio_id, estado_cuota""",
+    """INSERT OR REPLACE INTO stats (grupo, gimnasio_id, clave, valor)
+        SELECT 'asistencias', s.gimnasio_id, substr(a.fecha, 1, 10), COUNT(*)
+        FROM asistencias a JOIN socios s ON a.socio_id = s.id
+        WHERE s.gimnasio_id IS NOT NULL
+        GROUP BY s.gimnasio_id, substr(a.fecha, 1, 10)""",
+]
+
+# Totales globales de fitapp.db (gimnasio_id = 0): gimnasios, licencias activas e ingresos
+_ADMIN_STATS = [
+    _STATS_TABLE,
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_usuarios_insert
+        AFTER INSERT ON usuarios
+        BEGIN
+            UPDATE stats SET valor = valor + (NEW.tipo IS 'gimnasio')
+            WHERE grupo = 'gimnasios' AND gimnasio_id = 0 AND clave = 'total';
+            UPDATE stats SET valor = valor + (NEW.tipo IS 'gimnasio' AND NEW.activo IS 1)
+            WHERE grupo = 'gimnasios' AND gimnasio_id = 0 AND clave = 'activos';
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_usuarios_delete
+        AFTER DELETE ON usuarios
+        BEGIN
+            UPDATE stats SET valor = valor - (OLD.tipo IS 'gimnasio')
+            WHERE grupo = 'gimnasios' AND gimnasio_id = 0 AND clave = 'total';
+            UPDATE stats SET valor = valor - (OLD.tipo IS 'gimnasio' AND OLD.activo IS 1)
+            WHERE grupo = 'gimnasios' AND gimnasio_id = 0 AND clave = 'activos';
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_usuarios_update
+        AFTER UPDATE OF tipo, activo ON usuarios
+        BEGIN
+            UPDATE stats SET valor = valor + (NEW.tipo IS 'gimnasio') - (OLD.tipo IS 'gimnasio')
+            WHERE grupo = 'gimnasios' AND gimnasio_id = 0 AND clave = 'total';
+            UPDATE stats SET valor = valor + (NEW.tipo IS 'gimnasio' AND NEW.activo IS 1)
+                                         - (OLD.tipo IS 'gimnasio' AND OLD.activo IS 1)
+            WHERE grupo = 'gimnasios' AND gimnasio_id = 0 AND clave = 'activos';
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_licencias_insert
+        AFTER INSERT ON licencias
+        BEGIN
+            UPDATE stats SET valor = valor + (NEW.activa IS 1)
+            WHERE grupo = 'licencias' AND gimnasio_id = 0 AND clave = 'activas';
+            UPDATE stats SET valor = valor + NEW.precio
+            WHERE grupo = 'licencias' AND gimnasio_id = 0 AND clave = 'ingresos';
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_licencias_delete
+        AFTER DELETE ON licencias
+        BEGIN
+            UPDATE stats SET valor = valor - (OLD.activa IS 1)
+            WHERE grupo = 'licencias' AND gimnasio_id = 0 AND clave = 'activas';
+            UPDATE stats SET valor = valor - OLD.precio
+            WHERE grupo = 'licencias' AND gimnasio_id = 0 AND clave = 'ingresos';
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_licencias_update
+        AFTER UPDATE OF activa, precio ON licencias
+        BEGIN
+            UPDATE stats SET valor = valor + (NEW.activa IS 1) - (OLD.activa IS 1)
+            WHERE grupo = 'licencias' AND gimnasio_id = 0 AND clave = 'activas';
+            UPDATE stats SET valor = valor + NEW.precio - OLD.precio
+            WHERE grupo = 'licencias' AND gimnasio_id = 0 AND clave = 'ingresos';
+        END""",
+    # Carga inicial: las filas globales deben existir para que los triggers las actualicen
+    """INSERT OR REPLACE INTO stats (grupo, gimnasio_id, clave, valor)
+        SELECT 'gimnasios', 0, 'total', COUNT(*) FROM usuarios WHERE tipo = 'gimnasio'""",
+    """INSERT OR REPLACE INTO stats (grupo, gimnasio_id, clave, valor)
+        SELECT 'gimnasios', 0, 'activos', COUNT(*) FROM usuarios WHERE tipo = 'gimnasio' AND activo = 1""",
+    """INSERT OR REPLACE INTO stats (grupo, gimnasio_id, clave, valor)
+        SELECT 'licencias', 0, 'activas', COUNT(*) FROM licencias WHERE activa = 1""",
+    """INSERT OR REPLACE INTO stats (grupo, gimnasio_id, clave, valor)
+        SELECT 'licencias', 0, 'ingresos', COALESCE(SUM(precio), 0) FROM licencias""",
+]
+
+# Resumen por socio y día de los meses cerrados. asistencias_cierre guarda hasta
+# qué fecha (exclusive) están resumidas y hasta cuál se movió el detalle a
+# gym_archivo.db; los triggers mantienen el resumen si llega una asistencia
+# atrasada y no descuentan estadísticas por las filas que se archivan.
+_ATTENDANCE_ROLLUP = [
+    """CREATE TABLE IF NOT EXISTS asistencias_diarias (
+            gimnasio_id INTEGER NOT NULL,
+            fecha TEXT NOT NULL,
+            socio_id INTEGER NOT NULL,
+            cantidad INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (gimnasio_id, fecha, socio_id)
+        ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_asistencias_diarias_socio ON asistencias_diarias (socio_id, fecha)",
+    # Los cierres recorren las asistencias por rangos de meses
+    "CREATE INDEX IF NOT EXISTS idx_asistencias_fecha ON asistencias (fecha)",
+    """CREATE TABLE IF NOT EXISTS asistencias_cierre (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            resumido_hasta TEXT NOT NULL,
+            archivado_hasta TEXT NOT NULL
+        )""",
+    "INSERT OR IGNORE INTO asistencias_cierre (id, resumido_hasta, archivado_hasta) VALUES (1, '', '')",
+    "DROP TRIGGER IF EXISTS trg_stats_asistencias_delete",
+    """CREATE TRIGGER trg_stats_asistencias_delete
+        AFTER DELETE ON asistencias
+        WHEN OLD.fecha >= (SELECT archivado_hasta FROM asistencias_cierre)
+        BEGIN
+            UPDATE stats SET valor = valor - 1
+            WHERE grupo = 'asistencias' AND clave = substr(OLD.fecha, 1, 10)
+              AND gimnasio_id = (SELECT gimnasio_id FROM socios WHERE id = OLD.socio_id);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_asistencias_diarias_insert
+        AFTER INSERT ON asistencias
+        WHEN NEW.fecha < (SELECT resumido_hasta FROM asistencias_cierre)
+        BEGIN
+            INSERT INTO asistencias_diarias (gimnasio_id, fecha, socio_id, cantidad)
+            SELECT s.gimnasio_id, substr(NEW.fecha, 1, 10), NEW.socio_id, 1
+            FROM socios s WHERE s.id = NEW.socio_id AND s.gimnasio_id IS NOT NULL
+            ON CONFLICT (gimnasio_id, fecha, socio_id) DO UPDATE SET cantidad = cantidad + 1;
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_asistencias_diarias_delete
+        AFTER DELETE ON asistencias
+        WHEN OLD.fecha < (SELECT resumido_hasta FROM asistencias_cierre)
+         AND OLD.fecha >= (SELECT archivado_hasta FROM asistencias_cierre)
+        BEGIN
+            UPDATE asistencias_diarias SET cantidad = cantidad - 1
+            WHERE socio_id = OLD.socio_id AND fecha = substr(OLD.fecha, 1, 10);
+        END""",
+    # Un resumen ya archivado es la única copia en gym.db de esas asistencias
+    """CREATE TRIGGER IF NOT EXISTS trg_stats_asistencias_diarias_delete
+        AFTER DELETE ON asistencias_diarias
+        WHEN OLD.fecha < (SELECT archivado_hasta FROM asistencias_cierre)
+        BEGIN
+            UPDATE stats SET valor = valor - OLD.cantidad
+            WHERE grupo = 'asistencias' AND gimnasio_id = OLD.gimnasio_id AND clave = OLD.fecha;
+        END""",
+    # Asistencias por socio y día: meses resumidos más el detalle de los abiertos
+    """CREATE VIEW IF NOT EXISTS asistencias_por_dia AS
+        SELECT gimnasio_id, fecha, socio_id, cantidad FROM asistencias_diarias
+        UNION ALL
+        SELECT s.gimnasio_id, substr(a.fecha, 1, 10), a.socio_id, COUNT(*)
+        FROM asistencias a JOIN socios s ON s.id = a.socio_id
+        WHERE a.fecha >= (SELECT resumido_hasta FROM asistencias_cierre) AND s.gimnasio_id IS NOT NULL
+        GROUP BY s.gimnasio_id, substr(a.fecha, 1, 10), a.socio_id""",
+]
+
+
+# Contadores de versión en stats (grupo 'versiones'): cambian con cada
+# modificación de los socios de un gimnasio o de los nombres de los planes,
+# para que las cachés sepan cuándo recalcular
+_DATA_VERSIONS = [
+    """CREATE TRIGGER IF NOT EXISTS trg_version_socios_insert
+        AFTER INSERT ON socios WHEN NEW.gimnasio_id IS NOT NULL
+        BEGIN
+            INSERT INTO stats (grupo, gimnasio_id, clave, valor)
+            VALUES ('versiones', NEW.gimnasio_id, 'socios', 1)
+            ON CONFLICT (grupo, gimnasio_id, clave) DO UPDATE SET valor = valor + 1;
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_version_socios_delete
+        AFTER DELETE ON socios WHEN OLD.gimnasio_id IS NOT NULL
+        BEGIN
+            INSERT INTO stats (grupo, gimnasio_id, clave, valor)
+            VALUES ('versiones', OLD.gimnasio_id, 'socios', 1)
+            ON CONFLICT (grupo, gimnasio_id, clave) DO UPDATE SET valor = valor + 1;
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_version_socios_update
+        AFTER UPDATE ON socios
+        BEGIN
+            INSERT INTO stats (grupo, gimnasio_id, clave, valor)
+            SELECT 'versiones', gimnasio_id, 'socios', 1
+            FROM (SELECT OLD.gimnasio_id AS gimnasio_id UNION SELECT NEW.gimnasio_id)
+            WHERE gimnasio_id IS NOT NULL
+            ON CONFLICT (grupo, gimnasio_id, clave) DO UPDATE SET valor = valor + 1;
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_version_planes_update
+        AFTER UPDATE OF nombre ON planes
+        BEGIN
+            INSERT INTO stats (grupo, gimnasio_id, clave, valor)
+            VALUES ('versiones', 0, 'planes', 1)
+            ON CONFLICT (grupo, gimnasio_id, clave) DO UPDATE SET valor = valor + 1;
+        END""",
+]
+
+
+# El contador de versión de planes cambia con cualquier alta, baja o
+# modificación, así también lo usa el catálogo de planes en memoria
+_PLAN_VERSIONS = [
+    "DROP TRIGGER IF EXISTS trg_version_planes_update",
+    *(f"""CREATE TRIGGER IF NOT EXISTS trg_version_planes_{event.lower()}
+        AFTER {event} ON planes
+        BEGIN
+            INSERT INTO stats (grupo, gimnasio_id, clave, valor)
+            VALUES ('versiones', 0, 'planes', 1)
+            ON CONFLICT (grupo, gimnasio_id, clave) DO UPDATE SET valor = valor + 1;
+        END""" for event in ("INSERT", "UPDATE", "DELETE")),
+]
+
+
+def fts5_available(conn):
+    """Indica si la biblioteca SQLite en uso fue compilada con FTS5"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_check USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp._fts5_check")
+    return True
+
+
+# Índice de texto completo de socios (contenido externo: el texto vive sólo en
+# socios). gimnasio_id se indexa para filtrar por gimnasio dentro de la búsqueda.
+_MEMBER_SEARCH = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS socios_fts USING fts5(
+            nombre, apellido, dni, telefono, gimnasio_id,
+            content = 'socios', content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )""",
+    """CREATE TRIGGER IF NOT EXISTS trg_socios_fts_insert
+        AFTER INSERT ON socios
+        BEGIN
+            INSERT INTO socios_fts (rowid, nombre, apellido, dni, telefono, gimnasio_id)
+            VALUES (NEW.id, NEW.nombre, NEW.apellido, NEW.dni, NEW.telefono, NEW.gimnasio_id);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_socios_fts_delete
+        AFTER DELETE ON socios
+        BEGIN
+            INSERT INTO socios_fts (socios_fts, rowid, nombre, apellido, dni, telefono, gimnasio_id)
+            VALUES ('delete', OLD.id, OLD.nombre, OLD.apellido, OLD.dni, OLD.telefono, OLD.gimnasio_id);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_socios_fts_update
+        AFTER UPDATE OF nombre, apellido, dni, telefono, gimnasio_id ON socios
+        BEGIN
+            INSERT INTO socios_fts (socios_fts, rowid, nombre, apellido, dni, telefono, gimnasio_id)
+            VALUES ('delete', OLD.id, OLD.nombre, OLD.apellido, OLD.dni, OLD.telefono, OLD.gimnasio_id);
+            INSERT INTO socios_fts (rowid, nombre, apellido, dni, telefono, gimnasio_id)
+            VALUES (NEW.id, NEW.nombre, NEW.apellido, NEW.dni, NEW.telefono, NEW.gimnasio_id);
+        END""",
+    # Indexar los socios existentes
+    "INSERT INTO socios_fts (socios_fts) VALUES ('rebuild')",
+]
+
+
+def _create_member_search(conn):
+    """Crea el índice de búsqueda de socios si SQLite tiene FTS5; si no, la búsqueda usa LIKE"""
+    if not fts5_available(conn):
+        return
+    for statement in _MEMBER_SEARCH:
+        conn.execute(statement)
+
+
+# Migraciones numeradas por base de datos: (versión, descripción, pasos). Cada
+# paso es una sentencia SQL o una función que recibe la conexión.
+# Las versiones nunca se reutilizan ni se modifican una vez publicadas.
+GYM_MIGRATIONS = [
+    (1, "Índices de asistencias y socios", [
+        "CREATE INDEX IF NOT EXISTS idx_asistencias_socio_fecha ON asistencias (socio_id, fecha)",
+        "CREATE INDEX IF NOT EXISTS idx_socios_gimnasio ON socios (gimnasio_id)",
+        "CREATE INDEX IF NOT EXISTS idx_socios_vencimiento ON socios (fecha_vencimiento)",
+    ]),
+    (2, "Registro de lotes del diario de asistencias", [
+        """CREATE TABLE IF NOT EXISTS asistencias_lotes (
+            lote TEXT PRIMARY KEY,
+            filas INTEGER NOT NULL,
+            fecha_aplicacion TEXT NOT NULL
+        )""",
+    ]),
+    (3, "Estadísticas mantenidas por triggers", _GYM_STATS),
+    (4, "Índice de búsqueda de socios (FTS5)", [_create_member_search]),
+    (5, "Resumen diario y archivo de asistencias", _ATTENDANCE_ROLLUP),
+    (6, "Registro del vencimiento automático de cuotas", [
+        """CREATE TABLE IF NOT EXISTS cuotas_vencidas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            socio_id INTEGER NOT NULL,
+            gimnasio_id INTEGER,
+            fecha_vencimiento TEXT NOT NULL,
+            fecha_proceso TEXT NOT NULL
+        )""",
+        # Sólo los socios al día: el barrido recorre los que vencen, no todo el historial
+        """CREATE INDEX IF NOT EXISTS idx_socios_vencimiento_pagada
+            ON socios (fecha_vencimiento) WHERE estado_cuota = 'Pagada'""",
+    ]),
+    (7, "Lista de vencimientos próximos por gimnasio", [
+        """CREATE INDEX IF NOT EXISTS idx_socios_gimnasio_vencimiento_pagada
+            ON socios (gimnasio_id, fecha_vencimiento) WHERE estado_cuota = 'Pagada'""",
+        *_DATA_VERSIONS,
+    ]),
+    (8, "Versión del catálogo de planes", _PLAN_VERSIONS),
+]
+
+ADMIN_MIGRATIONS = [
+    (1, "Índice de licencias por usuario", [
+        "CREATE INDEX IF NOT EXISTS idx_licencias_usuario_activa ON licencias (usuario_id, activa)",
+    ]),
+    (2, "Estadísticas mantenidas por triggers", _ADMIN_STATS),
+    # El vencimiento en el índice permite resolver la licencia vigente de un
+    # usuario al iniciar sesión sin leer la tabla
+    (3, "Índice de licencias con vencimiento", [
+        "CREATE INDEX IF NOT EXISTS idx_licencias_usuario_activa_vencimiento ON licencias (usuario_id, activa, fecha_vencimiento)",
+        "DROP INDEX IF EXISTS idx_licencias_usuario_activa",
+    ]),
+]
+
+MIGRATIONS = {
+    GYM_DB: GYM_MIGRATIONS,
+    ADMIN_DB: ADMIN_MIGRATIONS,
+}
+
+
+def get_schema_version(conn):
+    """Devuelve la última versión de esquema aplicada (0 si no hay ninguna)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            descripcion TEXT NOT NULL,
+            fecha_aplicacion TEXT NOT NULL
+        )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def run_migrations(db_path, migrations=None):
+    """Aplica en orden las migraciones pendientes y devuelve las versiones aplicadas.
+
+    Cada migración se ejecuta en su propia transacción junto con el registro
+    en schema_version, por lo que volver a ejecutar el proceso no tiene efecto.
+    """
+    if migrations is None:
+        migrations = MIGRATIONS[db_path]
+
+    conn = get_connection(db_path)
+    current_version = get_schema_version(conn)
+    applied = []
+
+    for version, descripcion, statements in migrations:
+        if version <= current_version:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Otro proceso pudo aplicarla mientras esperábamos el bloqueo
+            if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone():
+                conn.rollback()
+                continue
+
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+
+            fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            conn.execute("""
+                INSERT INTO schema_version (version, descripcion, fecha_aplicacion)
+                VALUES (?, ?, ?)
+            """, (version, descripcion, fecha))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        applied.append(version)
+
+    return applied
+
+
+def migrate_gym_database():
+    """Crea las tablas de gym.db y aplica sus migraciones pendientes"""
+    init_gym_database()
+    return run_migrations(GYM_DB)
+
+
+def migrate_admin_database():
+    """Crea las tablas de fitapp.db y aplica sus migraciones pendientes"""
+    init_admin_database()
+    return run_migrations(ADMIN_DB)
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+# Variable de entorno que muestra los tiempos de inicio por la salida de errores
+STARTUP_ENV_VAR = "FITAPP_STARTUP"
+
+# Hitos medidos: la ventana de login desde el inicio del proceso y la primera
+# pestaña desde que se aceptó el login
+LOGIN_WINDOW = "ventana de login"
+FIRST_TAB = "primera pestaña interactiva"
+
+_origin = time.perf_counter()
+_starts = {}
+_marks = {}
+
+
+def start(name):
+    """Empieza a medir un hito desde ahora en lugar de desde el inicio del proceso"""
+    _starts[name] = time.perf_counter()
+    _marks.pop(name, None)
+
+
+def mark(name):
+    """Registra un hito la primera vez que se alcanza y devuelve los ms transcurridos"""
+    if name not in _marks:
+        _marks[name] = (time.perf_counter() - _starts.get(name, _origin)) * 1000
+        if os.environ.get(STARTUP_ENV_VAR):
+            print(f"[inicio] {name}: {_marks[name]:.0f} ms", file=sys.stderr)
+    return _marks[name]
+
+
+def get_marks():
+    """Devuelve los hitos registrados como {nombre: ms} en el orden en que ocurrieron"""
+    return dict(_marks)
@@ -0,0 +1,274 @@
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Variable de entorno que activa las trazas al iniciar; su valor es el
+# archivo donde se guardan al salir
+TRACE_ENV_VAR = "FITAPP_TRACE"
+
+# Límites superiores (ms) de los intervalos del histograma de cada consulta
+HISTOGRAM_BOUNDS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Cantidad de sentencias recientes que se conservan para la vista en vivo
+RECENT_SIZE = 200
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+
+
+def normalize_sql(sql):
+    """Reduce una sentencia a su forma canónica: sin literales ni espacios repetidos"""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _WHITESPACE_RE.sub(" ", sql).strip()
+    # Las listas IN de distinto largo cuentan como la misma consulta
+    return _IN_LIST_RE.sub("IN (?, ...)", sql)
+
+
+def _is_lock_error(error):
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def _find_caller():
+    """Devuelve "Clase.método" del primer marco de la capa de modelos en la pila"""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("models."):
+            instance = frame.f_locals.get("self")
+            if instance is not None:
+                return f"{type(instance).__name__}.{frame.f_code.co_name}"
+            return f"{module}.{frame.f_code.co_name}"
+        if fallback is None and module != __name__:
+            fallback = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback or "?"
+
+
+class QueryStats:
+    """Métricas acumuladas de una consulta normalizada desde un mismo origen"""
+    def __init__(self, sql, caller):
+        self.sql = sql
+        self.caller = caller
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.lock_waits = 0
+        self.lock_wait_ms = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, elapsed_ms):
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        for bucket, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if elapsed_ms <= bound:
+                break
+        else:
+            bucket = len(HISTOGRAM_BOUNDS_MS)
+        self.histogram[bucket] += 1
+
+    def percentile(self, fraction):
+        """Límite superior del intervalo del histograma que contiene el percentil"""
+        if not self.calls:
+            return 0.0
+        target = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= target:
+                if bucket < len(HISTOGRAM_BOUNDS_MS):
+                    return min(float(HISTOGRAM_BOUNDS_MS[bucket]), self.max_ms)
+                break
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "sql": self.sql,
+            "origen": self.caller,
+            "llamadas": self.calls,
+            "errores": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "promedio_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 3),
+            "filas": self.rows,
+            "esperas_bloqueo": self.lock_waits,
+            "espera_bloqueo_ms": round(self.lock_wait_ms, 3),
+            "histograma": dict(zip([f"<={b}" for b in HISTOGRAM_BOUNDS_MS] + ["mayor"], self.histogram)),
+        }
+
+
+class QueryTracer:
+    """Acumula las trazas de todas las conexiones; desactivado por defecto"""
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._recent = deque(maxlen=RECENT_SIZE)
+        self.started_at = None
+
+    def enable(self):
+        if not self.enabled:
+            self.started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Descarta todas las métricas acumuladas"""
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
+        self.started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S") if self.enabled else None
+
+    def record(self, sql, caller, elapsed_ms, error=None):
+        """Registra una ejecución y devuelve sus métricas para sumarles filas después"""
+        key = (normalize_sql(sql), caller)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(*key)
+            stats.add(elapsed_ms)
+            if error is not None:
+                stats.errors += 1
+                # sqlite3 no expone el manejador de espera; el tiempo de una
+                # sentencia que agotó busy_timeout es tiempo esperando el bloqueo
+                if _is_lock_error(error):
+                    stats.lock_waits += 1
+                    stats.lock_wait_ms += elapsed_ms
+            self._recent.append((time.time(), caller, key[0], elapsed_ms, error is not None))
+        return stats
+
+    def add_rows(self, stats, count):
+        with self._lock:
+            stats.rows += count
+
+    def snapshot(self):
+        """Copia de las métricas por consulta, de mayor a menor tiempo total"""
+        with self._lock:
+            stats = [s.to_dict() for s in self._stats.values()]
+        return sorted(stats, key=lambda s: s["total_ms"], reverse=True)
+
+    def recent(self):
+        """Últimas sentencias ejecutadas: (hora, origen, sql, ms, error)"""
+        with self._lock:
+            return list(self._recent)
+
+    def dump(self, path):
+        """Guarda las métricas acumuladas en un archivo JSON"""
+        report = {
+            "desde": self.started_at,
+            "hasta": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "consultas": self.snapshot(),
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+        return path
+
+
+tracer = QueryTracer()
+
+
+class TracingCursor(sqlite3.Cursor):
+    """Cursor que mide cada sentencia y cuenta las filas leídas cuando las trazas están activas"""
+    _trace_stats = None
+
+    def _traced(self, method, sql, *args):
+        if not tracer.enabled:
+            self._trace_stats = None
+            return method(self, sql, *args)
+
+        caller = _find_caller()
+        start = time.perf_counter()
+        try:
+            result = method(self, sql, *args)
+        except sqlite3.Error as e:
+            tracer.record(sql, caller, (time.perf_counter() - start) * 1000, e)
+            raise
+        self._trace_stats = tracer.record(sql, caller, (time.perf_counter() - start) * 1000)
+        return result
+
+    def execute(self, sql, parameters=()):
+        return self._traced(sqlite3.Cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._traced(sqlite3.Cursor.executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._traced(sqlite3.Cursor.executescript, sql_script)
+
+    def _count(self, rows):
+        if self._trace_stats is not None and rows:
+            tracer.add_rows(self._trace_stats, len(rows))
+        return rows
+
+    def fetchone(self):
+        row = super().fetchone()
+        if self._trace_stats is not None and row is not None:
+            tracer.add_rows(self._trace_stats, 1)
+        return row
+
+    def fetchmany(self, size=None):
+        return self._count(super().fetchmany(self.arraysize if size is None else size))
+
+    def fetchall(self):
+        return self._count(super().fetchall())
+
+
+class TracingConnection(sqlite3.Connection):
+    """Conexión cuyos cursores (incluidos los de execute) pasan por TracingCursor"""
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    # Los atajos de la conexión crean su cursor sin pasar por cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        if not tracer.enabled:
+            return super().commit()
+
+        caller = _find_caller()
+        start = time.perf_counter()
+        try:
+            super().commit()
+        except sqlite3.Error as e:
+            tracer.record("COMMIT", caller, (time.perf_counter() - start) * 1000, e)
+            raise
+        tracer.record("COMMIT", caller, (time.perf_counter() - start) * 1000)
+
+
+def enable_from_env():
+    """Activa las trazas si la variable FITAPP_TRACE está definida"""
+    if os.environ.get(TRACE_ENV_VAR):
+        tracer.enable()
+
+
+def dump_from_env():
+    """Guarda las trazas en el archivo indicado por FITAPP_TRACE, si está definida"""
+    path = os.environ.get(TRACE_ENV_VAR)
+    if path and tracer.enabled:
+        if path == "1":
+            path = f"trazas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        return tracer.dump(path)
+    return None
@@ -0,0 +1,95 @@
+import re
+from datetime import datetime
+
+# Cantidad de dígitos de un DNI argentino (los antiguos tienen 7)
+DNI_DIGITS = (7, 8)
+
+# Largo de un teléfono sin prefijos internacionales ni de larga distancia
+PHONE_DIGITS = (6, 10)
+
+# Formatos de fecha aceptados al importar
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+
+# Valores de estado de cuota aceptados -> valor guardado
+PAYMENT_STATUS = {
+    "pagada": "Pagada",
+    "pago": "Pagada",
+    "si": "Pagada",
+    "sí": "Pagada",
+    "no pagada": "No Pagada",
+    "impaga": "No Pagada",
+    "no": "No Pagada",
+}
+
+
+class ValidationError(ValueError):
+    """El valor no cumple el formato esperado; el mensaje explica el motivo"""
+
+
+def normalize_text(value):
+    """Quita espacios sobrantes, incluidos los repetidos entre palabras"""
+    return " ".join((value or "").split())
+
+
+def normalize_name(value, field="Nombre"):
+    """Normaliza un nombre o apellido obligatorio"""
+    name = normalize_text(value)
+    if not name:
+        raise ValidationError(f"{field} vacío")
+    return name
+
+
+def normalize_dni(value):
+    """Devuelve el DNI sólo con dígitos ("20.123.456" -> "20123456")"""
+    text = normalize_text(value)
+    if not re.fullmatch(r"[\d. -]+", text):
+        raise ValidationError(f"DNI inválido: {value!r}")
+    digits = re.sub(r"\D", "", text)
+    if not DNI_DIGITS[0] <= len(digits) <= DNI_DIGITS[1]:
+        raise ValidationError(f"DNI con {len(digits)} dígitos: {value!r}")
+    return digits
+
+
+def normalize_phone(value):
+    """Devuelve el teléfono sólo con dígitos, sin +54, 9 de celular ni 0 de larga distancia.
+
+    Un teléfono vacío es válido y se devuelve como cadena vacía.
+    """
+    text = normalize_text(value)
+    if not text:
+        return ""
+    if not re.fullmatch(r"\+?[\d ()./-]+", text):
+        raise ValidationError(f"Teléfono inválido: {value!r}")
+
+    digits = re.sub(r"\D", "", text)
+    if text.startswith("+") or (digits.startswith("54") and len(digits) > PHONE_DIGITS[1]):
+        if not digits.startswith("54"):
+            raise ValidationError(f"Teléfono de otro país: {value!r}")
+        digits = digits[2:]
+        # El 9 de los celulares sólo se marca desde el exterior
+        if digits.startswith("9") and len(digits) > PHONE_DIGITS[1]:
+            digits = digits[1:]
+    digits = digits.lstrip("0")
+
+    if not PHONE_DIGITS[0] <= len(digits) <= PHONE_DIGITS[1]:
+        raise ValidationError(f"Teléfono con {len(digits)} dígitos: {value!r}")
+    return digits
+
+
+def normalize_date(value):
+    """Convierte una fecha en alguno de los formatos aceptados a YYYY-MM-DD"""
+    text = normalize_text(value)
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValidationError(f"Fecha inválida: {value!r}")
+
+
+def normalize_payment_status(value):
+    """Convierte el estado de la cuota a Pagada o No Pagada"""
+    status = PAYMENT_STATUS.get(normalize_text(value).lower())
+    if status is None:
+        raise ValidationError(f"Estado de cuota desconocido: {value!r}")
+    return status